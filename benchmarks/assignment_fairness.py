@@ -0,0 +1,75 @@
+"""
+Benchmark of the balanced assignment solver against the greedy fair assigner, reporting
+how evenly each spreads equity and how long it takes.
+
+Run with `poetry run python benchmarks/assignment_fairness.py`.
+"""
+
+from decimal import Decimal
+import random
+import statistics
+import time
+
+from sweepy.assignment import assign_selections_balanced, assign_selections_fair
+from sweepy.models import RunnerOdds
+
+# (selections, participants)
+SIZES = [(36, 4), (150, 8), (1000, 50), (2000, 200), (5000, 500)]
+SEED = 0
+
+
+def build_selections(rng: random.Random, num_selections: int) -> list[RunnerOdds]:
+    # Outright markets are long tailed: a few favourites and a long field of outsiders
+    weights = [rng.paretovariate(2.5) for _ in range(num_selections)]
+    total = sum(weights)
+    return [
+        RunnerOdds(
+            provider_id=str(i),
+            name=f"Runner {i}",
+            implied_probability=Decimal(weight / total).quantize(Decimal("1e-8")),
+        )
+        for i, weight in enumerate(weights)
+    ]
+
+
+def equity_stats(assignments: dict[str, list[RunnerOdds]]) -> tuple[float, float]:
+    """
+    Returns the spread (max - min) and standard deviation of participants' equity.
+    """
+
+    equities = [
+        float(sum(selection.implied_probability for selection in selections))
+        for selections in assignments.values()
+    ]
+    return max(equities) - min(equities), statistics.pstdev(equities)
+
+
+def run(assigner, participants, selections) -> tuple[float, float, float]:
+    start = time.perf_counter()
+    assignments = assigner(participants, selections, rng=random.Random(SEED))
+    duration = time.perf_counter() - start
+    return *equity_stats(assignments), duration
+
+
+def main():
+    rng = random.Random(SEED)
+    print(
+        f"{'selections':>10} {'participants':>12} "
+        f"{'greedy spread':>14} {'stdev':>10} {'ms':>8} "
+        f"{'balanced spread':>16} {'stdev':>10} {'ms':>8}"
+    )
+    for num_selections, num_participants in SIZES:
+        selections = build_selections(rng, num_selections)
+        participants = [f"Participant {p}" for p in range(num_participants)]
+
+        greedy = run(assign_selections_fair, participants, selections)
+        balanced = run(assign_selections_balanced, participants, selections)
+        print(
+            f"{num_selections:>10} {num_participants:>12} "
+            f"{greedy[0]:>14.6f} {greedy[1]:>10.6f} {greedy[2] * 1000:>8.2f} "
+            f"{balanced[0]:>16.6f} {balanced[1]:>10.6f} {balanced[2] * 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
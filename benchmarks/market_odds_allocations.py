@@ -0,0 +1,105 @@
+"""
+Benchmark of the memory allocated and time taken to turn a Betfair market book into odds,
+through Pydantic models per runner against the array-backed MarketOdds.
+
+Run with `poetry run python benchmarks/market_odds_allocations.py`.
+"""
+
+import random
+import timeit
+import tracemalloc
+
+from sweepy.calculator import compute_market_probabilities_batch
+from sweepy.generate_sweepstakes import build_market_odds
+from sweepy.models import Runner
+
+RUNNER_COUNTS = [10, 50, 150, 500, 1000]
+LADDER_DEPTH = 3
+REPEATS = 20
+SEED = 0
+MARKET_ID = "1.234"
+
+
+def build_market_book(
+    rng: random.Random, num_runners: int
+) -> tuple[dict[str, dict], dict[str, dict[int, str]]]:
+    def ladder() -> list[dict]:
+        return [
+            {
+                "price": round(rng.uniform(1.01, 1000), 2),
+                "size": round(rng.uniform(2, 500), 2),
+            }
+            for _ in range(LADDER_DEPTH)
+        ]
+
+    market_book = {
+        "runners": [
+            {
+                "selectionId": i,
+                "status": "ACTIVE",
+                "ex": {"availableToBack": ladder(), "availableToLay": ladder()},
+            }
+            for i in range(num_runners)
+        ]
+    }
+    names = {i: f"Runner {i}" for i in range(num_runners)}
+    return {MARKET_ID: market_book}, {MARKET_ID: names}
+
+
+def via_models(market_books, names_by_market):
+    # How odds were computed before MarketOdds: a validated model per runner and price
+    runner_names = names_by_market[MARKET_ID]
+    runners = [
+        Runner(
+            runner_id=str(runner_book["selectionId"]),
+            name=runner_names[runner_book["selectionId"]],
+            available_to_back=runner_book["ex"]["availableToBack"],
+            available_to_lay=runner_book["ex"]["availableToLay"],
+        )
+        for runner_book in market_books[MARKET_ID]["runners"]
+    ]
+    return compute_market_probabilities_batch(runners)
+
+
+def via_arrays(market_books, names_by_market):
+    return build_market_odds(market_books, names_by_market)[MARKET_ID]
+
+
+def measure(build, *args) -> tuple[int, int, float]:
+    """
+    Returns the blocks and bytes still allocated by the result, and the milliseconds taken.
+    """
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build(*args)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    retained = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in retained)
+    size = sum(stat.size_diff for stat in retained)
+    del result
+
+    duration = timeit.timeit(lambda: build(*args), number=REPEATS) / REPEATS
+    return blocks, size, duration * 1000
+
+
+def main():
+    rng = random.Random(SEED)
+    print(
+        f"{'runners':>8} {'models blocks':>14} {'KiB':>8} {'ms':>8} "
+        f"{'arrays blocks':>14} {'KiB':>8} {'ms':>8}"
+    )
+    for num_runners in RUNNER_COUNTS:
+        market_books, names_by_market = build_market_book(rng, num_runners)
+        models = measure(via_models, market_books, names_by_market)
+        arrays = measure(via_arrays, market_books, names_by_market)
+        print(
+            f"{num_runners:>8} {models[0]:>14} {models[1] / 1024:>8.1f} {models[2]:>8.3f} "
+            f"{arrays[0]:>14} {arrays[1] / 1024:>8.1f} {arrays[2]:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark of how the sweepstake odds refresh scales with the number of runners.
+
+Run with `poetry run python benchmarks/refresh_scaling.py`.
+"""
+
+from decimal import Decimal
+import timeit
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from sweepy import db_models
+from sweepy.generate_sweepstakes import refresh_sweepstake_odds
+from sweepy.market_odds import MarketOdds
+from sweepy.models import RunnerOdds
+
+RUNNER_COUNTS = [10, 50, 150, 500, 1000, 2000]
+NUM_PARTICIPANTS = 8
+REPEATS = 5
+
+
+def build_sweepstake(
+    session: Session, num_runners: int
+) -> tuple[db_models.Sweepstakes, list[RunnerOdds]]:
+    selections = [
+        RunnerOdds(
+            provider_id=str(i),
+            name=f"Runner {i}",
+            implied_probability=Decimal(1) / num_runners,
+        )
+        for i in range(num_runners)
+    ]
+
+    sweepstake = db_models.Sweepstakes(
+        name="Benchmark",
+        market_id="1.234",
+        competition="Benchmark",
+        method="random",
+        active=True,
+    )
+    for p in range(NUM_PARTICIPANTS):
+        participant = db_models.Participant(name=f"Participant {p}")
+        participant.runners = [
+            db_models.Runner(
+                name=selection.name, market_provider_id=selection.provider_id
+            )
+            for selection in selections[p::NUM_PARTICIPANTS]
+        ]
+        sweepstake.participants.append(participant)
+
+    session.add(sweepstake)
+    session.commit()
+    return sweepstake, selections
+
+
+def main():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+
+    print(
+        f"{'runners':>8} {'linear lookup (ms)':>20} {'indexed lookup (ms)':>20} "
+        f"{'full refresh (ms)':>18}"
+    )
+    for num_runners in RUNNER_COUNTS:
+        with Session(engine) as session:
+            sweepstake, selections = build_sweepstake(session, num_runners)
+            index = {selection.provider_id: selection for selection in selections}
+            snapshot = MarketOdds.from_runner_odds(selections)
+            provider_ids = [runner.market_provider_id for runner in sweepstake.runners]
+
+            linear = timeit.timeit(
+                lambda: [
+                    next(s for s in selections if s.provider_id == provider_id)
+                    for provider_id in provider_ids
+                ],
+                number=REPEATS,
+            )
+            indexed = timeit.timeit(
+                lambda: [index[provider_id] for provider_id in provider_ids],
+                number=REPEATS,
+            )
+            refresh = timeit.timeit(
+                lambda: refresh_sweepstake_odds(
+                    None, sweepstake, session, snapshot=snapshot
+                ),
+                number=REPEATS,
+            )
+
+        print(
+            f"{num_runners:>8} {linear / REPEATS * 1000:>20.3f} "
+            f"{indexed / REPEATS * 1000:>20.3f} {refresh / REPEATS * 1000:>18.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -65,7 +65,7 @@ export default class ApiClient {
       throw new Error("Network response was not ok");
     }
     const data = await response.json();
-    return data;
+    return data.items;
   }
 
   async closeSweepstake(id) {
@@ -120,7 +120,7 @@ export default class ApiClient {
   }
 
   async getSweepstakeHistory(sweepstakeId) {
-    const url = `/api/sweepstakes/${sweepstakeId}/history`;
+    const url = `/api/sweepstakes/${sweepstakeId}/history?downsample=buckets`;
     const headers = {
       "Content-Type": "application/json",
     };
@@ -142,6 +142,7 @@ function CreateForm({ eventTypes, fetchMarkets, handleSubmitSuccess }) {
           <option value="tiered">Tiered</option>
           <option value="staggered">Staggered</option>
           <option value="fair">Fairest</option>
+          <option value="balanced">Balanced</option>
         </select>
         {/* Participants List */}
         <div>
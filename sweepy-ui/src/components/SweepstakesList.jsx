@@ -21,7 +21,7 @@ function SweepstakesList({ sweepstakes, showSweepstakes }) {
               <td className="px-4 py-2">{p.id}</td>
               <td className="px-4 py-2">{p.name}</td>
               <td className="px-4 py-2">{p.competition}</td>
-              <td className="px-4 py-2">{p.participants.length}</td>
+              <td className="px-4 py-2">{p.participant_count}</td>
               <td className="px-4 py-2">Active</td>
             </tr>
           ))}
@@ -1,22 +1,39 @@
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 import datetime
 import logging
+import multiprocessing
 import os
+import random
 import dotenv
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from sqlmodel import Session, select
-import sqlmodel
+from sqlmodel import Session
 
 from sweepy.database import get_session, init_db
-from sweepy import db_models, tasks
-from sweepy.integrations.betfair import BetfairClient
+from sweepy import (
+    db_models,
+    live_updates,
+    metrics,
+    queries,
+    retention,
+    simulation,
+    tasks,
+)
+from sweepy.integrations.betfair import (
+    AsyncBetfairClient,
+    BetfairClient,
+    RunnerCatalogueCache,
+)
 from sweepy.integrations.live_golf import LiveGolfClient
 from sweepy import matchmaker
 from sweepy.models import (
+    AssignmentMethod,
+    DownsamplingMethod,
+    FairnessSimulation,
     SweepstakesRequest,
     Sweepstakes,
     MarketNotFoundException,
@@ -24,49 +41,106 @@ from sweepy.models import (
     NotEnoughLiquidityException,
 )
 from sweepy import generate_sweepstakes
+from sweepy.downsampling import (
+    average_into_buckets,
+    largest_triangle_three_buckets,
+)
 from sweepy.models.api import EventType, MarketInfo
-from sweepy.models.sweepstakes import SweepstakesHistory
+from sweepy.models.sweepstakes import (
+    SweepstakesHistory,
+    SweepstakesPage,
+    SweepstakesUpdate,
+)
+from sweepy.response_cache import sweepstake_responses
 
 dotenv.load_dotenv()
 logging.basicConfig(level=logging.INFO)
 
 __bf_client = None
+__bf_async_client = None
 __live_golf_client = None
+__simulation_executor = None
+
+SIMULATION_WORKERS = int(os.getenv("SIMULATION_WORKERS", os.cpu_count() or 1))
+SIMULATION_MAX_RUNS = int(os.getenv("SIMULATION_MAX_RUNS", 10000))
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global __bf_client, __live_golf_client
+    global __bf_client, __bf_async_client, __live_golf_client, __simulation_executor
 
     logging.info("Starting up the FastAPI application.")
 
+    runner_catalogue = RunnerCatalogueCache(
+        path=os.getenv("BETFAIR_CATALOGUE_CACHE_PATH"),
+    )
+
     __bf_client = BetfairClient(
         username=os.getenv("BETFAIR_USERNAME"),
         password=os.getenv("BETFAIR_PASSWORD"),
         app_key=os.getenv("BETFAIR_APP_KEY"),
+        runner_catalogue=runner_catalogue,
     )
 
-    logging.info("Betfair client initialized.")
+    __bf_async_client = AsyncBetfairClient(
+        username=os.getenv("BETFAIR_USERNAME"),
+        password=os.getenv("BETFAIR_PASSWORD"),
+        app_key=os.getenv("BETFAIR_APP_KEY"),
+        runner_catalogue=runner_catalogue,
+        max_concurrency=int(os.getenv("BETFAIR_MAX_CONCURRENCY", 10)),
+        timeout_seconds=float(os.getenv("BETFAIR_TIMEOUT_SECONDS", 10)),
+    )
+
+    logging.info("Betfair clients initialized.")
 
     __live_golf_client = LiveGolfClient(api_key=os.getenv("LIVE_GOLF_API_KEY"))
 
     logging.info("Live Golf client initialized.")
 
+    if SIMULATION_WORKERS > 1:
+        # Worker processes are started on demand. Spawning rather than forking keeps them
+        # clear of the server's threads.
+        __simulation_executor = ProcessPoolExecutor(
+            max_workers=SIMULATION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logging.info(f"Fairness simulations use up to {SIMULATION_WORKERS} processes.")
+
+    if tasks.REDIS_URL:
+        sweepstake_responses.connect_redis(tasks.REDIS_URL)
+        logging.info("Response cache backed by Redis.")
+
     recreate_db = os.getenv("RECREATE_DB", "false").lower() == "true"
     init_db(recreate=recreate_db)
     logging.info("Database initialized.")
 
+    logging.info("Starting the event loop lag monitor.")
+    asyncio.create_task(metrics.event_loop_lag.run())
+
     logging.info("Starting the sweepstakes refresh odds task.")
-    asyncio.create_task(tasks.refresh_all_odds_task(__bf_client))
+    asyncio.create_task(tasks.refresh_all_odds_task(__bf_async_client))
 
     logging.info("Starting the sweepstakes refresh scores task.")
     asyncio.create_task(tasks.refresh_all_scores_task(__live_golf_client))
 
+    logging.info("Starting the odds history retention task.")
+    asyncio.create_task(tasks.retention_task())
+
+    logging.info("Starting the Betfair session keep alive task.")
+    asyncio.create_task(
+        tasks.keep_betfair_sessions_alive_task(__bf_client, __bf_async_client)
+    )
+
     yield
 
     logging.info("Shutting down the FastAPI application.")
     __bf_client = None
-    logging.info("Betfair client shut down.")
+    await __bf_async_client.aclose()
+    __bf_async_client = None
+    logging.info("Betfair clients shut down.")
+    if __simulation_executor is not None:
+        __simulation_executor.shutdown(cancel_futures=True)
+        __simulation_executor = None
 
 
 app = FastAPI(lifespan=lifespan)
@@ -148,7 +222,7 @@ def create_sweepstakes(
             "Sweepstake does not have a leaderboard, skipping Live Golf matching."
         )
 
-    session.refresh(sweepstakes_db)
+    sweepstakes_db = queries.get_sweepstake_graph(session, sweepstakes_db.id)
 
     response = generate_sweepstakes.convert_db_model_to_response(sweepstakes_db)
 
@@ -157,55 +231,101 @@ def create_sweepstakes(
     return response
 
 
-@app.get("/api/sweepstakes", response_model=list[Sweepstakes])
+@app.get("/api/sweepstakes", response_model=SweepstakesPage)
 def list_sweepstakes(
     include_closed: bool = False,
+    competition: str | None = None,
+    market_id: str | None = None,
+    method: AssignmentMethod | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=25, ge=1, le=100),
     session: Session = Depends(get_session),
-) -> list[Sweepstakes]:
+) -> SweepstakesPage:
     """
-    List all sweepstakes, optionally filtered by market_id and method.
+    List sweepstakes, most recently updated first, optionally filtered by competition,
+    market_id and method. Pass the returned `next_cursor` as `cursor` to get the next page.
     """
-    query = select(db_models.Sweepstakes)
-    if not include_closed:
-        query = query.where(db_models.Sweepstakes.active)
-
-    # TODO: Add proper pagination support
-    query = query.limit(25)
-
-    all_sweepstakes = session.exec(query).all()
-
-    resp = [
-        generate_sweepstakes.convert_db_model_to_response(sweepstake)
-        for sweepstake in all_sweepstakes
-    ]
+    try:
+        summaries, next_cursor = queries.list_sweepstake_summaries(
+            session,
+            include_closed=include_closed,
+            competition=competition,
+            market_id=market_id,
+            method=method,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    logging.info(f"Listing sweepstakes: {len(resp)} found")
+    logging.info(f"Listing sweepstakes: {len(summaries)} found")
 
-    return resp
+    return SweepstakesPage(items=summaries, next_cursor=next_cursor)
 
 
 @app.get("/api/sweepstakes/{sweepstake_id}", response_model=Sweepstakes)
 def get_sweepstake(
-    sweepstake_id: int | str, session: Session = Depends(get_session)
-) -> Sweepstakes:
+    sweepstake_id: int | str,
+    if_none_match: str | None = Header(default=None),
+    session: Session = Depends(get_session),
+) -> Response:
     """
     Get a specific sweepstake by ID.
+
+    Responses are served from the response cache while the sweepstake's version is unchanged,
+    and carry an ETag so polling clients can send If-None-Match and get a 304.
     """
     if isinstance(sweepstake_id, str):
         sweepstake_id = db_models.Sweepstakes.decode_stringified_id(sweepstake_id)
         if sweepstake_id is None:
             raise HTTPException(status_code=400, detail="Invalid sweepstake ID format")
 
-    sweepstake = session.get(db_models.Sweepstakes, sweepstake_id)
+    version = queries.get_sweepstake_version(session, sweepstake_id)
 
-    if not sweepstake:
+    if version is None:
         raise HTTPException(status_code=404, detail="Sweepstake not found")
 
-    resp = generate_sweepstakes.convert_db_model_to_response(sweepstake)
+    etag = f'"{sweepstake_id}-{version}"'
+    if if_none_match is not None and etag in [
+        tag.strip() for tag in if_none_match.split(",")
+    ]:
+        return Response(status_code=304, headers={"ETag": etag})
 
-    logging.info(f"Retrieved sweepstake: {sweepstake.id}")
+    body = sweepstake_responses.get(sweepstake_id, version)
+    if body is None:
+        sweepstake = queries.get_sweepstake_graph(session, sweepstake_id)
+        resp = generate_sweepstakes.convert_db_model_to_response(sweepstake)
+        body = resp.model_dump_json().encode()
+        sweepstake_responses.set(sweepstake_id, version, body)
 
-    return resp
+    logging.info(f"Retrieved sweepstake: {sweepstake_id}")
+
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@app.get("/api/sweepstakes/{sweepstake_id}/events")
+def stream_sweepstake_events(
+    sweepstake_id: int | str, session: Session = Depends(get_session)
+) -> StreamingResponse:
+    """
+    Stream live updates for a specific sweepstake as Server-Sent Events.
+
+    Each `update` event carries only what changed: runner odds, runner scores and participant
+    equities, or the sweepstake closing.
+    """
+    if isinstance(sweepstake_id, str):
+        sweepstake_id = db_models.Sweepstakes.decode_stringified_id(sweepstake_id)
+        if sweepstake_id is None:
+            raise HTTPException(status_code=400, detail="Invalid sweepstake ID format")
+
+    if queries.get_sweepstake_version(session, sweepstake_id) is None:
+        raise HTTPException(status_code=404, detail="Sweepstake not found")
+
+    return StreamingResponse(
+        live_updates.broker.stream(sweepstake_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/api/sweepstakes/{sweepstake_id}/refresh", response_model=Sweepstakes)
@@ -221,7 +341,7 @@ def refresh_sweepstake(
         if sweepstake_id is None:
             raise HTTPException(status_code=400, detail="Invalid sweepstake ID format")
 
-    sweepstake = session.get(db_models.Sweepstakes, sweepstake_id)
+    sweepstake = queries.get_sweepstake_graph(session, sweepstake_id)
 
     if not sweepstake:
         raise HTTPException(status_code=404, detail="Sweepstake not found")
@@ -240,7 +360,7 @@ def refresh_sweepstake(
     if updated_sweepstake.has_leaderboard:
         generate_sweepstakes.refresh_sweepstake_leaderboard
 
-    session.refresh(updated_sweepstake)
+    updated_sweepstake = queries.get_sweepstake_graph(session, updated_sweepstake.id)
 
     resp = generate_sweepstakes.convert_db_model_to_response(updated_sweepstake)
 
@@ -278,7 +398,16 @@ def close_sweepstake(
     sweepstake.updated_at = datetime.datetime.now(datetime.timezone.utc)
     session.add(sweepstake)
     session.commit()
-    session.refresh(sweepstake)
+    sweepstake_responses.invalidate(sweepstake.id)
+    live_updates.broker.publish(
+        sweepstake.id,
+        SweepstakesUpdate(
+            id=sweepstake.stringified_id,
+            updated_at=sweepstake.updated_at,
+            active=sweepstake.active,
+        ),
+    )
+    sweepstake = queries.get_sweepstake_graph(session, sweepstake.id)
 
     logging.info(f"Sweepstake data after closing: {sweepstake.model_dump_json()}")
 
@@ -289,23 +418,50 @@ def close_sweepstake(
     return resp
 
 
+@app.get("/api/metrics")
+async def get_metrics() -> dict:
+    """
+    Get runtime metrics for the API process.
+    """
+    return {
+        "event_loop_lag": metrics.event_loop_lag.to_dict(),
+        "refresh_reports": {
+            task: {
+                "started_at": report.started_at,
+                "duration_seconds": report.duration_seconds,
+                "sweepstakes": len(report.results),
+                "failures": report.failures,
+            }
+            for task, report in metrics.refresh_reports.items()
+        },
+        "retention_reports": list(metrics.retention_reports),
+        "response_cache": {
+            "entries": len(sweepstake_responses),
+            "hits": sweepstake_responses.hits,
+            "misses": sweepstake_responses.misses,
+        },
+        "leaderboard_cache": LiveGolfClient.get_leaderboard.cache.stats(),
+    }
+
+
 @app.get("/api/event-types", response_model=list[EventType])
-def get_event_types():
+async def get_event_types():
     """
     Get a list of all event types available in Betfair.
     """
     event_types = [
-        EventType(**event_type) for event_type in __bf_client.get_event_types()
+        EventType(**event_type)
+        for event_type in await __bf_async_client.get_event_types()
     ]
     return sorted(event_types, key=lambda x: x.name)
 
 
 @app.get("/api/markets/{event_type_id}", response_model=list[MarketInfo])
-def get_outright_markets(event_type_id: str):
+async def get_outright_markets(event_type_id: str):
     """
     Get outright markets for a specific event type.
     """
-    markets = __bf_client.get_outright_markets(event_type_id)
+    markets = await __bf_async_client.get_outright_markets(event_type_id)
 
     logging.info(f"Found {len(markets)} markets for event type {event_type_id}")
 
@@ -316,41 +472,149 @@ def get_outright_markets(event_type_id: str):
     return list(deduplicated_markets)
 
 
+@app.get("/api/markets/{market_id}/fairness", response_model=FairnessSimulation)
+def simulate_market_fairness(
+    market_id: str,
+    participants: int = Query(ge=2, le=500),
+    runs: int = Query(default=1000, ge=1, le=SIMULATION_MAX_RUNS),
+    method: list[AssignmentMethod] = Query(default=list(AssignmentMethod)),
+    seed: int | None = Query(default=None, ge=0),
+    candidates: int = Query(default=1, ge=1, le=1000),
+) -> FairnessSimulation:
+    """
+    Preview how fairly each assignment method would spread a market's equity, by simulating
+    `runs` sweepstakes with the market's current odds, each generated as the fairest of
+    `candidates` like a sweepstake request. Pass the returned `seed` back to repeat a
+    simulation exactly.
+    """
+
+    if runs * candidates > SIMULATION_MAX_RUNS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"runs * candidates must be at most {SIMULATION_MAX_RUNS}",
+        )
+
+    selections = generate_sweepstakes.get_selections(__bf_client, market_id)
+    if not selections:
+        raise HTTPException(status_code=404, detail="Market not found")
+    if len(selections) < participants:
+        raise HTTPException(
+            status_code=400,
+            detail=str(NotEnoughSelectionsException(len(selections), participants)),
+        )
+
+    if seed is None:
+        seed = random.getrandbits(32)
+    methods = simulation.simulate_fairness(
+        selections,
+        participants,
+        list(dict.fromkeys(method)),
+        runs,
+        seed,
+        executor=__simulation_executor,
+        candidates=candidates,
+    )
+    return FairnessSimulation(
+        market_id=market_id,
+        participants=participants,
+        runs=runs,
+        candidates=candidates,
+        seed=seed,
+        methods=methods,
+    )
+
+
 @app.get("/api/sweepstakes/{sweepstake_id}/history", response_model=SweepstakesHistory)
 def get_sweepstake_history(
-    sweepstake_id: int | str, session: Session = Depends(get_session)
+    sweepstake_id: int | str,
+    start: datetime.datetime | None = Query(default=None, alias="from"),
+    end: datetime.datetime | None = Query(default=None, alias="to"),
+    since: datetime.datetime | None = None,
+    downsample: DownsamplingMethod | None = None,
+    max_points: int = Query(default=200, ge=3, le=5000),
+    session: Session = Depends(get_session),
 ) -> SweepstakesHistory:
     """
     Get the history of a specific sweepstake by ID.
+
+    The history can be limited to a `from`/`to` window, and to points after `since`. With
+    `downsample` set, each participant's history is reduced to at most `max_points` points,
+    either by averaging into fixed time buckets in the database or with
+    largest-triangle-three-buckets.
     """
     if isinstance(sweepstake_id, str):
         sweepstake_id = db_models.Sweepstakes.decode_stringified_id(sweepstake_id)
         if sweepstake_id is None:
             raise HTTPException(status_code=400, detail="Invalid sweepstake ID format")
 
-    sweepstake = session.get(db_models.Sweepstakes, sweepstake_id)
+    sweepstake = queries.get_sweepstake_with_participants(session, sweepstake_id)
 
     if not sweepstake:
         raise HTTPException(status_code=404, detail="Sweepstake not found")
 
-    all_participants = session.exec(
-        sqlmodel.select(db_models.Participant).where(
-            db_models.Participant.sweepstake_id == sweepstake.id
+    # Closed sweepstakes may have had their history moved into an archive
+    archive = (
+        None if sweepstake.active else session.get(db_models.OddsArchive, sweepstake.id)
+    )
+
+    if downsample == DownsamplingMethod.BUCKETS and archive is None:
+        first, last = queries.get_participant_odds_bounds(
+            session, sweepstake.id, start, end, since
+        )
+        history = {}
+        if first is not None:
+            history = queries.get_bucketed_participant_odds_history(
+                session,
+                sweepstake.id,
+                start=start or first,
+                end=end or last,
+                buckets=max_points,
+                since=since,
+            )
+        next_since = queries.as_utc(last) if last is not None else None
+    else:
+        if archive is not None:
+            history = retention.get_archived_participant_odds_history(
+                archive.data, start, end, since
+            )
+        else:
+            history = queries.get_participant_odds_history(
+                session, sweepstake.id, start, end, since
+            )
+
+        next_since = max(
+            (queries.as_utc(points[-1][0]) for points in history.values()),
+            default=None,
         )
-    ).all()
+        if downsample == DownsamplingMethod.BUCKETS and history:
+            first = min(points[0][0] for points in history.values())
+            history = {
+                participant_id: average_into_buckets(
+                    points,
+                    start=queries.as_utc(start) if start else first,
+                    end=queries.as_utc(end) if end else next_since,
+                    buckets=max_points,
+                )
+                for participant_id, points in history.items()
+            }
+        elif downsample == DownsamplingMethod.LTTB:
+            history = {
+                participant_id: largest_triangle_three_buckets(points, max_points)
+                for participant_id, points in history.items()
+            }
 
     participant_history = [
         {
             "name": participant.name,
             "history": [
                 {
-                    "probability": odds.implied_probability,
-                    "timestamp": odds.timestamp.isoformat(),
+                    "probability": probability,
+                    "timestamp": timestamp.isoformat(),
                 }
-                for odds in participant.odds_history
+                for timestamp, probability in history.get(participant.id, [])
             ],
         }
-        for participant in all_participants
+        for participant in sweepstake.participants
     ]
 
     return SweepstakesHistory(
@@ -362,4 +626,5 @@ def get_sweepstake_history(
         active=sweepstake.active,
         competition=sweepstake.competition,
         participants=participant_history,
+        next_since=next_since,
     )
@@ -1,24 +1,55 @@
+from bisect import bisect_left, insort
 from collections import defaultdict
 
-from decimal import Decimal
+import heapq
+import itertools
+from operator import attrgetter
 import random
 import math
+import statistics
 
-from sweepy.models import RunnerOdds
+import numpy as np
+
+from sweepy.models import AssignmentMethod, RunnerOdds
+
+# Seeds fit in a signed 64-bit column and are exact as JavaScript numbers
+SEED_BITS = 32
+
+Rng = random.Random | np.random.Generator
+
+# Sorting on the probabilities compares decimals directly, rather than calling
+# RunnerOdds.__gt__ for every comparison
+_by_probability = attrgetter("implied_probability")
+
+
+def as_random(rng: Rng | None) -> random.Random:
+    """
+    The `random.Random` to draw from: `rng` itself, one seeded from a NumPy generator, or an
+    unseeded one if no generator is given. The global random state is never used.
+    """
+
+    if rng is None:
+        return random.Random()
+    if isinstance(rng, np.random.Generator):
+        return random.Random(int(rng.integers(2**63)))
+    return rng
 
 
 def assign_selections_staggered(
     participants: list[str],
     selections: list[RunnerOdds],
+    rng: Rng | None = None,
 ) -> dict[str, list[RunnerOdds]]:
     """
     Assign selections to participants in a staggered fashion, where the first participant gets the selection with the best odds,
     the second participant gets the selection , and so on. Once all participants
     have a selection, the process repeats with the participant with the lowest odds getting the next selection.
+
+    This is deterministic, so `rng` is unused; it is accepted so every assigner can be called alike.
     """
     resulting_selections = defaultdict(list)
 
-    selections_ordered_by_odds = sorted(selections, reverse=True)
+    selections_ordered_by_odds = sorted(selections, key=_by_probability, reverse=True)
     num_participants = len(participants)
 
     for i, selection in enumerate(selections_ordered_by_odds):
@@ -36,18 +67,21 @@ def assign_selections_staggered(
 def assign_selections_tiered(
     participants: list[str],
     selections: list[RunnerOdds],
+    rng: Rng | None = None,
 ) -> dict[str, list[RunnerOdds]]:
+    rng = as_random(rng)
+    participants = list(participants)
     result = defaultdict(list)
 
     num_tiers = math.ceil(len(selections) / len(participants))
-    selections_ordered_by_odds = sorted(selections, reverse=True)
+    selections_ordered_by_odds = sorted(selections, key=_by_probability, reverse=True)
 
     for tier_num in range(num_tiers):
         tier_start_index = tier_num * len(participants)
         tier_stop_index = (tier_num + 1) * len(participants)
         tier_selections = selections_ordered_by_odds[tier_start_index:tier_stop_index]
 
-        random.shuffle(participants)
+        rng.shuffle(participants)
         for participant, selection in zip(participants, tier_selections):
             result[participant].append(selection)
 
@@ -57,11 +91,15 @@ def assign_selections_tiered(
 def assign_selections_random(
     participants: list[str],
     selections: list[RunnerOdds],
+    rng: Rng | None = None,
 ) -> dict[str, list[RunnerOdds]]:
+    rng = as_random(rng)
+    participants = list(participants)
+    selections = list(selections)
     result = defaultdict(list)
 
-    random.shuffle(selections)
-    random.shuffle(participants)
+    rng.shuffle(selections)
+    rng.shuffle(participants)
 
     for i in range(len(selections)):
         participant_index = i % len(participants)
@@ -73,39 +111,284 @@ def assign_selections_random(
     return dict(result)
 
 
+def _exact_integer_probabilities(selections: list[RunnerOdds]) -> list[int]:
+    """
+    Scale every implied probability by the same power of ten so they are all integers. Sums
+    and comparisons of the scaled integers are exact, so they order participants exactly as
+    the decimals do, only faster.
+    """
+
+    places = max(
+        [-selection.implied_probability.as_tuple().exponent for selection in selections]
+        + [0]
+    )
+    return [
+        int(selection.implied_probability.scaleb(places)) for selection in selections
+    ]
+
+
 def assign_selections_fair(
     participants: list[str],
     selections: list[RunnerOdds],
+    rng: Rng | None = None,
 ) -> dict[str, list[RunnerOdds]]:
     """
-    This function assigns selections to particip_runner_probabilities_us_open]ants in a way the maximises fairness i.e. each participant has as close to the same
+    This function assigns selections to participants in a way the maximises fairness i.e. each participant has as close to the same
     expected value as possible.
+
+    Each participant first gets one of the top selections, then the rest are shuffled and each
+    goes to the participant with the most probability left below an equal share, with ties
+    going to the participant listed first. Participants are kept in a heap keyed by the
+    probability they hold, as exact integers.
     """
     result = {}
 
-    target_probability = Decimal("1") / len(participants)
-    selections_ordered_by_odds = sorted(selections, reverse=True)
-
-    remaining_probabilities = {
-        participant: target_probability for participant in participants
-    }
+    selections_ordered_by_odds = sorted(selections, key=_by_probability, reverse=True)
+    num_participants = len(participants)
 
     # Assign 1 of the top selections to each participant
-    for participant in participants:
-        result[participant] = []
-        first_selection = selections_ordered_by_odds.pop(0)
-        remaining_probabilities[participant] -= first_selection.implied_probability
-        result[participant].append(first_selection)
+    for participant, first_selection in zip(
+        participants, selections_ordered_by_odds[:num_participants]
+    ):
+        result[participant] = [first_selection]
+
+    # Shuffling positions consumes the random state exactly as shuffling the selections would
+    remaining_positions = list(range(num_participants, len(selections_ordered_by_odds)))
+    as_random(rng).shuffle(remaining_positions)
 
-    random.shuffle(selections_ordered_by_odds)
+    # Every participant's target is the same, so the one with the most probability remaining
+    # is the one holding the least
+    probabilities = _exact_integer_probabilities(selections_ordered_by_odds)
 
-    for selection in selections_ordered_by_odds:
-        participant_with_most_remaining_probability = max(
-            remaining_probabilities, key=remaining_probabilities.get
+    heap = [(probabilities[index], index) for index in range(len(result))]
+    heapq.heapify(heap)
+    participants_by_index = list(result)
+
+    for position in remaining_positions:
+        held, index = heap[0]
+        result[participants_by_index[index]].append(
+            selections_ordered_by_odds[position]
         )
-        result[participant_with_most_remaining_probability].append(selection)
-        remaining_probabilities[participant_with_most_remaining_probability] -= (
-            selection.implied_probability
+        heapq.heapreplace(heap, (held + probabilities[position], index))
+
+    return result
+
+
+def _best_exchange(
+    donor: list[tuple[float, int]], receiver: list[tuple[float, int]], gap: float
+) -> tuple[int | None, int | None, float]:
+    """
+    Find the exchange between two participants that best evens out their totals.
+
+    `donor` and `receiver` are the (probability, index) pairs of the participants' movable
+    selections, sorted ascending, and `gap` is how far the donor's total exceeds the
+    receiver's. Moving probability `d` from the donor to the receiver reduces the sum of
+    squared totals by `2d(gap - d)`, which is largest when `d` is half the gap. Returns the
+    position in `donor`, the position in `receiver` (None for a plain move) and the reduction.
+    """
+
+    best = (None, None, 0.0)
+    target = gap / 2
+    largest_received = receiver[-1][0] if receiver else None
+    for i, (x, _) in enumerate(donor):
+        # Donor selections are ascending, so once this one moves or swaps at least the gap,
+        # every later one does too and none of them can help
+        if x >= gap and (largest_received is None or x - largest_received >= gap):
+            break
+
+        # A move is a swap with nothing
+        reduction = 2 * x * (gap - x)
+        if reduction > best[2]:
+            best = (i, None, reduction)
+
+        j = bisect_left(receiver, (x - target,))
+        for k in (j - 1, j):
+            if 0 <= k < len(receiver) and receiver[k][0] < x:
+                d = x - receiver[k][0]
+                reduction = 2 * d * (gap - d)
+                if reduction > best[2]:
+                    best = (i, k, reduction)
+    return best
+
+
+def assign_selections_balanced(
+    participants: list[str],
+    selections: list[RunnerOdds],
+    rng: Rng | None = None,
+    max_iterations: int = 1000,
+    tolerance: float = 1e-6,
+) -> dict[str, list[RunnerOdds]]:
+    """
+    Assign selections so participants' total probabilities are as equal as possible, i.e. the
+    variance of their equity is minimised, while each participant still gets exactly one of
+    the top selections.
+
+    The top selections are handed out first, then the rest go largest first to whichever
+    participant has the lowest total (longest-processing-time partitioning on a heap).
+    Local search then repeatedly moves or swaps selections from higher to lower totals
+    while that lowers the sum of squared totals. Top selections are only swapped with other
+    top selections. Search stops after `max_iterations` exchanges, or once no pair of totals
+    differing by at least `tolerance` can be improved. This is deterministic, so `rng` is
+    unused.
+    """
+
+    probabilities = [float(selection.implied_probability) for selection in selections]
+    order = sorted(range(len(selections)), key=lambda i: -probabilities[i])
+    num_participants = len(participants)
+
+    top_picks = order[:num_participants]
+    totals = [probabilities[i] for i in top_picks]
+    # Each participant's other selections as (probability, index), sorted ascending
+    rest: list[list[tuple[float, int]]] = [[] for _ in participants]
+
+    heap = [(total, p) for p, total in enumerate(totals)]
+    heapq.heapify(heap)
+    for i in order[num_participants:]:
+        total, p = heapq.heappop(heap)
+        rest[p].append((probabilities[i], i))
+        totals[p] = total + probabilities[i]
+        heapq.heappush(heap, (totals[p], p))
+    for selections_held in rest:
+        selections_held.reverse()
+
+    for _ in range(max_iterations):
+        by_total = sorted(range(num_participants), key=totals.__getitem__)
+        lowest, highest = by_total[0], by_total[-1]
+        if totals[highest] - totals[lowest] < tolerance:
+            break
+
+        # Every participant against the lowest total, then the highest against every other
+        pairs = itertools.chain(
+            ((p, lowest) for p in reversed(by_total[1:])),
+            ((highest, p) for p in by_total[1:-1]),
         )
+        improved = False
+        for donor, receiver in pairs:
+            gap = totals[donor] - totals[receiver]
+            if gap < tolerance:
+                continue
 
-    return dict(result)
+            # Exchange either the top picks or selections from the rest
+            top_gap = (
+                probabilities[top_picks[donor]] - probabilities[top_picks[receiver]]
+            )
+            top_reduction = 2 * top_gap * (gap - top_gap) if top_gap > 0 else 0.0
+            i, k, reduction = _best_exchange(rest[donor], rest[receiver], gap)
+            if max(top_reduction, reduction) <= 1e-15:
+                continue
+
+            if top_reduction >= reduction:
+                top_picks[donor], top_picks[receiver] = (
+                    top_picks[receiver],
+                    top_picks[donor],
+                )
+                moved = top_gap
+            else:
+                given = rest[donor].pop(i)
+                moved = given[0]
+                if k is not None:
+                    taken = rest[receiver].pop(k)
+                    moved -= taken[0]
+                    insort(rest[donor], taken)
+                insort(rest[receiver], given)
+
+            totals[donor] -= moved
+            totals[receiver] += moved
+            improved = True
+            break
+
+        if not improved:
+            break
+
+    return {
+        participant: [selections[top_picks[p]]]
+        + [selections[i] for _, i in reversed(rest[p])]
+        for p, participant in enumerate(participants)
+    }
+
+
+ASSIGNERS = {
+    AssignmentMethod.STAGGERED: assign_selections_staggered,
+    AssignmentMethod.TIERED: assign_selections_tiered,
+    AssignmentMethod.RANDOM: assign_selections_random,
+    AssignmentMethod.FAIR: assign_selections_fair,
+    AssignmentMethod.BALANCED: assign_selections_balanced,
+}
+
+# These ignore the random state, so every seed gives the same equities, only shuffled
+# between participants
+DETERMINISTIC_METHODS = {AssignmentMethod.STAGGERED, AssignmentMethod.BALANCED}
+
+
+def assign_selections_seeded(
+    method: AssignmentMethod,
+    participants: list[str],
+    selections: list[RunnerOdds],
+    seed: int,
+) -> dict[str, list[RunnerOdds]]:
+    """
+    Shuffle the participants and assign the selections with `method`, drawing everything
+    from a generator seeded with `seed`, so the same seed always gives the same sweepstake.
+    """
+
+    rng = random.Random(seed)
+    return ASSIGNERS[method](
+        rng.sample(participants, len(participants)), selections, rng=rng
+    )
+
+
+def equity_variance(assignments: dict[str, list[RunnerOdds]]) -> float:
+    """
+    Population variance of the participants' total implied probability.
+    """
+
+    return statistics.pvariance(
+        [
+            float(sum(selection.implied_probability for selection in selections))
+            for selections in assignments.values()
+        ]
+    )
+
+
+def assign_selections_best_of(
+    method: AssignmentMethod,
+    participants: list[str],
+    selections: list[RunnerOdds],
+    candidates: int = 1,
+    seed: int | None = None,
+) -> tuple[dict[str, list[RunnerOdds]], int]:
+    """
+    Generate `candidates` seeded assignments and return the fairest, i.e. the one with the
+    lowest equity variance, with the seed that reproduces it in `assign_selections_seeded`.
+
+    The first candidate uses `seed` itself and the others use seeds drawn from it, so a
+    stored seed reproduces its sweepstake with a single candidate. Without a `seed` one is
+    picked at random. Methods in DETERMINISTIC_METHODS only ever get one candidate, as
+    every candidate would be equally fair.
+    """
+
+    if candidates < 1:
+        raise ValueError("candidates must be at least 1")
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(SEED_BITS)
+    if candidates == 1 or method in DETERMINISTIC_METHODS:
+        return assign_selections_seeded(method, participants, selections, seed), seed
+
+    seed_rng = random.Random(seed)
+    candidate_seeds = [seed] + [
+        seed_rng.getrandbits(SEED_BITS) for _ in range(candidates - 1)
+    ]
+
+    best_assignments, best_seed, best_variance = None, None, math.inf
+    for candidate_seed in candidate_seeds:
+        assignments = assign_selections_seeded(
+            method, participants, selections, candidate_seed
+        )
+        variance = equity_variance(assignments)
+        if variance < best_variance:
+            best_assignments, best_seed, best_variance = (
+                assignments,
+                candidate_seed,
+                variance,
+            )
+    return best_assignments, best_seed
@@ -1,62 +1,335 @@
-import time
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
 from functools import wraps
+import inspect
+import logging
+import threading
+import time
+from typing import Any
+
+_MISSING = object()
+
 
+class _Entry:
+    __slots__ = ("value", "expires_at", "stale_until")
 
-def timed_cached_property(ttl_seconds: int):
+    def __init__(self, value: Any, expires_at: float, stale_until: float) -> None:
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+class _Flight:
     """
-    Decorator to cache a property for a specified time-to-live (TTL) in seconds.
-    After the TTL expires, the property will be recomputed.
+    A computation in progress for one key, which other threads wait on instead of repeating.
+    """
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+class TTLCache:
+    """
+    Thread-safe cache with a maximum size, LRU eviction and a time-to-live per entry.
+
+    `get_or_compute` and `aget_or_compute` are single-flight: when a key is missing, one caller
+    computes it while concurrent callers for the same key wait for that result. Within
+    `stale_seconds` after an entry expires it is still served, and a single background
+    refresh replaces it (stale-while-revalidate).
     """
 
+    def __init__(
+        self,
+        max_size: int = 128,
+        ttl_seconds: float = 60,
+        stale_seconds: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be greater than 0")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be greater than 0")
+        if stale_seconds < 0:
+            raise ValueError("stale_seconds must not be negative")
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.clock = clock
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._async_flights: dict[Hashable, asyncio.Future] = {}
+        # Background refresh tasks, referenced until done so they are not garbage collected
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the fresh value for `key`, or `default` if it is missing or expired.
+        """
+
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None and self.clock() < entry.expires_at:
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        now = self.clock()
+        with self._lock:
+            self._entries[key] = _Entry(
+                value,
+                expires_at=now + self.ttl_seconds,
+                stale_until=now + self.ttl_seconds + self.stale_seconds,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable, value: Any = _MISSING) -> None:
+        """
+        Drops the entry for `key`. If `value` is given, the entry is only dropped while it still
+        holds that value, so a caller holding an outdated value cannot drop a newer one.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (value is _MISSING or entry.value == value):
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for `key`, calling `compute` at most once across threads if it
+        is missing or expired.
+        """
+
+        with self._lock:
+            entry = self._lookup(key)
+            now = self.clock()
+            if entry is not None and now < entry.expires_at:
+                self.hits += 1
+                return entry.value
+
+            if entry is not None and now < entry.stale_until:
+                self.stale_hits += 1
+                if key not in self._flights:
+                    flight = self._flights[key] = _Flight()
+                    threading.Thread(
+                        target=self._run_flight,
+                        args=(key, flight, compute),
+                        daemon=True,
+                    ).start()
+                return entry.value
+
+            self.misses += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if leader:
+            self._run_flight(key, flight, compute)
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    async def aget_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Async version of `get_or_compute`. Concurrent tasks for a missing key share one call to
+        `compute`, and stale entries are refreshed in a background task.
+        """
+
+        with self._lock:
+            entry = self._lookup(key)
+            now = self.clock()
+            if entry is not None and now < entry.expires_at:
+                self.hits += 1
+                return entry.value
+
+            if entry is not None and now < entry.stale_until:
+                self.stale_hits += 1
+                if key not in self._async_flights:
+                    future = self._async_flights[key] = (
+                        asyncio.get_running_loop().create_future()
+                    )
+                    task = asyncio.create_task(
+                        self._run_async_flight(key, future, compute)
+                    )
+                    self._refresh_tasks.add(task)
+                    task.add_done_callback(self._refresh_tasks.discard)
+                return entry.value
+
+            self.misses += 1
+            future = self._async_flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._async_flights[key] = (
+                    asyncio.get_running_loop().create_future()
+                )
+
+        if leader:
+            await self._run_async_flight(key, future, compute)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The leader was cancelled rather than this task, so take over computing it
+            if future.cancelled() and not asyncio.current_task().cancelling():
+                return await self.aget_or_compute(key, compute)
+            raise
+
+    def _lookup(self, key: Hashable) -> _Entry | None:
+        # Callers hold the lock. Entries past their stale window are dropped on sight.
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.clock() >= entry.stale_until:
+            del self._entries[key]
+            self.evictions += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _run_flight(
+        self, key: Hashable, flight: _Flight, compute: Callable[[], Any]
+    ) -> None:
+        try:
+            flight.value = compute()
+            self.set(key, flight.value)
+        except Exception as e:
+            flight.error = e
+            logging.warning(f"Failed to compute cache entry {key!r}: {e}")
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def _run_async_flight(
+        self,
+        key: Hashable,
+        future: asyncio.Future,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> None:
+        try:
+            value = await compute()
+            self.set(key, value)
+            future.set_result(value)
+        except Exception as e:
+            logging.warning(f"Failed to compute cache entry {key!r}: {e}")
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else is waiting
+            future.exception()
+        finally:
+            # If the computing task was cancelled, cancel the followers rather than leave
+            # them waiting on a result that will never come
+            if not future.done():
+                future.cancel()
+            with self._lock:
+                self._async_flights.pop(key, None)
+
+
+def _validate_ttl(ttl_seconds: int) -> None:
     if ttl_seconds <= 0 or not isinstance(ttl_seconds, int):
         raise ValueError("TTL must be an integer greater than 0 seconds")
 
+
+def timed_cached_property(ttl_seconds: int, stale_seconds: int = 0):
+    """
+    Decorator to cache a property for a specified time-to-live (TTL) in seconds.
+    After the TTL expires, the property will be recomputed, once, however many threads read it.
+    """
+
+    _validate_ttl(ttl_seconds)
+
     def decorator(func):
-        attr_name = f"_cached_{func.__name__}"
-        time_name = f"_cached_time_{func.__name__}"
+        cache_name = f"_cached_{func.__name__}"
+        creation_lock = threading.Lock()
 
         @property
         @wraps(func)
         def wrapper(self):
-            current_time = time.time()
-            cached_time = getattr(self, time_name, None)
-            cached_value = getattr(self, attr_name, None)
-
-            if cached_time is None or (current_time - cached_time) > ttl_seconds:
-                cached_value = func(self)
-                setattr(self, attr_name, cached_value)
-                setattr(self, time_name, current_time)
-            return cached_value
+            cache = getattr(self, cache_name, None)
+            if cache is None:
+                with creation_lock:
+                    cache = getattr(self, cache_name, None)
+                    if cache is None:
+                        cache = TTLCache(
+                            max_size=1,
+                            ttl_seconds=ttl_seconds,
+                            stale_seconds=stale_seconds,
+                        )
+                        setattr(self, cache_name, cache)
+            return cache.get_or_compute(None, lambda: func(self))
 
         return wrapper
 
     return decorator
 
 
-def timed_cache(ttl_seconds: int):
+def timed_cache(ttl_seconds: int, max_size: int = 128, stale_seconds: int = 0):
     """
     Decorator to cache the result of a function for a specified time-to-live (TTL) in seconds.
     After the TTL expires, the function will be recomputed.
+
+    Works on plain and async functions. At most `max_size` results are kept, and the cache is
+    available as `wrapper.cache` for its counters.
     """
 
-    if ttl_seconds <= 0 or not isinstance(ttl_seconds, int):
-        raise ValueError("TTL must be an integer greater than 0 seconds")
+    _validate_ttl(ttl_seconds)
 
     def decorator(func):
-        cache = {}
-        last_update = {}
+        cache = TTLCache(
+            max_size=max_size, ttl_seconds=ttl_seconds, stale_seconds=stale_seconds
+        )
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = (args, frozenset(kwargs.items()))
+                return await cache.aget_or_compute(key, lambda: func(*args, **kwargs))
+
+            async_wrapper.cache = cache
+            return async_wrapper
 
         @wraps(func)
         def wrapper(*args, **kwargs):
-            current_time = time.time()
             key = (args, frozenset(kwargs.items()))
+            return cache.get_or_compute(key, lambda: func(*args, **kwargs))
 
-            if key not in cache or (current_time - last_update[key]) > ttl_seconds:
-                cache[key] = func(*args, **kwargs)
-                last_update[key] = current_time
-
-            return cache[key]
-
+        wrapper.cache = cache
         return wrapper
 
     return decorator
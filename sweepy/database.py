@@ -4,6 +4,8 @@ import os
 
 from dotenv import load_dotenv
 
+from sweepy.migrations import run_migrations
+
 
 load_dotenv()
 
@@ -35,6 +37,9 @@ def init_db(recreate: bool = False):
         SQLModel.metadata.create_all(engine)
         print("Created database tables.")
 
+        run_migrations(engine)
+        print("Applied database migrations.")
+
     except Exception as e:
         print(f"Error initializing database: {e}")
 
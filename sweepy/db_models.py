@@ -1,7 +1,16 @@
 import datetime
 from hashids import Hashids
 from typing import List, Optional
-from sqlmodel import Column, DateTime, SQLModel, Field, Relationship
+from sqlmodel import (
+    BigInteger,
+    Column,
+    DateTime,
+    Index,
+    LargeBinary,
+    SQLModel,
+    Field,
+    Relationship,
+)
 
 hashids = Hashids(
     min_length=4, salt="sweepy_salt", alphabet="ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
@@ -9,11 +18,17 @@ hashids = Hashids(
 
 
 class Sweepstakes(SQLModel, table=True):
+    # Keyset pagination walks (updated_at, id) in descending order
+    __table_args__ = (
+        Index("ix_sweepstakes_active_updated_at_id", "active", "updated_at", "id"),
+        Index("ix_sweepstakes_updated_at_id", "updated_at", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
-    market_id: str
-    competition: str
-    method: str
+    market_id: str = Field(index=True)
+    competition: str = Field(index=True)
+    method: str = Field(index=True)
     active: bool
     start_date: datetime.datetime = Field(
         sa_column=Column(DateTime(timezone=True)),
@@ -24,6 +39,8 @@ class Sweepstakes(SQLModel, table=True):
     )
     participants: List["Participant"] = Relationship(back_populates="sweepstake")
     tournament_id: Optional[str] = None
+    # Seed of the generator the assignments were drawn from
+    seed: Optional[int] = Field(default=None, sa_type=BigInteger)
 
     @property
     def stringified_id(self) -> Optional[str]:
@@ -67,7 +84,14 @@ class Sweepstakes(SQLModel, table=True):
 class Participant(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
-    sweepstake_id: Optional[int] = Field(default=None, foreign_key="sweepstakes.id")
+    sweepstake_id: Optional[int] = Field(
+        default=None, foreign_key="sweepstakes.id", index=True
+    )
+    latest_probability: Optional[float] = None
+    latest_odds_at: Optional[datetime.datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True)),
+    )
 
     sweepstake: Optional["Sweepstakes"] = Relationship(back_populates="participants")
     runners: List["Runner"] = Relationship(back_populates="participant")
@@ -85,8 +109,39 @@ class Participant(SQLModel, table=True):
             return max(self.odds_history, key=lambda odds: odds.timestamp)
         return None
 
+    def set_latest_odds(
+        self, implied_probability: float, timestamp: datetime.datetime
+    ) -> None:
+        """
+        Updates the latest odds columns without creating an odds history row.
+        """
+        self.latest_probability = implied_probability
+        self.latest_odds_at = timestamp
+
+    def record_odds(
+        self, implied_probability: float, timestamp: datetime.datetime
+    ) -> "ParticipantOdds":
+        """
+        Creates a new odds history row and updates the latest odds columns to match.
+        """
+        self.set_latest_odds(implied_probability, timestamp)
+        return ParticipantOdds(
+            implied_probability=implied_probability,
+            participant=self,
+            timestamp=timestamp,
+        )
+
 
 class ParticipantOdds(SQLModel, table=True):
+    # Latest-by-owner and history reads filter on the owner and walk the timestamps, while
+    # retention scans by time alone
+    __table_args__ = (
+        Index(
+            "ix_participantodds_participant_id_timestamp", "participant_id", "timestamp"
+        ),
+        Index("ix_participantodds_timestamp", "timestamp"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     participant_id: Optional[int] = Field(default=None, foreign_key="participant.id")
     implied_probability: float
@@ -104,7 +159,14 @@ class Runner(SQLModel, table=True):
     market_provider_id: str
     score_provider_id: Optional[str] = None
     score: Optional[int] = None
-    participant_id: Optional[int] = Field(default=None, foreign_key="participant.id")
+    participant_id: Optional[int] = Field(
+        default=None, foreign_key="participant.id", index=True
+    )
+    latest_probability: Optional[float] = None
+    latest_odds_at: Optional[datetime.datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True)),
+    )
 
     participant: Optional["Participant"] = Relationship(back_populates="runners")
 
@@ -122,8 +184,35 @@ class Runner(SQLModel, table=True):
             return max(self.odds_history, key=lambda odds: odds.timestamp)
         return None
 
+    def set_latest_odds(
+        self, implied_probability: float, timestamp: datetime.datetime
+    ) -> None:
+        """
+        Updates the latest odds columns without creating an odds history row.
+        """
+        self.latest_probability = implied_probability
+        self.latest_odds_at = timestamp
+
+    def record_odds(
+        self, implied_probability: float, timestamp: datetime.datetime
+    ) -> "RunnerOdds":
+        """
+        Creates a new odds history row and updates the latest odds columns to match.
+        """
+        self.set_latest_odds(implied_probability, timestamp)
+        return RunnerOdds(
+            implied_probability=implied_probability,
+            runner=self,
+            timestamp=timestamp,
+        )
+
 
 class RunnerOdds(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_runnerodds_runner_id_timestamp", "runner_id", "timestamp"),
+        Index("ix_runnerodds_timestamp", "timestamp"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     runner_id: Optional[int] = Field(default=None, foreign_key="runner.id")
     implied_probability: float
@@ -133,3 +222,17 @@ class RunnerOdds(SQLModel, table=True):
     )
 
     runner: Optional["Runner"] = Relationship(back_populates="odds_history")
+
+
+class OddsArchive(SQLModel, table=True):
+    """
+    The odds history of a closed sweepstake, compressed into a single columnar blob by the
+    retention job. See `sweepy.retention.load_archive`.
+    """
+
+    sweepstake_id: int = Field(foreign_key="sweepstakes.id", primary_key=True)
+    created_at: datetime.datetime = Field(
+        sa_column=Column(DateTime(timezone=True)),
+        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc),
+    )
+    data: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
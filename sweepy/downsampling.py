@@ -0,0 +1,91 @@
+import datetime
+
+Point = tuple[datetime.datetime, float]
+
+
+def bucket_window(
+    start: datetime.datetime, end: datetime.datetime, buckets: int
+) -> tuple[datetime.datetime, float]:
+    """
+    Returns the aligned start and the width in seconds of `buckets` equal time buckets that
+    cover `start` to `end` inclusive.
+
+    The start is truncated to a whole second, since SQLite only resolves epochs to the second,
+    and the window is widened by a second to keep `end` inside the last bucket.
+    """
+
+    start = start.replace(microsecond=0)
+    return start, ((end - start).total_seconds() + 1) / buckets
+
+
+def average_into_buckets(
+    points: list[Point],
+    start: datetime.datetime,
+    end: datetime.datetime,
+    buckets: int,
+) -> list[Point]:
+    """
+    Average a time series into `buckets` equal time buckets between `start` and `end`, each
+    stamped with the start of its bucket. Empty buckets are left out.
+    """
+
+    start, width = bucket_window(start, end, buckets)
+    totals: dict[int, list[float]] = {}
+    for timestamp, probability in points:
+        if start <= timestamp <= end:
+            bucket = int((timestamp - start).total_seconds() / width)
+            total = totals.setdefault(bucket, [0.0, 0])
+            total[0] += probability
+            total[1] += 1
+
+    return [
+        (start + datetime.timedelta(seconds=bucket * width), total / count)
+        for bucket, (total, count) in sorted(totals.items())
+    ]
+
+
+def largest_triangle_three_buckets(points: list[Point], threshold: int) -> list[Point]:
+    """
+    Downsample a time series to at most `threshold` points with the largest-triangle-three-buckets
+    algorithm, which keeps the points that contribute most to the visual shape of the line.
+
+    The first and last points are always kept. Points must be sorted by timestamp.
+    """
+
+    if threshold < 3:
+        raise ValueError("threshold must be at least 3")
+    if len(points) <= threshold:
+        return list(points)
+
+    xs = [timestamp.timestamp() for timestamp, _ in points]
+    ys = [probability for _, probability in points]
+
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    selected = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # The average of the next bucket is the third vertex of the triangle
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, len(points))
+        average_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        average_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        best_area = -1.0
+        best = start
+        for i in range(start, end):
+            area = abs(
+                (xs[selected] - average_x) * (ys[i] - ys[selected])
+                - (xs[selected] - xs[i]) * (average_y - ys[selected])
+            )
+            if area > best_area:
+                best_area = area
+                best = i
+
+        sampled.append(points[best])
+        selected = best
+
+    sampled.append(points[-1])
+    return sampled
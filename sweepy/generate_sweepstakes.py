@@ -1,51 +1,201 @@
 import datetime
 from decimal import Decimal
 import logging
-import random
 
 import sqlmodel
-from sweepy.calculator import compute_market_probabilities
-from sweepy.integrations.betfair import BetfairClient
+from sweepy.calculator import compute_market_odds
+from sweepy.integrations.betfair import AsyncBetfairClient, BetfairClient
 from sweepy.integrations.live_golf.client import LiveGolfClient
+from sweepy.market_odds import MarketOdds
 from sweepy.matchmaker import get_live_golf_tournament
 from sweepy.models import (
-    AssignmentMethod,
     RunnerOdds,
-    Runner,
     MarketNotFoundException,
     NotEnoughSelectionsException,
     SweepstakesRequest,
     Sweepstakes,
 )
 from sweepy import assignment
-from sweepy import db_models
+from sweepy import db_models, live_updates
+from sweepy.models.sweepstakes import (
+    ParticipantEquityUpdate,
+    RunnerOddsUpdate,
+    RunnerScoreUpdate,
+    SweepstakesUpdate,
+)
+from sweepy.response_cache import sweepstake_responses
 
 
 def get_selections(
     betfair_client: BetfairClient,
     market_id: str,
 ) -> list[RunnerOdds]:
-    runner_names = betfair_client.get_selection_names(market_id)
+    """
+    Fetch the latest selections for a market, as RunnerOdds objects for assignment.
+
+    Raises MarketNotFoundException if Betfair does not return the market. A market with no
+    priced runners has no selections.
+    """
+
+    market_books, names_by_market = get_market_books_and_names(
+        betfair_client, [market_id]
+    )
+    if market_id not in market_books:
+        raise MarketNotFoundException(f"Market not found for market_id {market_id}.")
+
+    odds_by_market = build_market_odds(market_books, names_by_market)
+    if market_id not in odds_by_market:
+        return []
+    return odds_by_market[market_id].to_runner_odds()
+
+
+def find_stale_market_ids(
+    market_books: dict[str, dict],
+    names_by_market: dict[str, dict[int, str]],
+) -> list[str]:
+    """
+    Find markets whose cached runner names predate an active runner added since.
+    """
+
+    return [
+        market_id
+        for market_id, market in market_books.items()
+        if market_id in names_by_market
+        and any(
+            runner_book["selectionId"] not in names_by_market[market_id]
+            for runner_book in market["runners"]
+            if runner_book["status"] == "ACTIVE"
+        )
+    ]
+
+
+def find_open_market_ids(market_books: dict[str, dict]) -> list[str]:
+    """
+    Find markets that have not closed, so their runner names are still worth fetching.
+
+    Fetching names for a closed market would put it back in the runner catalogue the
+    client has just removed it from.
+    """
+
+    return [
+        market_id
+        for market_id, market in market_books.items()
+        if market.get("status") != "CLOSED"
+    ]
+
+
+def build_market_odds(
+    market_books: dict[str, dict],
+    names_by_market: dict[str, dict[int, str]],
+) -> dict[str, MarketOdds]:
+    """
+    Compute the odds of each market straight from its market book and runner names.
 
-    market = betfair_client.get_market_book(market_id)
+    Markets without runner names or active runners are missing from the result.
+    """
 
-    runners = []
-    for runner_book in market["runners"]:
-        if runner_book["status"] != "ACTIVE":
+    odds_by_market = {}
+    for market_id, market in market_books.items():
+        if market_id not in names_by_market:
             continue
-        selection_id = runner_book["selectionId"]
-        runner_name = runner_names[selection_id]
-        runner = Runner(
-            runner_id=str(selection_id),
-            name=runner_name,
-            available_to_back=runner_book["ex"]["availableToBack"],
-            available_to_lay=runner_book["ex"]["availableToLay"],
-            last_price_traded=runner_book.get("lastPriceTraded"),
+
+        runner_names = names_by_market[market_id]
+        active_runners = [
+            runner_book
+            for runner_book in market["runners"]
+            if runner_book["status"] == "ACTIVE"
+        ]
+        if active_runners:
+            odds_by_market[market_id] = compute_market_odds(
+                [str(runner_book["selectionId"]) for runner_book in active_runners],
+                [
+                    runner_names[runner_book["selectionId"]]
+                    for runner_book in active_runners
+                ],
+                [
+                    runner_book["ex"]["availableToBack"]
+                    for runner_book in active_runners
+                ],
+                [runner_book["ex"]["availableToLay"] for runner_book in active_runners],
+            )
+
+    return odds_by_market
+
+
+def get_market_books_and_names(
+    betfair_client: BetfairClient,
+    market_ids: list[str],
+) -> tuple[dict[str, dict], dict[str, dict[int, str]]]:
+    """
+    Fetch the market books and runner names of many markets with batched Betfair requests.
+
+    Markets Betfair does not return are missing from both results.
+    """
+
+    market_books = betfair_client.get_market_book_batch(market_ids)
+    names_by_market = betfair_client.get_selection_names_batch(
+        find_open_market_ids(market_books)
+    )
+
+    stale_market_ids = find_stale_market_ids(market_books, names_by_market)
+    if stale_market_ids:
+        for market_id in stale_market_ids:
+            betfair_client.invalidate_selection_names(market_id)
+        names_by_market |= betfair_client.get_selection_names_batch(stale_market_ids)
+
+    return market_books, names_by_market
+
+
+def get_market_odds_batch(
+    betfair_client: BetfairClient,
+    market_ids: list[str],
+) -> dict[str, MarketOdds]:
+    """
+    Fetch the latest odds for many markets with batched Betfair requests.
+
+    Markets Betfair does not return are missing from the result.
+    """
+
+    return build_market_odds(*get_market_books_and_names(betfair_client, market_ids))
+
+
+async def get_market_odds_batch_async(
+    betfair_client: AsyncBetfairClient,
+    market_ids: list[str],
+) -> dict[str, MarketOdds]:
+    """
+    Async equivalent of `get_market_odds_batch` for the AsyncBetfairClient.
+    """
+
+    market_books = await betfair_client.get_market_book_batch(market_ids)
+    names_by_market = await betfair_client.get_selection_names_batch(
+        find_open_market_ids(market_books)
+    )
+
+    stale_market_ids = find_stale_market_ids(market_books, names_by_market)
+    if stale_market_ids:
+        for market_id in stale_market_ids:
+            betfair_client.invalidate_selection_names(market_id)
+        names_by_market |= await betfair_client.get_selection_names_batch(
+            stale_market_ids
         )
 
-        runners.append(runner)
+    return build_market_odds(market_books, names_by_market)
+
+
+def get_market_snapshot(
+    betfair_client: BetfairClient,
+    market_id: str,
+) -> MarketOdds:
+    """
+    Fetch the latest odds for a market.
+    """
+
+    snapshots = get_market_odds_batch(betfair_client, [market_id])
+    if market_id not in snapshots:
+        raise MarketNotFoundException(f"Market not found for market_id {market_id}.")
 
-    return compute_market_probabilities(runners)
+    return snapshots[market_id]
 
 
 def generate_sweepstakes(
@@ -76,25 +226,15 @@ def generate_sweepstakes(
     if num_selections < num_participants:
         raise NotEnoughSelectionsException(num_selections, num_participants)
 
-    selection_assigner_func: callable[
-        [list[str], list[RunnerOdds]], dict[str, list[RunnerOdds]]
-    ]
-
-    if request.method == AssignmentMethod.STAGGERED:
-        selection_assigner_func = assignment.assign_selections_staggered
-    elif request.method == AssignmentMethod.TIERED:
-        selection_assigner_func = assignment.assign_selections_tiered
-    elif request.method == AssignmentMethod.RANDOM:
-        selection_assigner_func = assignment.assign_selections_random
-    elif request.method == AssignmentMethod.FAIR:
-        selection_assigner_func = assignment.assign_selections_fair
-    else:
+    if request.method not in assignment.ASSIGNERS:
         raise NotImplementedError(f"Assignment method {request.method} not implemented")
 
-    random.shuffle(request.participant_names)
-    sweepstake_assignments: dict[str, list[RunnerOdds]] = selection_assigner_func(
-        participants=request.participant_names,
-        selections=selections,
+    sweepstake_assignments, seed = assignment.assign_selections_best_of(
+        request.method,
+        request.participant_names,
+        selections,
+        candidates=request.candidates,
+        seed=request.seed,
     )
 
     sweepstakes_db = db_models.Sweepstakes(
@@ -107,6 +247,7 @@ def generate_sweepstakes(
         competition=request.competition,
         tournament_id=tournament_id,
         start_date=bf_info.market_start_time,
+        seed=seed,
     )
 
     for participant_name, selections in sweepstake_assignments.items():
@@ -130,13 +271,7 @@ def generate_sweepstakes(
             )
             db_session.add(runner)
 
-            db_session.add(
-                db_models.RunnerOdds(
-                    implied_probability=selection.implied_probability,
-                    runner=runner,
-                    timestamp=timestamp,
-                )
-            )
+            db_session.add(runner.record_odds(selection.implied_probability, timestamp))
 
             runners.append(runner)
 
@@ -144,13 +279,7 @@ def generate_sweepstakes(
         for selection in sorted_selections:
             participant_equity += selection.implied_probability
 
-        db_session.add(
-            db_models.ParticipantOdds(
-                implied_probability=participant_equity,
-                participant=participant_db,
-                timestamp=timestamp,
-            )
-        )
+        db_session.add(participant_db.record_odds(participant_equity, timestamp))
         sweepstakes_db.participants.append(participant_db)
 
     db_session.add(sweepstakes_db)
@@ -171,12 +300,12 @@ def convert_db_model_to_response(
     participants = [
         {
             "name": participant.name,
-            "equity": participant.latest_odds.implied_probability,
+            "equity": participant.latest_probability,
             "assignments": [
                 {
                     "provider_id": runner.market_provider_id,
                     "name": runner.name,
-                    "implied_probability": runner.latest_odds.implied_probability,
+                    "implied_probability": runner.latest_probability,
                     "score": runner.score,
                 }
                 for runner in participant.runners
@@ -190,69 +319,135 @@ def convert_db_model_to_response(
     return Sweepstakes(**jsondata)
 
 
+def insert_odds_history(
+    session: sqlmodel.Session,
+    runner_odds: list[dict],
+    participant_odds: list[dict],
+) -> None:
+    """
+    Write odds history rows with one multi-row INSERT per table, bypassing the ORM unit of work.
+    """
+
+    if runner_odds:
+        session.execute(sqlmodel.insert(db_models.RunnerOdds), runner_odds)
+    if participant_odds:
+        session.execute(sqlmodel.insert(db_models.ParticipantOdds), participant_odds)
+
+
 def refresh_sweepstake_odds(
     client: BetfairClient,
     sweepstake_db: db_models.Sweepstakes,
     session: sqlmodel.Session,
+    tolerance: float | None = None,
+    snapshot: MarketOdds | None = None,
 ) -> db_models.Sweepstakes:
     """
     Refresh the sweepstake by re-fetching the market data and updating the participants.
+
+    A `snapshot` from `get_market_snapshot` can be passed to reuse market data already fetched
+    for another sweepstake on the same market.
+
+    If a `tolerance` is given the refresh runs in delta mode: a runner only gets a new odds row
+    when its implied probability has moved by more than `tolerance` since its latest stored odds,
+    and a participant's equity is only recalculated when one of their runners has moved.
     """
 
-    latest_data = get_selections(client, sweepstake_db.market_id)
+    if snapshot is None:
+        snapshot = get_market_snapshot(client, sweepstake_db.market_id)
     fetched_at = datetime.datetime.now(datetime.timezone.utc)
-    if not latest_data:
-        raise MarketNotFoundException(
-            f"Market not found for market_id {sweepstake_db.market_id}."
-        )
 
+    runner_odds = []
+    participant_odds = []
+    update = SweepstakesUpdate(
+        id=sweepstake_db.stringified_id,
+        updated_at=fetched_at,
+        active=sweepstake_db.active,
+    )
+    runner_rows_skipped = 0
+    participant_rows_skipped = 0
     for participant in sweepstake_db.participants:
         logging.info(f"Refreshing participant: {participant.name}")
         # Update each participant's runners with the latest data
         seen = set()
         updated_equity = Decimal(0)
+        participant_changed = tolerance is None
         for runner in participant.runners:
             # Find the latest runner data
             if runner.market_provider_id in seen:
                 continue
 
             seen.add(runner.market_provider_id)
-            latest_runner = next(
-                (r for r in latest_data if r.provider_id == runner.market_provider_id),
-                None,
-            )
-            if latest_runner:
-                p = latest_runner.implied_probability
-            else:
+            p = snapshot.implied_probability(runner.market_provider_id)
+            if p is None:
                 # If the runner is not found in the latest data, keep the old one but assume probability is 0
                 logging.warning(
                     f"Runner {runner.name} with market_provider_id {runner.market_provider_id} not found in latest data."
                 )
                 p = 0.0
 
-            updated_runner_odds = db_models.RunnerOdds(
-                implied_probability=p,
-                runner=runner,
-                timestamp=fetched_at,
-            )
-            session.add(updated_runner_odds)
+            previous_probability = runner.latest_probability
+            if (
+                tolerance is not None
+                and previous_probability is not None
+                and abs(float(p) - float(previous_probability)) <= tolerance
+            ):
+                runner_rows_skipped += 1
+                updated_equity += Decimal(previous_probability)
+                continue
+
+            if previous_probability is None or float(p) != float(previous_probability):
+                update.odds.append(
+                    RunnerOddsUpdate(
+                        participant=participant.name,
+                        provider_id=runner.market_provider_id,
+                        implied_probability=p,
+                    )
+                )
+            runner.set_latest_odds(p, fetched_at)
             session.add(runner)
+            runner_odds.append(
+                {
+                    "runner_id": runner.id,
+                    "implied_probability": float(p),
+                    "timestamp": fetched_at,
+                }
+            )
             updated_equity += Decimal(p)
+            participant_changed = True
 
-        # Recalculate equity based on updated odds
-        updated_participant_odds = db_models.ParticipantOdds(
-            implied_probability=updated_equity,
-            participant=participant,
-            timestamp=fetched_at,
-        )
+        if not participant_changed:
+            participant_rows_skipped += 1
+            continue
 
-        session.add(updated_participant_odds)
+        # Recalculate equity based on updated odds
+        if participant.latest_probability is None or float(updated_equity) != float(
+            participant.latest_probability
+        ):
+            update.equities.append(
+                ParticipantEquityUpdate(name=participant.name, equity=updated_equity)
+            )
+        participant.set_latest_odds(updated_equity, fetched_at)
         session.add(participant)
+        participant_odds.append(
+            {
+                "participant_id": participant.id,
+                "implied_probability": float(updated_equity),
+                "timestamp": fetched_at,
+            }
+        )
 
+    insert_odds_history(session, runner_odds, participant_odds)
     sweepstake_db.updated_at = fetched_at
     session.add(sweepstake_db)
     session.commit()
-    logging.info(f"Refreshed sweepstake odds: {sweepstake_db.id}")
+    sweepstake_responses.invalidate(sweepstake_db.id)
+    if update.odds or update.equities:
+        live_updates.broker.publish(sweepstake_db.id, update)
+    logging.info(
+        f"Refreshed sweepstake odds: {sweepstake_db.id} "
+        f"(skipped {runner_rows_skipped} runner odds rows, "
+        f"{participant_rows_skipped} participant odds rows)"
+    )
     return sweepstake_db
 
 
@@ -279,6 +474,12 @@ def refresh_sweepstake_leaderboard(
         for player in leaderboard_data["leaderboardRows"]
     }
 
+    updated_at = datetime.datetime.now(datetime.timezone.utc)
+    update = SweepstakesUpdate(
+        id=sweepstake_db.stringified_id,
+        updated_at=updated_at,
+        active=sweepstake_db.active,
+    )
     for participant in sweepstake_db.participants:
         for runner in participant.runners:
             if runner.score_provider_id is None:
@@ -299,11 +500,24 @@ def refresh_sweepstake_leaderboard(
                 )
                 score = None
 
+            if score != runner.score:
+                update.scores.append(
+                    RunnerScoreUpdate(
+                        participant=participant.name,
+                        provider_id=runner.market_provider_id,
+                        score=score,
+                    )
+                )
             runner.score = score
 
             session.add(runner)
 
+    sweepstake_db.updated_at = updated_at
+    session.add(sweepstake_db)
     session.commit()
+    sweepstake_responses.invalidate(sweepstake_db.id)
+    if update.scores:
+        live_updates.broker.publish(sweepstake_db.id, update)
     logging.info(f"Refreshed sweepstakes leaderboard for {sweepstake_db.id}")
 
     return sweepstake_db
@@ -1,4 +1,6 @@
+from .async_client import AsyncBetfairClient
+from .catalogue import RunnerCatalogueCache
 from .client import BetfairClient
 from .models import MarketInfo
 
-__all__ = ["BetfairClient", "MarketInfo"]
+__all__ = ["AsyncBetfairClient", "BetfairClient", "MarketInfo", "RunnerCatalogueCache"]
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+
+import httpx
+
+from sweepy.models import MarketNotFoundException
+from .catalogue import RunnerCatalogueCache
+from .client import (
+    EVENT_TYPES_PAYLOAD,
+    LOGIN_URL,
+    MAX_MARKET_BOOKS_PER_REQUEST,
+    MAX_MARKET_CATALOGUES_PER_REQUEST,
+    chunked,
+    login_request,
+    market_book_payload,
+    market_info_payload,
+    outright_markets_payload,
+    parse_market_info,
+    parse_outright_markets,
+    parse_selection_names,
+    selection_names_payload,
+)
+from .models import MarketInfo
+from .session import (
+    KEEP_ALIVE_URL,
+    SessionTokenManager,
+    is_session_expired,
+    keep_alive_request,
+    keep_alive_succeeded,
+)
+
+
+class AsyncBetfairClient:
+    """
+    asyncio-native Betfair client with the same method surface as BetfairClient.
+
+    Requests go through a single pooled `httpx.AsyncClient`, so connections are kept alive,
+    and at most `max_concurrency` requests are in flight at once. The session token is managed
+    as in BetfairClient.
+    """
+
+    BASE_SPORTS_URL = "https://api.betfair.com/exchange/betting/rest/v1.0/"
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        app_key: str,
+        runner_catalogue: RunnerCatalogueCache | None = None,
+        max_concurrency: int = 10,
+        max_connections: int = 20,
+        timeout_seconds: float = 10.0,
+    ) -> None:
+        self.username = username
+        self.password = password
+        self.app_key = app_key
+        self.runner_catalogue = (
+            runner_catalogue if runner_catalogue is not None else RunnerCatalogueCache()
+        )
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout_seconds,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.session_token = SessionTokenManager()
+
+    async def __aenter__(self) -> "AsyncBetfairClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    async def get_token(self) -> str:
+        return await self.session_token.aget(self.__renew_token)
+
+    async def keep_alive(self) -> str:
+        """
+        Renew the session token now, so the next request does not wait on a renewal.
+        """
+
+        return await self.session_token.arenew(self.__renew_token)
+
+    async def __renew_token(self, token: str | None) -> str:
+        if token is not None:
+            response = await self.http.post(
+                KEEP_ALIVE_URL, **keep_alive_request(token, self.app_key)
+            )
+            if response.is_success and keep_alive_succeeded(response.json()):
+                return token
+            logging.info("Betfair keepAlive failed, logging in again")
+
+        response = await self.http.post(
+            LOGIN_URL,
+            **login_request(self.username, self.password, self.app_key),
+        )
+        response.raise_for_status()
+        return response.json()["token"]
+
+    async def __post(
+        self, endpoint: str, payload: dict, retry_expired_session: bool = True
+    ):
+        token = await self.get_token()
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "X-Application": self.app_key,
+            "X-Authentication": token,
+        }
+        async with self._semaphore:
+            response = await self.http.post(
+                f"{self.BASE_SPORTS_URL}{endpoint}/",
+                headers=headers,
+                json=payload,
+            )
+        if retry_expired_session and is_session_expired(response):
+            logging.info(f"Betfair session expired during {endpoint}, renewing it")
+            self.session_token.invalidate(token)
+            return await self.__post(endpoint, payload, retry_expired_session=False)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_selection_names(self, market_id: str) -> dict[str, str]:
+        names_by_market = await self.get_selection_names_batch([market_id])
+        if market_id not in names_by_market:
+            raise MarketNotFoundException(
+                f"Market not found for market_id {market_id}."
+            )
+        return names_by_market[market_id]
+
+    async def get_selection_names_batch(
+        self, market_ids: list[str]
+    ) -> dict[str, dict[str, str]]:
+        """
+        Fetch runner names for many markets, keyed by market ID then selection ID.
+
+        Names are served from the runner catalogue cache where possible, and the remaining
+        chunks are requested concurrently.
+        """
+
+        names_by_market = {}
+        uncached_market_ids = []
+        for market_id in dict.fromkeys(market_ids):
+            runner_names = self.runner_catalogue.get(market_id)
+            if runner_names is None:
+                uncached_market_ids.append(market_id)
+            else:
+                names_by_market[market_id] = runner_names
+
+        responses = await asyncio.gather(
+            *(
+                self.__post("listMarketCatalogue", selection_names_payload(chunk))
+                for chunk in chunked(
+                    uncached_market_ids, MAX_MARKET_CATALOGUES_PER_REQUEST
+                )
+            )
+        )
+        for response_data in responses:
+            for market in response_data:
+                runner_names = parse_selection_names(market)
+                self.runner_catalogue.set(market["marketId"], runner_names)
+                names_by_market[market["marketId"]] = runner_names
+        return names_by_market
+
+    def invalidate_selection_names(self, market_id: str) -> None:
+        """
+        Drop the cached runner names for a market so the next lookup refetches them.
+        """
+
+        self.runner_catalogue.invalidate(market_id)
+
+    async def get_market_book(self, market_id: str):
+        market_books = await self.get_market_book_batch([market_id])
+        if market_id not in market_books:
+            raise MarketNotFoundException(
+                f"Market not found for market_id {market_id}."
+            )
+        return market_books[market_id]
+
+    async def get_market_book_batch(self, market_ids: list[str]) -> dict[str, dict]:
+        """
+        Fetch the market books for many markets, keyed by market ID.
+
+        Chunks within Betfair's request weight limit are requested concurrently. Closed
+        markets are evicted from the runner catalogue cache.
+        """
+
+        responses = await asyncio.gather(
+            *(
+                self.__post("listMarketBook", market_book_payload(chunk))
+                for chunk in chunked(
+                    list(dict.fromkeys(market_ids)), MAX_MARKET_BOOKS_PER_REQUEST
+                )
+            )
+        )
+        market_books = {}
+        for response_data in responses:
+            for market_book in response_data:
+                if market_book.get("status") == "CLOSED":
+                    self.runner_catalogue.invalidate(market_book["marketId"])
+                market_books[market_book["marketId"]] = market_book
+        return market_books
+
+    async def get_event_types(self) -> list[dict]:
+        response_data = await self.__post("listEventTypes", EVENT_TYPES_PAYLOAD)
+        return [item["eventType"] for item in response_data]
+
+    async def get_outright_markets(self, event_type_id: str) -> list[MarketInfo]:
+        response_data = await self.__post(
+            "listMarketCatalogue", outright_markets_payload(event_type_id)
+        )
+        return parse_outright_markets(response_data, event_type_id)
+
+    async def get_market_info(self, market_id: str) -> MarketInfo:
+        response_data = await self.__post(
+            "listMarketCatalogue", market_info_payload(market_id)
+        )
+        if not response_data:
+            raise MarketNotFoundException(
+                f"Market not found for market_id {market_id}."
+            )
+        return parse_market_info(response_data[0])
@@ -0,0 +1,116 @@
+from collections import OrderedDict
+import sqlite3
+import threading
+
+
+class RunnerCatalogueCache:
+    """
+    Cache of runner names per market, as returned by listMarketCatalogue.
+
+    Runner names never change during a market's life, so entries only leave the cache
+    through LRU eviction or an explicit invalidation when the market closes. If a `path`
+    is given, entries are also written to a local SQLite database so they survive restarts.
+    The database also holds at most `max_markets` markets, dropping those written longest ago.
+    """
+
+    def __init__(self, max_markets: int = 256, path: str | None = None) -> None:
+        if max_markets <= 0:
+            raise ValueError("max_markets must be greater than 0")
+
+        self.max_markets = max_markets
+        self._markets: OrderedDict[str, dict[int, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS runner_catalogue ("
+                "market_id TEXT NOT NULL, "
+                "selection_id INTEGER NOT NULL, "
+                "runner_name TEXT NOT NULL, "
+                "PRIMARY KEY (market_id, selection_id))"
+            )
+            self._prune()
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    def get(self, market_id: str) -> dict[int, str] | None:
+        """
+        Returns the runner names for a market, or None if they are not cached.
+        """
+
+        with self._lock:
+            if market_id in self._markets:
+                self._markets.move_to_end(market_id)
+                return self._markets[market_id]
+
+            runner_names = self._load(market_id)
+            if runner_names:
+                self._store_in_memory(market_id, runner_names)
+                return runner_names
+
+        return None
+
+    def set(self, market_id: str, runner_names: dict[int, str]) -> None:
+        """
+        Caches the runner names for a market.
+        """
+
+        with self._lock:
+            self._store_in_memory(market_id, runner_names)
+
+            if self._connection is not None:
+                self._connection.execute(
+                    "DELETE FROM runner_catalogue WHERE market_id = ?", (market_id,)
+                )
+                self._connection.executemany(
+                    "INSERT INTO runner_catalogue VALUES (?, ?, ?)",
+                    [
+                        (market_id, selection_id, runner_name)
+                        for selection_id, runner_name in runner_names.items()
+                    ],
+                )
+                self._prune()
+                self._connection.commit()
+
+    def invalidate(self, market_id: str) -> None:
+        """
+        Removes a market from the cache, e.g. once the market has closed.
+        """
+
+        with self._lock:
+            self._markets.pop(market_id, None)
+
+            if self._connection is not None:
+                self._connection.execute(
+                    "DELETE FROM runner_catalogue WHERE market_id = ?", (market_id,)
+                )
+                self._connection.commit()
+
+    def _store_in_memory(self, market_id: str, runner_names: dict[int, str]) -> None:
+        self._markets[market_id] = runner_names
+        self._markets.move_to_end(market_id)
+        while len(self._markets) > self.max_markets:
+            self._markets.popitem(last=False)
+
+    def _prune(self) -> None:
+        # Rows are re-inserted on every set, so the latest rowid orders markets by write
+        self._connection.execute(
+            "DELETE FROM runner_catalogue WHERE market_id NOT IN ("
+            "SELECT market_id FROM runner_catalogue GROUP BY market_id "
+            "ORDER BY MAX(rowid) DESC LIMIT ?)",
+            (self.max_markets,),
+        )
+
+    def _load(self, market_id: str) -> dict[int, str] | None:
+        if self._connection is None:
+            return None
+
+        rows = self._connection.execute(
+            "SELECT selection_id, runner_name FROM runner_catalogue WHERE market_id = ?",
+            (market_id,),
+        ).fetchall()
+        return dict(rows)
@@ -1,160 +1,308 @@
+from collections.abc import Iterator
+import logging
+
 import arrow
 import requests
-from sweepy.cache import timed_cached_property
+from sweepy.models import MarketNotFoundException
+from .catalogue import RunnerCatalogueCache
 from .models import MarketInfo
+from .session import (
+    KEEP_ALIVE_URL,
+    SessionTokenManager,
+    is_session_expired,
+    keep_alive_request,
+    keep_alive_succeeded,
+)
 
 LOGIN_URL = "https://identitysso.betfair.com/api/login"
 
+# Betfair rejects requests whose summed market weight exceeds 200 points.
+# EX_BEST_OFFERS costs 5 points per market in listMarketBook, and RUNNER_DESCRIPTION
+# is weightless in listMarketCatalogue so only maxResults (1000) bounds it.
+MAX_REQUEST_WEIGHT = 200
+MARKET_BOOK_WEIGHT = 5
+MAX_MARKET_BOOKS_PER_REQUEST = MAX_REQUEST_WEIGHT // MARKET_BOOK_WEIGHT
+MAX_MARKET_CATALOGUES_PER_REQUEST = 1000
+
+
+def chunked(items: list[str], chunk_size: int) -> Iterator[list[str]]:
+    """
+    Split a list into consecutive chunks of at most `chunk_size` items.
+    """
+
+    for i in range(0, len(items), chunk_size):
+        yield items[i : i + chunk_size]
+
+
+def login_request(username: str, password: str, app_key: str) -> dict:
+    """
+    Keyword arguments for the interactive login request.
+    """
+
+    return {
+        "headers": {
+            "Accept": "application/json",
+            "Content-Type": "application/x-www-form-urlencoded",
+            "X-Application": app_key,
+        },
+        "data": {
+            "username": username,
+            "password": password,
+        },
+    }
+
+
+def selection_names_payload(market_ids: list[str]) -> dict:
+    return {
+        "filter": {
+            "marketIds": market_ids,
+        },
+        "maxResults": len(market_ids),
+        "marketProjection": ["RUNNER_DESCRIPTION"],
+    }
+
+
+def parse_selection_names(market: dict) -> dict[int, str]:
+    return {runner["selectionId"]: runner["runnerName"] for runner in market["runners"]}
+
+
+def market_book_payload(market_ids: list[str]) -> dict:
+    return {
+        "marketIds": market_ids,
+        "priceProjection": {
+            "priceData": ["EX_BEST_OFFERS"],
+        },
+    }
+
+
+EVENT_TYPES_PAYLOAD = {
+    "filter": {},
+    "maxResults": 100,
+}
+
+
+def outright_markets_payload(event_type_id: str) -> dict:
+    return {
+        "filter": {
+            "eventTypeIds": [event_type_id],
+            "marketTypeCodes": [
+                "WINNER",
+                "TOURNAMENT_WINNER",
+                "OUTRIGHT_WINNER",
+                "NONSPORT",
+            ],
+        },
+        "maxResults": 25,
+        "marketProjection": ["EVENT", "COMPETITION", "MARKET_START_TIME"],
+        "sort": "FIRST_TO_START",
+    }
+
+
+def parse_outright_markets(markets: list[dict], event_type_id: str) -> list[MarketInfo]:
+    return [
+        MarketInfo(
+            market_id=market["marketId"],
+            market_name=market["marketName"].strip(),
+            event_name=market["event"]["name"].strip(),
+            event_type=event_type_id,
+            competition_name=market["competition"]["name"].strip(),
+            market_start_time=market["marketStartTime"],
+        )
+        for market in markets
+        if "event" in market and "competition" in market
+    ]
+
+
+def market_info_payload(market_id: str) -> dict:
+    return {
+        "filter": {
+            "marketIds": [market_id],
+        },
+        "maxResults": 1,
+        "marketProjection": [
+            "EVENT",
+            "COMPETITION",
+            "MARKET_START_TIME",
+            "EVENT_TYPE",
+        ],
+    }
+
+
+def parse_market_info(market_info: dict) -> MarketInfo:
+    return MarketInfo(
+        market_id=market_info["marketId"],
+        market_name=market_info["marketName"].strip(),
+        event_name=market_info["event"]["name"].strip(),
+        event_type=market_info["eventType"]["id"],
+        competition_name=market_info["competition"]["name"].strip(),
+        market_start_time=arrow.get(market_info["marketStartTime"]).datetime,
+    )
+
 
 class BetfairClient:
+    """
+    Synchronous Betfair client. Requests share a pooled `requests.Session`, so connections
+    are kept alive between calls.
+
+    The session token is renewed ahead of expiry by a `SessionTokenManager`, and a request
+    rejected for an expired session is retried once with a new token.
+    """
+
     BASE_SPORTS_URL = "https://api.betfair.com/exchange/betting/rest/v1.0/"
 
-    def __init__(self, username: str, password: str, app_key: str) -> None:
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        app_key: str,
+        runner_catalogue: RunnerCatalogueCache | None = None,
+    ) -> None:
         self.username = username
         self.password = password
         self.app_key = app_key
+        self.runner_catalogue = (
+            runner_catalogue if runner_catalogue is not None else RunnerCatalogueCache()
+        )
+        self.session = requests.Session()
+        self.session_token = SessionTokenManager()
 
-    def __headers(self, include_token: bool = True):
-        headers = {
+    def __headers(self, token: str):
+        return {
             "Accept": "application/json",
             "Content-Type": "application/json",
             "X-Application": self.app_key,
+            "X-Authentication": token,
         }
-        if include_token:
-            headers["X-Authentication"] = self.token
-        return headers
-
-    @timed_cached_property(ttl_seconds=1800)
-    def token(self):
-        response = requests.post(
-            LOGIN_URL,
-            headers={
-                "Accept": "application/json",
-                "Content-Type": "application/x-www-form-urlencoded",
-                "X-Application": self.app_key,
-            },
-            data={
-                "username": self.username,
-                "password": self.password,
-            },
+
+    def __post(self, endpoint: str, payload: dict, retry_expired_session: bool = True):
+        token = self.token
+        response = self.session.post(
+            f"{self.BASE_SPORTS_URL}{endpoint}/",
+            headers=self.__headers(token),
+            json=payload,
         )
+        if retry_expired_session and is_session_expired(response):
+            logging.info(f"Betfair session expired during {endpoint}, renewing it")
+            self.session_token.invalidate(token)
+            return self.__post(endpoint, payload, retry_expired_session=False)
         response.raise_for_status()
-        response_data = response.json()
-        return response_data["token"]
+        return response.json()
 
-    def get_selection_names(self, market_id: str) -> dict[str, str]:
-        url = f"{self.BASE_SPORTS_URL}listMarketCatalogue/"
-        response = requests.post(
-            url,
-            headers=self.__headers(),
-            json={
-                "filter": {
-                    "marketIds": [market_id],
-                },
-                "maxResults": 1000,
-                "marketProjection": ["RUNNER_DESCRIPTION"],
-            },
+    @property
+    def token(self) -> str:
+        return self.session_token.get(self.__renew_token)
+
+    def keep_alive(self) -> str:
+        """
+        Renew the session token now, so the next request does not wait on a renewal.
+        """
+
+        return self.session_token.renew(self.__renew_token)
+
+    def __renew_token(self, token: str | None) -> str:
+        if token is not None:
+            response = self.session.post(
+                KEEP_ALIVE_URL, **keep_alive_request(token, self.app_key)
+            )
+            if response.ok and keep_alive_succeeded(response.json()):
+                return token
+            logging.info("Betfair keepAlive failed, logging in again")
+
+        response = self.session.post(
+            LOGIN_URL, **login_request(self.username, self.password, self.app_key)
         )
         response.raise_for_status()
         response_data = response.json()
-        runners = {
-            runner["selectionId"]: runner["runnerName"]
-            for runner in response_data[0]["runners"]
-        }
-        return runners
+        return response_data["token"]
+
+    def get_selection_names(self, market_id: str) -> dict[str, str]:
+        names_by_market = self.get_selection_names_batch([market_id])
+        if market_id not in names_by_market:
+            raise MarketNotFoundException(
+                f"Market not found for market_id {market_id}."
+            )
+        return names_by_market[market_id]
+
+    def get_selection_names_batch(
+        self, market_ids: list[str]
+    ) -> dict[str, dict[str, str]]:
+        """
+        Fetch runner names for many markets, keyed by market ID then selection ID.
+
+        Names are served from the runner catalogue cache where possible. Markets Betfair
+        does not return are missing from the result.
+        """
+
+        names_by_market = {}
+        uncached_market_ids = []
+        for market_id in dict.fromkeys(market_ids):
+            runner_names = self.runner_catalogue.get(market_id)
+            if runner_names is None:
+                uncached_market_ids.append(market_id)
+            else:
+                names_by_market[market_id] = runner_names
+
+        for chunk in chunked(uncached_market_ids, MAX_MARKET_CATALOGUES_PER_REQUEST):
+            response_data = self.__post(
+                "listMarketCatalogue", selection_names_payload(chunk)
+            )
+            for market in response_data:
+                runner_names = parse_selection_names(market)
+                self.runner_catalogue.set(market["marketId"], runner_names)
+                names_by_market[market["marketId"]] = runner_names
+        return names_by_market
+
+    def invalidate_selection_names(self, market_id: str) -> None:
+        """
+        Drop the cached runner names for a market so the next lookup refetches them.
+        """
+
+        self.runner_catalogue.invalidate(market_id)
 
     def get_market_book(self, market_id: str):
-        url = f"{self.BASE_SPORTS_URL}listMarketBook/"
-        response = requests.post(
-            url,
-            headers=self.__headers(),
-            json={
-                "marketIds": [market_id],
-                "priceProjection": {
-                    "priceData": ["EX_BEST_OFFERS"],
-                },
-            },
-        )
+        market_books = self.get_market_book_batch([market_id])
+        if market_id not in market_books:
+            raise MarketNotFoundException(
+                f"Market not found for market_id {market_id}."
+            )
+        return market_books[market_id]
 
-        response.raise_for_status()
-        response_data = response.json()
-        return response_data[0]
+    def get_market_book_batch(self, market_ids: list[str]) -> dict[str, dict]:
+        """
+        Fetch the market books for many markets, keyed by market ID.
 
-    def get_event_types(self) -> list[dict]:
-        url = f"{self.BASE_SPORTS_URL}listEventTypes/"
-        response = requests.post(
-            url,
-            headers=self.__headers(),
-            json={
-                "filter": {},
-                "maxResults": 100,
-            },
-        )
-        response.raise_for_status()
+        Requests are split so each stays within Betfair's request weight limit. Markets
+        Betfair does not return are missing from the result, and closed markets are
+        evicted from the runner catalogue cache.
+        """
 
-        return [item["eventType"] for item in response.json()]
+        market_books = {}
+        for chunk in chunked(
+            list(dict.fromkeys(market_ids)), MAX_MARKET_BOOKS_PER_REQUEST
+        ):
+            response_data = self.__post("listMarketBook", market_book_payload(chunk))
+            for market_book in response_data:
+                if market_book.get("status") == "CLOSED":
+                    self.runner_catalogue.invalidate(market_book["marketId"])
+                market_books[market_book["marketId"]] = market_book
+        return market_books
+
+    def get_event_types(self) -> list[dict]:
+        response_data = self.__post("listEventTypes", EVENT_TYPES_PAYLOAD)
+        return [item["eventType"] for item in response_data]
 
     def get_outright_markets(self, event_type_id: str) -> list[MarketInfo]:
-        url = f"{self.BASE_SPORTS_URL}listMarketCatalogue/"
-        response = requests.post(
-            url,
-            headers=self.__headers(),
-            json={
-                "filter": {
-                    "eventTypeIds": [event_type_id],
-                    "marketTypeCodes": [
-                        "WINNER",
-                        "TOURNAMENT_WINNER",
-                        "OUTRIGHT_WINNER",
-                        "NONSPORT",
-                    ],
-                },
-                "maxResults": 25,
-                "marketProjection": ["EVENT", "COMPETITION", "MARKET_START_TIME"],
-                "sort": "FIRST_TO_START",
-            },
+        response_data = self.__post(
+            "listMarketCatalogue", outright_markets_payload(event_type_id)
         )
-        response.raise_for_status()
-
-        return [
-            MarketInfo(
-                market_id=market["marketId"],
-                market_name=market["marketName"].strip(),
-                event_name=market["event"]["name"].strip(),
-                event_type=event_type_id,
-                competition_name=market["competition"]["name"].strip(),
-                market_start_time=market["marketStartTime"],
-            )
-            for market in response.json()
-            if "event" in market and "competition" in market
-        ]
+        return parse_outright_markets(response_data, event_type_id)
 
     def get_market_info(self, market_id: str) -> MarketInfo:
-        url = f"{self.BASE_SPORTS_URL}listMarketCatalogue/"
-        response = requests.post(
-            url,
-            headers=self.__headers(),
-            json={
-                "filter": {
-                    "marketIds": [market_id],
-                },
-                "maxResults": 1,
-                "marketProjection": [
-                    "EVENT",
-                    "COMPETITION",
-                    "MARKET_START_TIME",
-                    "EVENT_TYPE",
-                ],
-            },
-        )
-        response.raise_for_status()
-        market_info = response.json()[0]
-        print(f"Market Info: {market_info}")  # Debugging line
-        return MarketInfo(
-            market_id=market_info["marketId"],
-            market_name=market_info["marketName"].strip(),
-            event_name=market_info["event"]["name"].strip(),
-            event_type=market_info["eventType"]["id"],
-            competition_name=market_info["competition"]["name"].strip(),
-            market_start_time=arrow.get(market_info["marketStartTime"]).datetime,
+        response_data = self.__post(
+            "listMarketCatalogue", market_info_payload(market_id)
         )
+        if not response_data:
+            raise MarketNotFoundException(
+                f"Market not found for market_id {market_id}."
+            )
+        return parse_market_info(response_data[0])
@@ -0,0 +1,111 @@
+from collections.abc import Awaitable, Callable
+import time
+
+from sweepy.cache import TTLCache
+
+KEEP_ALIVE_URL = "https://identitysso.betfair.com/api/keepAlive"
+
+# Betfair sessions lapse after a period without activity. Tokens are renewed well inside that,
+# starting `TOKEN_REFRESH_MARGIN_SECONDS` before they are considered expired.
+TOKEN_TTL_SECONDS = 1800
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+# APINGException error codes meaning the session token is no longer valid
+SESSION_EXPIRED_ERROR_CODES = ("INVALID_SESSION_INFORMATION", "NO_SESSION")
+
+
+def keep_alive_request(token: str, app_key: str) -> dict:
+    """
+    Keyword arguments for the keepAlive request, which extends a session without logging in.
+    """
+
+    return {
+        "headers": {
+            "Accept": "application/json",
+            "X-Application": app_key,
+            "X-Authentication": token,
+        },
+    }
+
+
+def keep_alive_succeeded(response_data: dict) -> bool:
+    return response_data.get("status") == "SUCCESS"
+
+
+def is_session_expired(response) -> bool:
+    """
+    Whether a `requests` or `httpx` response is Betfair rejecting the session token.
+    """
+
+    return response.status_code >= 400 and any(
+        error_code in response.text for error_code in SESSION_EXPIRED_ERROR_CODES
+    )
+
+
+class SessionTokenManager:
+    """
+    Holds a Betfair session token and renews it before it expires.
+
+    For the first `ttl_seconds - refresh_margin_seconds` the token is returned as is. During the
+    last `refresh_margin_seconds` callers still get the current token while one renewal runs in
+    the background. Past `ttl_seconds` the next caller renews it and concurrent callers wait
+    on that same renewal, so a client never logs in more than once at a time.
+
+    Renewal is done by the client's `renew` function, which is passed the current token (or
+    None) so it can try keepAlive before logging in again. Renewal on use alone lets the
+    token lapse between infrequent requests, so `renew` and `arenew` are also called on a
+    timer, by `tasks.keep_betfair_sessions_alive_task`, to renew it before it expires.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = TOKEN_TTL_SECONDS,
+        refresh_margin_seconds: float = TOKEN_REFRESH_MARGIN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 <= refresh_margin_seconds < ttl_seconds:
+            raise ValueError("refresh_margin_seconds must be between 0 and ttl_seconds")
+
+        self.token: str | None = None
+        self.cache = TTLCache(
+            max_size=1,
+            ttl_seconds=ttl_seconds - refresh_margin_seconds,
+            stale_seconds=refresh_margin_seconds,
+            clock=clock,
+        )
+
+    def get(self, renew: Callable[[str | None], str]) -> str:
+        return self.cache.get_or_compute(None, lambda: self._store(renew(self.token)))
+
+    async def aget(self, renew: Callable[[str | None], Awaitable[str]]) -> str:
+        async def compute():
+            return self._store(await renew(self.token))
+
+        return await self.cache.aget_or_compute(None, compute)
+
+    def renew(self, renew: Callable[[str | None], str]) -> str:
+        """
+        Renew the token now, however long it has left.
+        """
+
+        token = self._store(renew(self.token))
+        self.cache.set(None, token)
+        return token
+
+    async def arenew(self, renew: Callable[[str | None], Awaitable[str]]) -> str:
+        token = self._store(await renew(self.token))
+        self.cache.set(None, token)
+        return token
+
+    def invalidate(self, token: str) -> None:
+        """
+        Discard `token` after Betfair rejected it. A token renewed in the meantime is kept.
+        """
+
+        self.cache.invalidate(None, token)
+        if self.token == token:
+            self.token = None
+
+    def _store(self, token: str) -> str:
+        self.token = token
+        return token
@@ -48,7 +48,9 @@ class LiveGolfClient:
         schedule = response.json()["schedule"]
         return list(map(parse_tournament_from_schedule_response, schedule))
 
-    @timed_cache(60)
+    # Leaderboards only move every few minutes, so a slightly stale one is served while it
+    # is refetched in the background
+    @timed_cache(60, max_size=64, stale_seconds=120)
     def get_leaderboard(self, year: int, tournament_id: str, tour_id: int = 1):
         url = f"{BASE_URL}leaderboard"
         response = requests.get(
@@ -0,0 +1,103 @@
+import asyncio
+from collections.abc import AsyncIterator
+import logging
+import threading
+
+from sweepy.models.sweepstakes import SweepstakesUpdate
+
+HEARTBEAT_SECONDS = 15.0
+
+
+class LiveUpdateBroker:
+    """
+    Fans sweepstake updates out to Server-Sent Events subscribers.
+
+    Each update is encoded into an SSE frame once per publish and the same bytes are queued for
+    every subscriber. `publish` is safe to call from the refresh worker threads; the fan-out
+    always runs on the event loop the subscribers are waiting on.
+    """
+
+    def __init__(self, max_queued_updates: int = 16) -> None:
+        self.max_queued_updates = max_queued_updates
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def subscriber_count(self, sweepstake_id: int) -> int:
+        with self._lock:
+            return len(self._subscribers.get(sweepstake_id, ()))
+
+    def subscribe(self, sweepstake_id: int) -> asyncio.Queue:
+        """
+        Register a subscriber for a sweepstake. Must be called on the event loop.
+        """
+
+        queue = asyncio.Queue(maxsize=self.max_queued_updates)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.setdefault(sweepstake_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, sweepstake_id: int, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(sweepstake_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[sweepstake_id]
+
+    def publish(self, sweepstake_id: int, update: SweepstakesUpdate) -> None:
+        """
+        Send an update to every subscriber of a sweepstake. Does nothing without subscribers.
+        """
+
+        with self._lock:
+            loop = self._loop
+            if not self._subscribers.get(sweepstake_id) or loop is None:
+                return
+
+        frame = f"event: update\ndata: {update.model_dump_json()}\n\n".encode()
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            self._fan_out(sweepstake_id, frame)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(self._fan_out, sweepstake_id, frame)
+
+    def _fan_out(self, sweepstake_id: int, frame: bytes) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(sweepstake_id, ()))
+
+        for queue in subscribers:
+            if queue.full():
+                # A slow client loses its oldest update rather than holding up the others
+                logging.warning(
+                    f"Dropping a live update for a slow subscriber of sweepstake {sweepstake_id}"
+                )
+                queue.get_nowait()
+            queue.put_nowait(frame)
+
+    async def stream(
+        self, sweepstake_id: int, heartbeat_seconds: float = HEARTBEAT_SECONDS
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield SSE frames for a sweepstake until the client disconnects, with a comment every
+        `heartbeat_seconds` to keep idle connections open through proxies.
+        """
+
+        queue = self.subscribe(sweepstake_id)
+        try:
+            yield b": connected\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield b": heartbeat\n\n"
+        finally:
+            self.unsubscribe(sweepstake_id, queue)
+
+
+broker = LiveUpdateBroker()
@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+import numpy as np
+
+from sweepy.models import RunnerOdds
+
+
+class MarketOdds:
+    """
+    The implied probabilities of a market's runners, as parallel arrays of provider IDs,
+    names and float64 probabilities.
+
+    This is the representation used while fetching and refreshing odds, so no Pydantic model
+    is validated per runner. Convert to `RunnerOdds` with `to_runner_odds` where a model is
+    needed, e.g. for assignment or an API response. Probabilities rounded to
+    `decimal_places` convert back to decimals with exactly that many places.
+    """
+
+    __slots__ = (
+        "provider_ids",
+        "names",
+        "probabilities",
+        "decimal_places",
+        "_positions",
+    )
+
+    def __init__(
+        self,
+        provider_ids: list[str],
+        names: list[str],
+        probabilities: np.ndarray,
+        decimal_places: int | None = None,
+    ) -> None:
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        if not len(provider_ids) == len(names) == len(probabilities):
+            raise ValueError(
+                "provider_ids, names and probabilities must be equal length"
+            )
+
+        self.provider_ids = provider_ids
+        self.names = names
+        self.probabilities = probabilities
+        self.decimal_places = decimal_places
+        self._positions: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.provider_ids)
+
+    def __contains__(self, provider_id: str) -> bool:
+        return provider_id in self.positions
+
+    @property
+    def positions(self) -> dict[str, int]:
+        """
+        The position of each provider ID in the arrays, built on first use.
+        """
+
+        if self._positions is None:
+            self._positions = {
+                provider_id: i for i, provider_id in enumerate(self.provider_ids)
+            }
+        return self._positions
+
+    def implied_probability(self, provider_id: str) -> Decimal | None:
+        """
+        The implied probability of a runner, or None if it is not in the market.
+        """
+
+        i = self.positions.get(provider_id)
+        if i is None:
+            return None
+        return self._to_decimal(float(self.probabilities[i]))
+
+    @classmethod
+    def from_runner_odds(cls, selections: list[RunnerOdds]) -> "MarketOdds":
+        """
+        Pack a list of RunnerOdds into arrays. Scores are dropped.
+        """
+
+        return cls(
+            [selection.provider_id for selection in selections],
+            [selection.name for selection in selections],
+            np.array(
+                [float(selection.implied_probability) for selection in selections]
+            ),
+        )
+
+    def to_runner_odds(self) -> list[RunnerOdds]:
+        """
+        Build a RunnerOdds model for every runner, in order.
+        """
+
+        return [
+            RunnerOdds(
+                provider_id=provider_id,
+                name=name,
+                implied_probability=self._to_decimal(probability),
+            )
+            for provider_id, name, probability in zip(
+                self.provider_ids, self.names, self.probabilities.tolist()
+            )
+        ]
+
+    def _to_decimal(self, probability: float) -> Decimal:
+        if self.decimal_places is None:
+            # The shortest repr of a float is the decimal it was parsed from, e.g. 0.1234
+            return Decimal(repr(probability))
+        return Decimal(f"{probability:.{self.decimal_places}f}")
@@ -0,0 +1,61 @@
+import asyncio
+from collections import deque
+import time
+
+from sweepy.models import RefreshReport, RetentionReport
+
+
+class EventLoopLagMonitor:
+    """
+    Measures event loop lag by sleeping for a fixed interval and recording how late the
+    loop wakes up. Any blocking call on the loop shows up as lag.
+    """
+
+    def __init__(self, interval_seconds: float = 0.25) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be greater than 0")
+
+        self.interval_seconds = interval_seconds
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self.window_max_lag_seconds = 0.0
+        self.samples = 0
+
+    def record(self, lag_seconds: float) -> None:
+        self.last_lag_seconds = lag_seconds
+        self.max_lag_seconds = max(self.max_lag_seconds, lag_seconds)
+        self.window_max_lag_seconds = max(self.window_max_lag_seconds, lag_seconds)
+        self.samples += 1
+
+    def reset_window(self) -> float:
+        """
+        Start a new measurement window, returning the maximum lag seen in the last one.
+        """
+
+        window_max_lag_seconds = self.window_max_lag_seconds
+        self.window_max_lag_seconds = 0.0
+        return window_max_lag_seconds
+
+    async def run(self) -> None:
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(self.interval_seconds)
+            elapsed = time.perf_counter() - started_at
+            self.record(max(elapsed - self.interval_seconds, 0.0))
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "interval_seconds": self.interval_seconds,
+            "last_lag_ms": self.last_lag_seconds * 1000,
+            "max_lag_ms": self.max_lag_seconds * 1000,
+            "samples": self.samples,
+        }
+
+
+event_loop_lag = EventLoopLagMonitor()
+
+# The most recent refresh report per background task, e.g. "odds" and "scores"
+refresh_reports: dict[str, RefreshReport] = {}
+
+# The most recent odds history retention runs, newest last
+retention_reports: deque[RetentionReport] = deque(maxlen=10)
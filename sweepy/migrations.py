@@ -0,0 +1,103 @@
+"""
+Schema migrations for databases created before a column was added.
+
+`SQLModel.metadata.create_all` only creates missing tables, so new columns on existing
+tables are added here. Every migration is idempotent and runs on each `init_db`.
+"""
+
+import logging
+
+from sqlalchemy import Connection, Engine, inspect, text
+from sqlmodel import SQLModel
+
+LATEST_ODDS_TABLES = {
+    "runner": ("runnerodds", "runner_id"),
+    "participant": ("participantodds", "participant_id"),
+}
+
+
+def add_latest_odds_columns(connection: Connection) -> None:
+    """
+    Add the denormalised latest odds columns to runner and participant, and backfill them
+    from the most recent row of each odds history.
+
+    The backfill only runs in the migration that adds the columns, as later odds are written
+    to both. It relies on the odds history (owner ID, timestamp) indexes to find each latest
+    row without scanning the history.
+    """
+
+    inspector = inspect(connection)
+    for table, (history_table, foreign_key) in LATEST_ODDS_TABLES.items():
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "latest_odds_at" in columns:
+            continue
+
+        if "latest_probability" not in columns:
+            connection.execute(
+                text(f"ALTER TABLE {table} ADD COLUMN latest_probability FLOAT")
+            )
+        connection.execute(
+            text(
+                f"ALTER TABLE {table} ADD COLUMN latest_odds_at TIMESTAMP WITH TIME ZONE"
+            )
+        )
+
+        latest_row = (
+            f"SELECT {{column}} FROM {history_table} "
+            f"WHERE {history_table}.{foreign_key} = {table}.id "
+            f"ORDER BY {history_table}.timestamp DESC, {history_table}.id DESC LIMIT 1"
+        )
+        result = connection.execute(
+            text(
+                f"UPDATE {table} SET "
+                f"latest_probability = ({latest_row.format(column='implied_probability')}), "
+                f"latest_odds_at = ({latest_row.format(column='timestamp')})"
+            )
+        )
+        logging.info(f"Backfilled latest odds for {result.rowcount} {table} rows.")
+
+
+def add_sweepstake_seed_column(connection: Connection) -> None:
+    """
+    Add the column recording the seed each sweepstake's assignments were drawn from. Older
+    sweepstakes have no seed.
+    """
+
+    inspector = inspect(connection)
+    if not inspector.has_table("sweepstakes"):
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("sweepstakes")}
+    if "seed" not in columns:
+        connection.execute(text("ALTER TABLE sweepstakes ADD COLUMN seed BIGINT"))
+        logging.info("Added seed column to sweepstakes.")
+
+
+def create_missing_indexes(connection: Connection) -> None:
+    """
+    Create any index declared on the models that is missing from an existing table.
+    """
+
+    inspector = inspect(connection)
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+                logging.info(f"Created index {index.name} on {table.name}.")
+
+
+# Indexes come first so backfills can use them
+MIGRATIONS = [
+    create_missing_indexes,
+    add_latest_odds_columns,
+    add_sweepstake_seed_column,
+]
+
+
+def run_migrations(engine: Engine) -> None:
+    with engine.begin() as connection:
+        for migration in MIGRATIONS:
+            migration(connection)
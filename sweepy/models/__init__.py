@@ -1,7 +1,10 @@
 from .market import Market, Runner, PriceSize
 from .sweepstakes import RunnerOdds, Participant, Sweepstakes
 from .api import SweepstakesRequest
-from .enums import AssignmentMethod
+from .refresh import RefreshResult, RefreshReport
+from .retention import CompactionTier, RetentionPolicy, RetentionReport
+from .simulation import DistributionSummary, FairnessSimulation, MethodFairness
+from .enums import AssignmentMethod, DownsamplingMethod
 from .exceptions import (
     MarketNotFoundException,
     NotEnoughSelectionsException,
@@ -10,11 +13,20 @@ from .exceptions import (
 
 __all__ = [
     "AssignmentMethod",
+    "CompactionTier",
+    "DistributionSummary",
+    "DownsamplingMethod",
+    "FairnessSimulation",
     "Market",
+    "MethodFairness",
     "PriceSize",
     "Runner",
     "RunnerOdds",
     "Participant",
+    "RefreshResult",
+    "RefreshReport",
+    "RetentionPolicy",
+    "RetentionReport",
     "SweepstakesRequest",
     "Sweepstakes",
     "MarketNotFoundException",
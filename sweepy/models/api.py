@@ -1,4 +1,4 @@
-from pydantic import BaseModel, conlist
+from pydantic import BaseModel, conint, conlist
 
 from sweepy.models.enums import AssignmentMethod
 
@@ -13,6 +13,10 @@ class SweepstakesRequest(BaseModel):
     method: AssignmentMethod
     participant_names: conlist(str, min_length=2)
     competition: str | None = None
+    # Reuse a sweepstake's stored seed to reproduce its assignments
+    seed: conint(ge=0, lt=2**63) | None = None
+    # How many assignments to generate, keeping the fairest
+    candidates: conint(ge=1, le=1000) = 1
 
 
 class EventType(BaseModel, frozen=True):
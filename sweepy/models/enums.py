@@ -6,3 +6,9 @@ class AssignmentMethod(str, Enum):
     TIERED = "tiered"
     RANDOM = "random"
     FAIR = "fair"
+    BALANCED = "balanced"
+
+
+class DownsamplingMethod(str, Enum):
+    BUCKETS = "buckets"
+    LTTB = "lttb"
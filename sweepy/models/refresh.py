@@ -0,0 +1,37 @@
+import datetime
+from pydantic import BaseModel
+
+
+class RefreshResult(BaseModel):
+    """
+    Outcome of refreshing a single sweepstake within a refresh cycle.
+    """
+
+    sweepstake_id: int
+    duration_seconds: float
+    attempts: int
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+class RefreshReport(BaseModel):
+    """
+    Summary of a refresh cycle across all sweepstakes.
+    """
+
+    started_at: datetime.datetime
+    duration_seconds: float
+    results: list[RefreshResult]
+
+    @property
+    def failures(self) -> list[RefreshResult]:
+        return [result for result in self.results if not result.succeeded]
+
+    def __str__(self):
+        return (
+            f"{len(self.results) - len(self.failures)}/{len(self.results)} sweepstakes "
+            f"refreshed in {self.duration_seconds:.2f}s, {len(self.failures)} failed"
+        )
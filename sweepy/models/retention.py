@@ -0,0 +1,51 @@
+import datetime
+from pydantic import BaseModel
+
+
+class CompactionTier(BaseModel):
+    """
+    Odds history older than `older_than_seconds` is compacted to one row per owner every
+    `resolution_seconds`.
+    """
+
+    older_than_seconds: int
+    resolution_seconds: int
+
+
+class RetentionPolicy(BaseModel):
+    """
+    How odds history is compacted and archived as it ages.
+    """
+
+    tiers: list[CompactionTier] = [
+        # Hourly after a day, daily after a week
+        CompactionTier(older_than_seconds=86400, resolution_seconds=3600),
+        CompactionTier(older_than_seconds=604800, resolution_seconds=86400),
+    ]
+    # Closed sweepstakes not updated for this long have their history moved into a single
+    # compressed archive row. None disables archiving.
+    archive_closed_after_seconds: int | None = None
+
+
+class RetentionReport(BaseModel):
+    """
+    Summary of a retention run. In a dry run nothing is written and the counts show what a
+    real run would do.
+    """
+
+    started_at: datetime.datetime
+    dry_run: bool
+    rows_deleted: int = 0
+    rows_inserted: int = 0
+    sweepstakes_archived: int = 0
+    archive_bytes: int = 0
+    estimated_bytes_reclaimed: int = 0
+
+    def __str__(self):
+        prefix = "Would reclaim" if self.dry_run else "Reclaimed"
+        return (
+            f"{prefix} ~{self.estimated_bytes_reclaimed / 1024:.1f} KiB: "
+            f"{self.rows_deleted} odds rows deleted, {self.rows_inserted} compacted rows "
+            f"inserted, {self.sweepstakes_archived} sweepstakes archived "
+            f"({self.archive_bytes} bytes)"
+        )
@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+
+from sweepy.models.enums import AssignmentMethod
+
+
+class DistributionSummary(BaseModel):
+    """
+    Summary of a fairness metric over every simulated run.
+    """
+
+    mean: float
+    p5: float
+    median: float
+    p95: float
+    worst: float
+
+
+class MethodFairness(BaseModel):
+    """
+    How evenly an assignment method spreads equity over many simulated sweepstakes.
+
+    Equity is a participant's share of the market's total implied probability, so a
+    perfectly fair sweepstake gives everyone `1 / participants`.
+    """
+
+    method: AssignmentMethod
+    # Difference between the highest and lowest equity in a run
+    equity_spread: DistributionSummary
+    gini: DistributionSummary
+    # Largest distance of any participant's equity from an equal share in a run
+    worst_gap: DistributionSummary
+    # Share of simulated winners held by each participant, ranked by equity, highest first
+    win_shares: list[float]
+
+
+class FairnessSimulation(BaseModel):
+    """
+    Model for the fairness preview of each assignment method on a market.
+    """
+
+    market_id: str
+    participants: int
+    runs: int
+    # Each simulated sweepstake is the fairest of this many candidates, as when generating one
+    candidates: int = 1
+    seed: int
+    methods: list[MethodFairness]
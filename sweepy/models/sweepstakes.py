@@ -51,6 +51,25 @@ class SweepstakesBase(BaseModel):
 
 class Sweepstakes(SweepstakesBase):
     participants: list[Participant]
+    # Reproduces the assignments, for auditing
+    seed: int | None = None
+
+
+class SweepstakesSummary(SweepstakesBase):
+    """
+    Model for a sweepstake in a listing, without its participants.
+    """
+
+    participant_count: int
+
+
+class SweepstakesPage(BaseModel):
+    """
+    Model for a page of sweepstakes. Pass `next_cursor` back to fetch the next page.
+    """
+
+    items: list[SweepstakesSummary]
+    next_cursor: str | None = None
 
 
 class ProbabilitySnapshot(BaseModel):
@@ -69,3 +88,35 @@ class ParticipantOddsHistory(BaseModel):
 
 class SweepstakesHistory(SweepstakesBase):
     participants: list[ParticipantOddsHistory]
+    # The newest timestamp included, to pass back as `since` to fetch only newer points
+    next_since: datetime.datetime | None = None
+
+
+class RunnerOddsUpdate(BaseModel):
+    participant: str
+    provider_id: str
+    implied_probability: Decimal
+
+
+class RunnerScoreUpdate(BaseModel):
+    participant: str
+    provider_id: str
+    score: int | None
+
+
+class ParticipantEquityUpdate(BaseModel):
+    name: str
+    equity: Decimal
+
+
+class SweepstakesUpdate(BaseModel):
+    """
+    Model for a live update pushed to subscribers, with only what changed in one write.
+    """
+
+    id: str
+    updated_at: datetime.datetime
+    active: bool
+    odds: list[RunnerOddsUpdate] = []
+    scores: list[RunnerScoreUpdate] = []
+    equities: list[ParticipantEquityUpdate] = []
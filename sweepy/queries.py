@@ -0,0 +1,284 @@
+import base64
+import datetime
+from typing import Optional
+
+from sqlalchemy import ColumnElement, Float, Integer, cast, func, tuple_
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from sweepy import db_models
+from sweepy.downsampling import Point, bucket_window
+from sweepy.models import AssignmentMethod
+from sweepy.models.sweepstakes import SweepstakesSummary
+
+# Loads participants and their runners in one SELECT per level, so building a response
+# never falls back to lazy loading
+SWEEPSTAKE_GRAPH_OPTIONS = (
+    selectinload(db_models.Sweepstakes.participants).selectinload(
+        db_models.Participant.runners
+    ),
+)
+
+SWEEPSTAKE_PARTICIPANTS_OPTIONS = (selectinload(db_models.Sweepstakes.participants),)
+
+
+def get_sweepstake_graph(
+    session: Session, sweepstake_id: int
+) -> Optional[db_models.Sweepstakes]:
+    """
+    Get a sweepstake with its participants and runners loaded, in three queries.
+    """
+
+    statement = (
+        select(db_models.Sweepstakes)
+        .where(db_models.Sweepstakes.id == sweepstake_id)
+        .options(*SWEEPSTAKE_GRAPH_OPTIONS)
+    )
+    return session.exec(statement).first()
+
+
+def get_sweepstake_version(session: Session, sweepstake_id: int) -> Optional[str]:
+    """
+    Get a version string for a sweepstake that changes whenever it is written, or None if the
+    sweepstake does not exist.
+    """
+
+    updated_at = session.exec(
+        select(db_models.Sweepstakes.updated_at).where(
+            db_models.Sweepstakes.id == sweepstake_id
+        )
+    ).first()
+    if updated_at is None:
+        return None
+    return str(int(as_utc(updated_at).timestamp() * 1_000_000))
+
+
+def encode_cursor(updated_at: datetime.datetime, sweepstake_id: int) -> str:
+    """
+    Encodes the sort key of the last sweepstake on a page as an opaque cursor.
+    """
+
+    key = f"{updated_at.isoformat()}|{sweepstake_id}"
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime.datetime, int]:
+    """
+    Decodes a cursor from `encode_cursor`, raising ValueError if it is malformed.
+    """
+
+    try:
+        updated_at, sweepstake_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+        return datetime.datetime.fromisoformat(updated_at), int(sweepstake_id)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def list_sweepstake_summaries(
+    session: Session,
+    include_closed: bool = False,
+    competition: Optional[str] = None,
+    market_id: Optional[str] = None,
+    method: Optional[AssignmentMethod] = None,
+    cursor: Optional[str] = None,
+    limit: int = 25,
+) -> tuple[list[SweepstakesSummary], Optional[str]]:
+    """
+    Get a page of sweepstake summaries, most recently updated first, in a single query.
+
+    Pages are keyed on (updated_at, id) rather than an OFFSET, so every page is an index range
+    scan. Returns the page and the cursor for the next one, or None on the last page.
+    """
+
+    participant_count = (
+        select(func.count(db_models.Participant.id))
+        .where(db_models.Participant.sweepstake_id == db_models.Sweepstakes.id)
+        .scalar_subquery()
+    )
+    statement = select(db_models.Sweepstakes, participant_count)
+    if not include_closed:
+        statement = statement.where(db_models.Sweepstakes.active)
+    if competition is not None:
+        statement = statement.where(db_models.Sweepstakes.competition == competition)
+    if market_id is not None:
+        statement = statement.where(db_models.Sweepstakes.market_id == market_id)
+    if method is not None:
+        statement = statement.where(db_models.Sweepstakes.method == method.value)
+    if cursor is not None:
+        statement = statement.where(
+            tuple_(db_models.Sweepstakes.updated_at, db_models.Sweepstakes.id)
+            < tuple_(*decode_cursor(cursor))
+        )
+
+    statement = statement.order_by(
+        db_models.Sweepstakes.updated_at.desc(), db_models.Sweepstakes.id.desc()
+    ).limit(limit + 1)
+    rows = session.exec(statement).all()
+
+    summaries = [
+        SweepstakesSummary(
+            **sweepstake.model_dump(exclude={"id"}),
+            id=sweepstake.stringified_id,
+            participant_count=count,
+        )
+        for sweepstake, count in rows[:limit]
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last_sweepstake, _ = rows[limit - 1]
+        next_cursor = encode_cursor(last_sweepstake.updated_at, last_sweepstake.id)
+
+    return summaries, next_cursor
+
+
+def get_sweepstake_with_participants(
+    session: Session, sweepstake_id: int
+) -> Optional[db_models.Sweepstakes]:
+    """
+    Get a sweepstake with its participants loaded, in two queries.
+    """
+
+    statement = (
+        select(db_models.Sweepstakes)
+        .where(db_models.Sweepstakes.id == sweepstake_id)
+        .options(*SWEEPSTAKE_PARTICIPANTS_OPTIONS)
+    )
+    return session.exec(statement).first()
+
+
+def as_utc(value: datetime.datetime) -> datetime.datetime:
+    """
+    Converts a datetime to UTC, treating naive values as UTC as SQLite returns them.
+    """
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc)
+
+
+def _epoch_seconds(column, dialect_name: str) -> ColumnElement:
+    if dialect_name == "sqlite":
+        return cast(func.strftime("%s", column), Float)
+    return func.extract("epoch", column)
+
+
+def _participant_odds_filters(
+    sweepstake_id: int,
+    start: Optional[datetime.datetime],
+    end: Optional[datetime.datetime],
+    since: Optional[datetime.datetime],
+) -> list[ColumnElement]:
+    filters = [db_models.Participant.sweepstake_id == sweepstake_id]
+    if start is not None:
+        filters.append(db_models.ParticipantOdds.timestamp >= start)
+    if end is not None:
+        filters.append(db_models.ParticipantOdds.timestamp <= end)
+    if since is not None:
+        filters.append(db_models.ParticipantOdds.timestamp > since)
+    return filters
+
+
+def get_participant_odds_bounds(
+    session: Session,
+    sweepstake_id: int,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+    since: Optional[datetime.datetime] = None,
+) -> tuple[Optional[datetime.datetime], Optional[datetime.datetime]]:
+    """
+    Get the earliest and latest participant odds timestamps of a sweepstake within a window.
+    """
+
+    statement = (
+        select(
+            func.min(db_models.ParticipantOdds.timestamp),
+            func.max(db_models.ParticipantOdds.timestamp),
+        )
+        .join(db_models.Participant)
+        .where(*_participant_odds_filters(sweepstake_id, start, end, since))
+    )
+    return session.exec(statement).one()
+
+
+def get_participant_odds_history(
+    session: Session,
+    sweepstake_id: int,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+    since: Optional[datetime.datetime] = None,
+) -> dict[int, list[Point]]:
+    """
+    Get the odds history of every participant in a sweepstake within a window, keyed by
+    participant ID and sorted by timestamp. Only points after `since` are returned.
+    """
+
+    statement = (
+        select(
+            db_models.ParticipantOdds.participant_id,
+            db_models.ParticipantOdds.timestamp,
+            db_models.ParticipantOdds.implied_probability,
+        )
+        .join(db_models.Participant)
+        .where(*_participant_odds_filters(sweepstake_id, start, end, since))
+        .order_by(
+            db_models.ParticipantOdds.participant_id,
+            db_models.ParticipantOdds.timestamp,
+        )
+    )
+
+    history: dict[int, list[Point]] = {}
+    for participant_id, timestamp, probability in session.exec(statement):
+        history.setdefault(participant_id, []).append((timestamp, probability))
+    return history
+
+
+def get_bucketed_participant_odds_history(
+    session: Session,
+    sweepstake_id: int,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    buckets: int,
+    since: Optional[datetime.datetime] = None,
+) -> dict[int, list[Point]]:
+    """
+    Get the odds history of every participant in a sweepstake averaged into `buckets` equal
+    time buckets between `start` and `end`, keyed by participant ID.
+
+    The averaging happens in the database. Each point is stamped with the start of its bucket,
+    so every participant's points line up on the same timestamps.
+    """
+
+    start, bucket_seconds = bucket_window(as_utc(start), as_utc(end), buckets)
+
+    dialect_name = session.get_bind().dialect.name
+    offset = (
+        _epoch_seconds(db_models.ParticipantOdds.timestamp, dialect_name)
+        - start.timestamp()
+    ) / bucket_seconds
+    # Offsets are never negative, so truncating is flooring
+    bucket = (
+        cast(offset, Integer) if dialect_name == "sqlite" else func.floor(offset)
+    ).label("bucket")
+
+    statement = (
+        select(
+            db_models.ParticipantOdds.participant_id,
+            bucket,
+            func.avg(db_models.ParticipantOdds.implied_probability),
+        )
+        .join(db_models.Participant)
+        .where(*_participant_odds_filters(sweepstake_id, start, end, since))
+        .group_by(db_models.ParticipantOdds.participant_id, bucket)
+        .order_by(db_models.ParticipantOdds.participant_id, bucket)
+    )
+
+    history: dict[int, list[Point]] = {}
+    for participant_id, bucket_index, probability in session.exec(statement):
+        timestamp = start + datetime.timedelta(
+            seconds=int(bucket_index) * bucket_seconds
+        )
+        history.setdefault(participant_id, []).append((timestamp, probability))
+    return history
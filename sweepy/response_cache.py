@@ -0,0 +1,135 @@
+from collections import OrderedDict
+import logging
+import threading
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class ResponseCache:
+    """
+    Cache of serialized JSON responses, keyed by sweepstake ID and version.
+
+    Entries are kept in process in LRU order. If a Redis client is connected, entries are also
+    written to Redis so every worker process shares them, and a Redis outage falls back to the
+    in-process entries. A lookup only hits when the cached version matches the requested one,
+    so a stale entry can never be served even if an invalidation is missed.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        redis_client=None,
+        ttl_seconds: int = 86400,
+        prefix: str = "sweepy:response:",
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0")
+
+        self.max_entries = max_entries
+        self.redis_client = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, tuple[str, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def connect_redis(self, url: str) -> None:
+        """
+        Back the cache with the Redis server at `url`. Requires the `redis` extra.
+        """
+
+        if redis is None:
+            raise ImportError("Install the redis extra to use REDIS_URL")
+        self.redis_client = redis.Redis.from_url(url)
+
+    def get(self, key: int, version: str) -> bytes | None:
+        """
+        Returns the cached body for `key` at `version`, or None.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        if self.redis_client is not None:
+            try:
+                cached_version, body = self.redis_client.hmget(
+                    self._redis_key(key), "version", "body"
+                )
+            except Exception as e:
+                logging.warning(f"Failed to read response cache from Redis: {e}")
+            else:
+                if cached_version is not None and cached_version.decode() == version:
+                    with self._lock:
+                        self._store_in_memory(key, version, body)
+                        self.hits += 1
+                    return body
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: int, version: str, body: bytes) -> None:
+        """
+        Caches the body for `key` at `version`, replacing any other version.
+        """
+
+        with self._lock:
+            self._store_in_memory(key, version, body)
+
+        if self.redis_client is not None:
+            try:
+                redis_key = self._redis_key(key)
+                pipeline = self.redis_client.pipeline()
+                pipeline.hset(redis_key, mapping={"version": version, "body": body})
+                pipeline.expire(redis_key, self.ttl_seconds)
+                pipeline.execute()
+            except Exception as e:
+                logging.warning(f"Failed to write response cache to Redis: {e}")
+
+    def invalidate(self, key: int) -> None:
+        """
+        Drops every cached version for `key`, e.g. after the sweepstake has been written.
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+        if self.redis_client is not None:
+            try:
+                self.redis_client.delete(self._redis_key(key))
+            except Exception as e:
+                logging.warning(f"Failed to invalidate response cache in Redis: {e}")
+
+    def clear(self) -> None:
+        """
+        Drops every in-process entry and resets the counters.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _redis_key(self, key: int) -> str:
+        return f"{self.prefix}{key}"
+
+    def _store_in_memory(self, key: int, version: str, body: bytes) -> None:
+        self._entries[key] = (version, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Serialized GET /api/sweepstakes/{id} responses
+sweepstake_responses = ResponseCache()
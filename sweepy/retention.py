@@ -0,0 +1,333 @@
+"""
+Retention for the odds history tables.
+
+Odds are written every refresh for every runner and participant, so history older than the
+policy's tiers is compacted into coarser buckets, and closed sweepstakes can be archived into
+a single compressed columnar blob per sweepstake.
+"""
+
+import argparse
+import datetime
+import io
+import logging
+from itertools import groupby
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import delete, select
+from sqlmodel import Session
+
+from sweepy import db_models
+from sweepy.downsampling import Point
+from sweepy.generate_sweepstakes import insert_odds_history
+from sweepy.models import CompactionTier, RetentionPolicy, RetentionReport
+from sweepy.queries import as_utc
+
+# Rough on-disk cost of one odds history row in Postgres, including the tuple header and its
+# index entries. Only used to estimate the space a run reclaims.
+ESTIMATED_ROW_BYTES = 100
+
+# Deleting in chunks keeps the IN lists within every database's parameter limits
+DELETE_CHUNK_SIZE = 500
+
+# The odds history tables, with the column that links each row to its owner
+ODDS_HISTORY_TABLES = [
+    (db_models.RunnerOdds, "runner_id", db_models.Runner),
+    (db_models.ParticipantOdds, "participant_id", db_models.Participant),
+]
+
+
+def _bucket_start(timestamp: datetime.datetime, resolution_seconds: int) -> float:
+    epoch = as_utc(timestamp).timestamp()
+    return epoch - epoch % resolution_seconds
+
+
+def compaction_cutoff(
+    tier: CompactionTier, now: datetime.datetime
+) -> datetime.datetime:
+    """
+    Returns the time before which a tier compacts history, aligned to the tier's resolution
+    so no bucket straddles it.
+    """
+
+    cutoff = _bucket_start(
+        now - datetime.timedelta(seconds=tier.older_than_seconds),
+        tier.resolution_seconds,
+    )
+    return datetime.datetime.fromtimestamp(cutoff, datetime.timezone.utc)
+
+
+def plan_compaction(
+    session: Session,
+    model: type[db_models.RunnerOdds] | type[db_models.ParticipantOdds],
+    owner_column: str,
+    tier: CompactionTier,
+    now: datetime.datetime,
+    not_before: Optional[datetime.datetime] = None,
+) -> tuple[list[int], list[dict]]:
+    """
+    Work out how to compact one odds history table for one tier.
+
+    Returns the IDs of the rows to delete and the rows to insert in their place: one per owner
+    per bucket, averaging the bucket and stamped with its start. Only buckets that end before
+    the tier's cutoff, and start from `not_before` if given, are touched. Buckets already down
+    to one row are left alone, so running the same tier twice is a no-op.
+    """
+
+    owner = getattr(model, owner_column)
+    statement = (
+        select(model.id, owner, model.timestamp, model.implied_probability)
+        .where(model.timestamp < compaction_cutoff(tier, now))
+        .order_by(owner, model.timestamp)
+    )
+    if not_before is not None:
+        statement = statement.where(model.timestamp >= not_before)
+    rows = session.execute(statement.execution_options(yield_per=1000))
+
+    ids_to_delete = []
+    rows_to_insert = []
+    for (owner_id, bucket), bucket_rows in groupby(
+        rows,
+        key=lambda row: (row[1], _bucket_start(row[2], tier.resolution_seconds)),
+    ):
+        bucket_rows = list(bucket_rows)
+        if len(bucket_rows) < 2:
+            continue
+
+        ids_to_delete.extend(row[0] for row in bucket_rows)
+        rows_to_insert.append(
+            {
+                owner_column: owner_id,
+                "implied_probability": sum(row[3] for row in bucket_rows)
+                / len(bucket_rows),
+                "timestamp": datetime.datetime.fromtimestamp(
+                    bucket, datetime.timezone.utc
+                ),
+            }
+        )
+
+    return ids_to_delete, rows_to_insert
+
+
+def build_archive(session: Session, sweepstake_id: int) -> tuple[bytes, int]:
+    """
+    Pack a sweepstake's runner and participant odds history into a compressed columnar blob
+    of parallel NumPy arrays. Returns the blob and the number of history rows it holds.
+    """
+
+    arrays = {}
+    row_count = 0
+    for model, owner_column, owner_model in ODDS_HISTORY_TABLES:
+        statement = (
+            select(
+                getattr(model, owner_column),
+                model.timestamp,
+                model.implied_probability,
+            )
+            .join(owner_model)
+            .where(_owned_by_sweepstake(owner_model, sweepstake_id))
+            .order_by(getattr(model, owner_column), model.timestamp)
+        )
+        rows = session.execute(statement).all()
+        row_count += len(rows)
+
+        table = model.__tablename__
+        arrays[f"{table}_owner_id"] = np.array([row[0] for row in rows], dtype=np.int64)
+        arrays[f"{table}_timestamp"] = np.array(
+            [as_utc(row[1]).timestamp() for row in rows], dtype=np.float64
+        )
+        arrays[f"{table}_probability"] = np.array(
+            [row[2] for row in rows], dtype=np.float64
+        )
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue(), row_count
+
+
+def load_archive(data: bytes) -> dict[str, np.ndarray]:
+    """
+    Unpack a blob from `build_archive` into its arrays, keyed `<table>_owner_id`,
+    `<table>_timestamp` and `<table>_probability`.
+    """
+
+    with np.load(io.BytesIO(data)) as archive:
+        return {name: archive[name] for name in archive.files}
+
+
+def get_archived_participant_odds_history(
+    data: bytes,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+    since: Optional[datetime.datetime] = None,
+) -> dict[int, list[Point]]:
+    """
+    Read participant odds history from an archive, with the same window and `since` filters
+    as `queries.get_participant_odds_history`.
+    """
+
+    arrays = load_archive(data)
+    owner_ids = arrays["participantodds_owner_id"]
+    timestamps = arrays["participantodds_timestamp"]
+    probabilities = arrays["participantodds_probability"]
+
+    mask = np.ones(len(timestamps), dtype=bool)
+    if start is not None:
+        mask &= timestamps >= as_utc(start).timestamp()
+    if end is not None:
+        mask &= timestamps <= as_utc(end).timestamp()
+    if since is not None:
+        mask &= timestamps > as_utc(since).timestamp()
+
+    history: dict[int, list[Point]] = {}
+    for owner_id, timestamp, probability in zip(
+        owner_ids[mask].tolist(),
+        timestamps[mask].tolist(),
+        probabilities[mask].tolist(),
+    ):
+        history.setdefault(owner_id, []).append(
+            (
+                datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc),
+                probability,
+            )
+        )
+    return history
+
+
+def _owned_by_sweepstake(owner_model, sweepstake_id: int):
+    if owner_model is db_models.Participant:
+        return db_models.Participant.sweepstake_id == sweepstake_id
+    return db_models.Runner.participant_id.in_(
+        select(db_models.Participant.id).where(
+            db_models.Participant.sweepstake_id == sweepstake_id
+        )
+    )
+
+
+def get_archivable_sweepstake_ids(
+    session: Session, policy: RetentionPolicy, now: datetime.datetime
+) -> list[int]:
+    """
+    Get closed sweepstakes that have not been updated within the policy's archive age and
+    have not been archived yet.
+    """
+
+    if policy.archive_closed_after_seconds is None:
+        return []
+
+    cutoff = now - datetime.timedelta(seconds=policy.archive_closed_after_seconds)
+    statement = select(db_models.Sweepstakes.id).where(
+        db_models.Sweepstakes.active.is_(False),
+        db_models.Sweepstakes.updated_at < cutoff,
+        db_models.Sweepstakes.id.not_in(select(db_models.OddsArchive.sweepstake_id)),
+    )
+    return list(session.execute(statement).scalars())
+
+
+def apply_retention(
+    session: Session,
+    policy: RetentionPolicy,
+    now: Optional[datetime.datetime] = None,
+    dry_run: bool = False,
+) -> RetentionReport:
+    """
+    Archive closed sweepstakes and compact the remaining odds history according to `policy`.
+
+    With `dry_run` nothing is written, and the report describes what a real run would do,
+    except that history due to be archived is also counted by compaction. Archiving happens
+    first so archived history is not compacted needlessly.
+    """
+
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    report = RetentionReport(started_at=now, dry_run=dry_run)
+
+    for sweepstake_id in get_archivable_sweepstake_ids(session, policy, now):
+        data, row_count = build_archive(session, sweepstake_id)
+        report.sweepstakes_archived += 1
+        report.archive_bytes += len(data)
+        report.rows_deleted += row_count
+        if dry_run:
+            continue
+
+        session.add(db_models.OddsArchive(sweepstake_id=sweepstake_id, data=data))
+        for model, owner_column, owner_model in ODDS_HISTORY_TABLES:
+            session.execute(
+                delete(model).where(
+                    getattr(model, owner_column).in_(
+                        select(owner_model.id).where(
+                            _owned_by_sweepstake(owner_model, sweepstake_id)
+                        )
+                    )
+                )
+            )
+        session.commit()
+        logging.info(f"Archived odds history of sweepstake {sweepstake_id}")
+
+    # Coarsest tier first. Each finer tier then only covers the history newer than the
+    # previous tier's cutoff, so every row is compacted once and a dry run sees what a real
+    # run would.
+    tiers = sorted(policy.tiers, key=lambda tier: tier.older_than_seconds, reverse=True)
+    not_before = None
+    for tier in tiers:
+        runner_odds = []
+        participant_odds = []
+        for model, owner_column, _ in ODDS_HISTORY_TABLES:
+            ids_to_delete, rows_to_insert = plan_compaction(
+                session, model, owner_column, tier, now, not_before
+            )
+            report.rows_deleted += len(ids_to_delete)
+            report.rows_inserted += len(rows_to_insert)
+            if dry_run:
+                continue
+
+            for i in range(0, len(ids_to_delete), DELETE_CHUNK_SIZE):
+                session.execute(
+                    delete(model).where(
+                        model.id.in_(ids_to_delete[i : i + DELETE_CHUNK_SIZE])
+                    )
+                )
+            if model is db_models.RunnerOdds:
+                runner_odds = rows_to_insert
+            else:
+                participant_odds = rows_to_insert
+
+        if not dry_run:
+            insert_odds_history(session, runner_odds, participant_odds)
+            session.commit()
+        not_before = compaction_cutoff(tier, now)
+
+    report.estimated_bytes_reclaimed = max(
+        (report.rows_deleted - report.rows_inserted) * ESTIMATED_ROW_BYTES
+        - report.archive_bytes,
+        0,
+    )
+    logging.info(f"Odds history retention: {report}")
+    return report
+
+
+if __name__ == "__main__":
+    from sweepy.database import get_session_context
+
+    parser = argparse.ArgumentParser(description="Compact and archive odds history.")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would be reclaimed without writing anything.",
+    )
+    parser.add_argument(
+        "--archive-closed-after-days",
+        type=float,
+        default=None,
+        help="Archive closed sweepstakes not updated for this many days.",
+    )
+    args = parser.parse_args()
+
+    policy = RetentionPolicy(
+        archive_closed_after_seconds=(
+            int(args.archive_closed_after_days * 86400)
+            if args.archive_closed_after_days is not None
+            else None
+        )
+    )
+    with get_session_context() as session:
+        print(apply_retention(session, policy, dry_run=args.dry_run))
@@ -0,0 +1,241 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+import datetime
+import heapq
+import logging
+import time
+
+from sweepy.models import (
+    MarketNotFoundException,
+    NotEnoughLiquidityException,
+    RefreshReport,
+    RefreshResult,
+)
+
+# Retrying these cannot succeed within the same cycle
+NON_RETRYABLE_EXCEPTIONS = (MarketNotFoundException, NotEnoughLiquidityException)
+
+
+async def retry_with_backoff(
+    func: Callable[[], Awaitable[None]],
+    max_retries: int,
+    backoff_seconds: float,
+) -> int:
+    """
+    Await `func`, retrying with exponential backoff if it raises.
+
+    Returns the number of attempts made. The last exception is re-raised once retries are
+    exhausted, and exceptions in NON_RETRYABLE_EXCEPTIONS are re-raised immediately.
+    """
+
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            await func()
+            return attempts
+        except NON_RETRYABLE_EXCEPTIONS:
+            raise
+        except Exception as e:
+            if attempts > max_retries:
+                raise
+
+            delay = backoff_seconds * 2 ** (attempts - 1)
+            logging.warning(
+                f"Attempt {attempts} failed with {e!r}, retrying in {delay:.1f}s."
+            )
+            await asyncio.sleep(delay)
+
+
+async def refresh_each(
+    sweepstake_ids: Iterable[int],
+    refresh: Callable[[int], Awaitable[None]],
+    max_concurrency: int,
+    max_retries: int = 0,
+    backoff_seconds: float = 1.0,
+) -> RefreshReport:
+    """
+    Refresh every sweepstake concurrently, at most `max_concurrency` at a time.
+
+    Each sweepstake is retried independently and a failure never affects the others; it
+    is recorded in the returned report along with every sweepstake's duration.
+    """
+
+    started_at = datetime.datetime.now(datetime.timezone.utc)
+    cycle_started = time.perf_counter()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(sweepstake_id: int) -> RefreshResult:
+        attempts = 0
+
+        async def attempt() -> None:
+            nonlocal attempts
+            attempts += 1
+            # Only hold a slot while working, not while backing off
+            async with semaphore:
+                await refresh(sweepstake_id)
+
+        started = time.perf_counter()
+        error = None
+        try:
+            await retry_with_backoff(attempt, max_retries, backoff_seconds)
+        except Exception as e:
+            logging.exception(f"Failed to refresh sweepstake {sweepstake_id}: {e}")
+            error = repr(e)
+
+        return RefreshResult(
+            sweepstake_id=sweepstake_id,
+            duration_seconds=time.perf_counter() - started,
+            attempts=attempts,
+            error=error,
+        )
+
+    results = await asyncio.gather(
+        *(run(sweepstake_id) for sweepstake_id in sweepstake_ids)
+    )
+
+    return RefreshReport(
+        started_at=started_at,
+        duration_seconds=time.perf_counter() - cycle_started,
+        results=results,
+    )
+
+
+# A mean per-runner probability range of this size over the volatility window doubles
+# the refresh rate
+VOLATILITY_REFERENCE = 0.005
+
+
+def compute_odds_refresh_interval(
+    start_date: datetime.datetime | None,
+    now: datetime.datetime,
+    volatility: float,
+    base_interval: float,
+    min_interval: float,
+    max_interval: float,
+    live_seconds: float,
+) -> float:
+    """
+    Seconds until a sweepstake's odds should next be refreshed.
+
+    Markets are polled every `min_interval` while the event is live, i.e. for `live_seconds`
+    after its start, and every `max_interval` once it is over. Before the start the interval
+    grows by `base_interval` per day until the start, and shrinks with recent volatility, so
+    quiet markets weeks away are polled rarely. The result is clamped to
+    [min_interval, max_interval].
+    """
+
+    if start_date is None:
+        interval = base_interval
+    else:
+        if start_date.tzinfo is None:
+            start_date = start_date.replace(tzinfo=datetime.timezone.utc)
+
+        seconds_to_start = (start_date - now).total_seconds()
+        if seconds_to_start <= -live_seconds:
+            return max_interval
+        if seconds_to_start <= 0:
+            interval = min_interval
+        else:
+            interval = base_interval * (1 + seconds_to_start / 86400)
+
+    interval /= 1 + volatility / VOLATILITY_REFERENCE
+    return min(max(interval, min_interval), max_interval)
+
+
+def compute_scores_refresh_interval(
+    start_date: datetime.datetime | None,
+    now: datetime.datetime,
+    base_interval: float,
+    max_interval: float,
+    live_seconds: float,
+) -> float:
+    """
+    Seconds until a sweepstake's scores should next be refreshed.
+
+    There are no scores to fetch before the event starts, so wait until the start (at most
+    `max_interval`), then refresh every `base_interval` for `live_seconds`, and every
+    `max_interval` once the event is over.
+    """
+
+    if start_date is None:
+        return base_interval
+
+    if start_date.tzinfo is None:
+        start_date = start_date.replace(tzinfo=datetime.timezone.utc)
+
+    seconds_to_start = (start_date - now).total_seconds()
+    if seconds_to_start <= -live_seconds:
+        return max_interval
+    if seconds_to_start <= 0:
+        return base_interval
+    return min(seconds_to_start, max_interval)
+
+
+def compute_failure_backoff(
+    consecutive_failures: int, base_interval: float, max_interval: float
+) -> float:
+    """
+    Seconds until a sweepstake whose refresh keeps failing is tried again, doubling from
+    `base_interval` with each consecutive failure up to `max_interval`.
+    """
+
+    return min(base_interval * 2 ** (consecutive_failures - 1), max_interval)
+
+
+class RefreshQueue:
+    """
+    Priority queue of sweepstakes keyed by when they are next due for a refresh.
+
+    Rescheduling or removing a sweepstake leaves its old heap entry behind; stale entries
+    are skipped when popped.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int]] = []
+        self._due_at: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._due_at)
+
+    def __contains__(self, sweepstake_id: int) -> bool:
+        return sweepstake_id in self._due_at
+
+    def schedule(self, sweepstake_id: int, due_at: float) -> None:
+        self._due_at[sweepstake_id] = due_at
+        heapq.heappush(self._heap, (due_at, sweepstake_id))
+
+    def remove(self, sweepstake_id: int) -> None:
+        self._due_at.pop(sweepstake_id, None)
+
+    def sync(self, sweepstake_ids: Iterable[int], now: float) -> None:
+        """
+        Make the queue track exactly `sweepstake_ids`. New sweepstakes are due immediately.
+        """
+
+        sweepstake_ids = set(sweepstake_ids)
+        for sweepstake_id in list(self._due_at):
+            if sweepstake_id not in sweepstake_ids:
+                self.remove(sweepstake_id)
+        for sweepstake_id in sweepstake_ids - self._due_at.keys():
+            self.schedule(sweepstake_id, now)
+
+    def next_due_at(self) -> float | None:
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: float) -> list[int]:
+        """
+        Remove and return every sweepstake due at or before `now`.
+        """
+
+        due = []
+        while (due_at := self.next_due_at()) is not None and due_at <= now:
+            _, sweepstake_id = heapq.heappop(self._heap)
+            del self._due_at[sweepstake_id]
+            due.append(sweepstake_id)
+        return due
+
+    def _discard_stale(self) -> None:
+        while self._heap and self._due_at.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
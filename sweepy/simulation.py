@@ -0,0 +1,205 @@
+"""
+Monte Carlo simulation of how fairly each assignment method spreads equity.
+
+Each run generates a sweepstake as `generate_sweepstakes` would, through
+`assign_selections_best_of` with a shuffled participant order and the same number of
+candidates, and the resulting assignments are scored with NumPy. Only the scoring is
+vectorised: the assigners run in Python, one sweepstake at a time, so large simulations
+rely on spreading chunks across processes. Runs are split into chunks with their own seeds,
+so a given seed gives the same result however many processes are used.
+"""
+
+from concurrent.futures import Executor
+import random
+
+import numpy as np
+
+from sweepy.assignment import SEED_BITS, assign_selections_best_of
+from sweepy.models import (
+    AssignmentMethod,
+    DistributionSummary,
+    MethodFairness,
+    RunnerOdds,
+)
+
+RUNS_PER_CHUNK = 250
+
+
+def simulate_assignments(
+    method: AssignmentMethod,
+    selections: list[RunnerOdds],
+    num_participants: int,
+    runs: int,
+    seed: int,
+    candidates: int = 1,
+) -> np.ndarray:
+    """
+    Generate `runs` sweepstakes with an assignment method, keeping the fairest of
+    `candidates` for each, and return the index of the participant each selection went to,
+    as an array of shape (runs, selections) with the selections in their original order.
+    """
+
+    participants = [f"Participant {p}" for p in range(num_participants)]
+    participant_index = {participant: p for p, participant in enumerate(participants)}
+    selection_index = {
+        selection.provider_id: i for i, selection in enumerate(selections)
+    }
+
+    # Every assigner sorts the selections by odds first, which is far cheaper on a list that
+    # is already sorted
+    selections = sorted(
+        selections, key=lambda selection: selection.implied_probability, reverse=True
+    )
+    owners = np.empty((runs, len(selections)), dtype=np.int32)
+    rng = random.Random(seed)
+    for run in range(runs):
+        assignments, _ = assign_selections_best_of(
+            method,
+            participants,
+            selections,
+            candidates=candidates,
+            seed=rng.getrandbits(SEED_BITS),
+        )
+        for participant, assigned in assignments.items():
+            for selection in assigned:
+                owners[run, selection_index[selection.provider_id]] = participant_index[
+                    participant
+                ]
+    return owners
+
+
+def equity_shares(
+    owners: np.ndarray, probabilities: np.ndarray, num_participants: int
+) -> np.ndarray:
+    """
+    Each participant's share of the total probability in every run, shape
+    (runs, participants).
+    """
+
+    runs = owners.shape[0]
+    flat_owners = owners + np.arange(runs)[:, None] * num_participants
+    equities = np.bincount(
+        flat_owners.ravel(),
+        weights=np.tile(probabilities / probabilities.sum(), runs),
+        minlength=runs * num_participants,
+    )
+    return equities.reshape(runs, num_participants)
+
+
+def gini(equities: np.ndarray) -> np.ndarray:
+    """
+    Gini coefficient of each row of equities, 0 when everyone has the same.
+    """
+
+    n = equities.shape[1]
+    ordered = np.sort(equities, axis=1)
+    ranks = np.arange(1, n + 1)
+    totals = ordered.sum(axis=1)
+    return 2 * (ordered * ranks).sum(axis=1) / (n * totals) - (n + 1) / n
+
+
+def win_shares(
+    owners: np.ndarray,
+    equities: np.ndarray,
+    probabilities: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Simulate one winner per run from the implied probabilities and return the share of runs
+    won by the participant with the highest equity, the second highest and so on.
+    """
+
+    runs, num_participants = equities.shape
+    winners = rng.choice(
+        len(probabilities), size=runs, p=probabilities / probabilities.sum()
+    )
+    winning_owners = owners[np.arange(runs), winners]
+
+    ranks = np.empty((runs, num_participants), dtype=np.intp)
+    order = np.argsort(-equities, axis=1, kind="stable")
+    ranks[np.arange(runs)[:, None], order] = np.arange(num_participants)
+    winning_ranks = ranks[np.arange(runs), winning_owners]
+    return np.bincount(winning_ranks, minlength=num_participants) / runs
+
+
+def summarise(values: np.ndarray) -> DistributionSummary:
+    p5, median, p95 = np.percentile(values, [5, 50, 95])
+    return DistributionSummary(
+        mean=float(values.mean()),
+        p5=float(p5),
+        median=float(median),
+        p95=float(p95),
+        worst=float(values.max()),
+    )
+
+
+def simulate_fairness(
+    selections: list[RunnerOdds],
+    num_participants: int,
+    methods: list[AssignmentMethod],
+    runs: int,
+    seed: int,
+    executor: Executor | None = None,
+    candidates: int = 1,
+) -> list[MethodFairness]:
+    """
+    Simulate `runs` sweepstakes with each method, each the fairest of `candidates`, and
+    summarise how fairly equity is spread.
+
+    Chunks of runs are submitted to `executor` if given, e.g. a ProcessPoolExecutor, and run
+    in this process otherwise.
+    """
+
+    if num_participants < 2:
+        raise ValueError("At least 2 participants are needed")
+
+    probabilities = np.array(
+        [float(selection.implied_probability) for selection in selections]
+    )
+    if len(selections) < num_participants or probabilities.sum() <= 0:
+        raise ValueError("Not enough priced selections for the number of participants")
+
+    chunk_sizes = [
+        min(RUNS_PER_CHUNK, runs - start) for start in range(0, runs, RUNS_PER_CHUNK)
+    ]
+    method_seeds = np.random.SeedSequence(seed).spawn(len(methods))
+
+    # Submit every chunk of every method up front, so all the workers are kept busy
+    pending = []
+    for method, method_seed in zip(methods, method_seeds):
+        chunks = []
+        for size, chunk_seed in zip(chunk_sizes, method_seed.spawn(len(chunk_sizes))):
+            args = (
+                method,
+                selections,
+                num_participants,
+                size,
+                int(chunk_seed.generate_state(1)[0]),
+                candidates,
+            )
+            if executor is None:
+                chunks.append(simulate_assignments(*args))
+            else:
+                chunks.append(executor.submit(simulate_assignments, *args))
+        pending.append(chunks)
+
+    results = []
+    for method, method_seed, chunks in zip(methods, method_seeds, pending):
+        owners = np.concatenate(
+            [chunk if executor is None else chunk.result() for chunk in chunks]
+        )
+        equities = equity_shares(owners, probabilities, num_participants)
+        results.append(
+            MethodFairness(
+                method=method,
+                equity_spread=summarise(equities.max(axis=1) - equities.min(axis=1)),
+                gini=summarise(gini(equities)),
+                worst_gap=summarise(
+                    np.abs(equities - 1 / num_participants).max(axis=1)
+                ),
+                win_shares=win_shares(
+                    owners, equities, probabilities, np.random.default_rng(method_seed)
+                ).tolist(),
+            )
+        )
+    return results
@@ -1,54 +1,497 @@
 import asyncio
-from collections.abc import Iterable
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Collection, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager
+import datetime
+from functools import partial
 import logging
 import os
+import time
+from typing import TypeVar
 import dotenv
-from sqlalchemy import select, and_
-from sweepy import db_models, generate_sweepstakes, database
+from sqlalchemy import func, select, and_
+from sqlmodel import Session
+from sweepy import (
+    db_models,
+    generate_sweepstakes,
+    database,
+    queries,
+    retention,
+    scheduler,
+)
 from sweepy.integrations import betfair
+from sweepy.integrations.betfair.session import (
+    TOKEN_REFRESH_MARGIN_SECONDS,
+    TOKEN_TTL_SECONDS,
+)
 from sweepy.integrations.live_golf.client import LiveGolfClient
+from sweepy.market_odds import MarketOdds
+from sweepy.metrics import event_loop_lag, refresh_reports, retention_reports
+from sweepy.models import (
+    CompactionTier,
+    MarketNotFoundException,
+    RefreshReport,
+    RetentionPolicy,
+)
+from sweepy.scheduler import retry_with_backoff
 
-REDIS_URL = os.getenv("REDIS_URL")
+T = TypeVar("T")
+SessionFactory = Callable[[], AbstractContextManager[Session]]
 
 dotenv.load_dotenv()
+REDIS_URL = os.getenv("REDIS_URL")
 MARKET_REFRESH_INTERVAL = int(os.getenv("MARKET_REFRESH_INTERVAL", 900))
 SCORE_REFRESH_INTERVAL = int(os.getenv("SCORE_REFRESH_INTERVAL", 3000))
+# Live markets are polled every MARKET_REFRESH_MIN_INTERVAL seconds, quiet markets far from
+# their start at most every MARKET_REFRESH_MAX_INTERVAL seconds
+MARKET_REFRESH_MIN_INTERVAL = int(os.getenv("MARKET_REFRESH_MIN_INTERVAL", 300))
+MARKET_REFRESH_MAX_INTERVAL = int(os.getenv("MARKET_REFRESH_MAX_INTERVAL", 21600))
+# Events count as live for this long after they start, long enough for a golf tournament,
+# and are then polled every MARKET_REFRESH_MAX_INTERVAL seconds
+MARKET_LIVE_WINDOW = int(os.getenv("MARKET_LIVE_WINDOW", 5 * 86400))
+VOLATILITY_WINDOW = int(os.getenv("VOLATILITY_WINDOW", 21600))
+SCHEDULER_POLL_INTERVAL = int(os.getenv("SCHEDULER_POLL_INTERVAL", 60))
+ODDS_CHANGE_TOLERANCE = float(os.getenv("ODDS_CHANGE_TOLERANCE", 0.0))
+REFRESH_WORKERS = int(os.getenv("REFRESH_WORKERS", 4))
+REFRESH_CONCURRENCY = int(os.getenv("REFRESH_CONCURRENCY", REFRESH_WORKERS))
+REFRESH_MAX_RETRIES = int(os.getenv("REFRESH_MAX_RETRIES", 2))
+REFRESH_BACKOFF_SECONDS = float(os.getenv("REFRESH_BACKOFF_SECONDS", 1.0))
+# Odds history is compacted to hourly rows after RETENTION_HOURLY_AFTER seconds and daily rows
+# after RETENTION_DAILY_AFTER seconds. Closed sweepstakes are archived after
+# RETENTION_ARCHIVE_CLOSED_AFTER seconds if it is set.
+RETENTION_INTERVAL = int(os.getenv("RETENTION_INTERVAL", 86400))
+RETENTION_HOURLY_AFTER = int(os.getenv("RETENTION_HOURLY_AFTER", 86400))
+RETENTION_DAILY_AFTER = int(os.getenv("RETENTION_DAILY_AFTER", 604800))
+RETENTION_ARCHIVE_CLOSED_AFTER = os.getenv("RETENTION_ARCHIVE_CLOSED_AFTER")
+RETENTION_DRY_RUN = os.getenv("RETENTION_DRY_RUN", "false").lower() == "true"
+# Betfair session tokens are renewed this often, before they reach their refresh window
+BETFAIR_KEEP_ALIVE_INTERVAL = int(
+    os.getenv(
+        "BETFAIR_KEEP_ALIVE_INTERVAL",
+        TOKEN_TTL_SECONDS - TOKEN_REFRESH_MARGIN_SECONDS,
+    )
+)
+
+# Blocking database and HTTP work in the refresh tasks runs here, off the event loop
+REFRESH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=REFRESH_WORKERS, thread_name_prefix="sweepy-refresh"
+)
+
+
+def group_sweepstakes_by_market(
+    sweepstakes: Iterable[db_models.Sweepstakes],
+) -> dict[str, list[db_models.Sweepstakes]]:
+    """
+    Group sweepstakes by the market they follow.
+    """
+
+    sweepstakes_by_market = defaultdict(list)
+    for sweepstake in sweepstakes:
+        sweepstakes_by_market[sweepstake.market_id].append(sweepstake)
+    return dict(sweepstakes_by_market)
+
+
+def get_active_sweepstake_ids_by_market(
+    session_factory: SessionFactory,
+    sweepstake_ids: Collection[int] | None = None,
+) -> dict[str, list[int]]:
+    """
+    Load the IDs of all active sweepstakes, grouped by market, optionally restricted to
+    `sweepstake_ids`.
+    """
+
+    with session_factory() as db_session:
+        statement = select(db_models.Sweepstakes).where(db_models.Sweepstakes.active)
+        if sweepstake_ids is not None:
+            statement = statement.where(db_models.Sweepstakes.id.in_(sweepstake_ids))
+        all_active_sweepstakes = db_session.exec(statement).scalars().all()
+        return {
+            market_id: [sweepstake.id for sweepstake in sweepstakes]
+            for market_id, sweepstakes in group_sweepstakes_by_market(
+                all_active_sweepstakes
+            ).items()
+        }
+
+
+def refresh_sweepstake_odds_by_id(
+    sweepstake_id: int,
+    snapshot: MarketOdds,
+    session_factory: SessionFactory,
+) -> None:
+    """
+    Refresh a single sweepstake's odds from a market snapshot in its own session.
+    """
+
+    with session_factory() as db_session:
+        sweepstake = queries.get_sweepstake_graph(db_session, sweepstake_id)
+        logging.info(f"Refreshing sweepstake: {sweepstake.stringified_id}")
+        generate_sweepstakes.refresh_sweepstake_odds(
+            client=None,
+            sweepstake_db=sweepstake,
+            session=db_session,
+            tolerance=ODDS_CHANGE_TOLERANCE,
+            snapshot=snapshot,
+        )
+
+
+async def run_blocking(func: Callable[..., T], *args) -> T:
+    """
+    Run a blocking function in the refresh worker pool without blocking the event loop.
+    """
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(REFRESH_EXECUTOR, partial(func, *args))
+
+
+async def refresh_all_odds(
+    bf_client: betfair.AsyncBetfairClient,
+    session_factory: SessionFactory = database.get_session_context,
+    max_concurrency: int = REFRESH_CONCURRENCY,
+    max_retries: int = REFRESH_MAX_RETRIES,
+    backoff_seconds: float = REFRESH_BACKOFF_SECONDS,
+    sweepstake_ids: Collection[int] | None = None,
+) -> RefreshReport | None:
+    """
+    Refresh odds for all active sweepstakes, or only those in `sweepstake_ids`, fetching
+    each market once per cycle.
+
+    Market data is fetched with async I/O, and each sweepstake's database work runs in the
+    refresh worker pool with its own session, at most `max_concurrency` at a time. A
+    sweepstake that fails is retried on its own and does not stop the others.
+    """
+
+    sweepstake_ids_by_market = await run_blocking(
+        get_active_sweepstake_ids_by_market, session_factory, sweepstake_ids
+    )
+    if not sweepstake_ids_by_market:
+        logging.info("No active sweepstakes found.")
+        return None
+
+    snapshots = {}
+
+    async def fetch_snapshots() -> None:
+        snapshots.update(
+            await generate_sweepstakes.get_market_odds_batch_async(
+                bf_client, list(sweepstake_ids_by_market)
+            )
+        )
+
+    await retry_with_backoff(fetch_snapshots, max_retries, backoff_seconds)
+
+    market_id_by_sweepstake = {
+        sweepstake_id: market_id
+        for market_id, sweepstake_ids in sweepstake_ids_by_market.items()
+        for sweepstake_id in sweepstake_ids
+    }
+
+    async def refresh(sweepstake_id: int) -> None:
+        market_id = market_id_by_sweepstake[sweepstake_id]
+        if market_id not in snapshots:
+            raise MarketNotFoundException(
+                f"Market not found for market_id {market_id}."
+            )
+
+        await run_blocking(
+            refresh_sweepstake_odds_by_id,
+            sweepstake_id,
+            snapshots[market_id],
+            session_factory,
+        )
+
+    report = await scheduler.refresh_each(
+        market_id_by_sweepstake,
+        refresh,
+        max_concurrency,
+        max_retries,
+        backoff_seconds,
+    )
+
+    fetches_saved = len(market_id_by_sweepstake) - len(sweepstake_ids_by_market)
+    logging.info(
+        f"Odds refresh: {report}. Fetched {len(sweepstake_ids_by_market)} markets, "
+        f"saving {fetches_saved} market fetches."
+    )
+    return report
+
+
+def get_odds_volatility(
+    db_session: Session,
+    sweepstake_id: int,
+    since: datetime.datetime,
+) -> float:
+    """
+    Mean range of each runner's implied probability since `since`, over the runners whose
+    odds have been recorded in that window.
+    """
+
+    probability_range = func.max(db_models.RunnerOdds.implied_probability) - func.min(
+        db_models.RunnerOdds.implied_probability
+    )
+    statement = (
+        select(probability_range)
+        .join(db_models.Runner, db_models.RunnerOdds.runner_id == db_models.Runner.id)
+        .join(
+            db_models.Participant,
+            db_models.Runner.participant_id == db_models.Participant.id,
+        )
+        .where(
+            db_models.Participant.sweepstake_id == sweepstake_id,
+            db_models.RunnerOdds.timestamp >= since,
+        )
+        .group_by(db_models.RunnerOdds.runner_id)
+    )
+    ranges = db_session.exec(statement).scalars().all()
+    return sum(ranges) / len(ranges) if ranges else 0.0
+
+
+def get_odds_refresh_intervals(
+    sweepstake_ids: Collection[int],
+    session_factory: SessionFactory,
+    base_interval: float = MARKET_REFRESH_INTERVAL,
+) -> dict[int, float]:
+    """
+    Seconds until each sweepstake's odds should next be refreshed, based on its start date
+    and recent volatility, scaled from `base_interval`.
+    """
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    since = now - datetime.timedelta(seconds=VOLATILITY_WINDOW)
+    intervals = {}
+    with session_factory() as db_session:
+        for sweepstake_id in sweepstake_ids:
+            sweepstake = db_session.get(db_models.Sweepstakes, sweepstake_id)
+            intervals[sweepstake_id] = scheduler.compute_odds_refresh_interval(
+                start_date=sweepstake.start_date if sweepstake else None,
+                now=now,
+                volatility=get_odds_volatility(db_session, sweepstake_id, since),
+                base_interval=base_interval,
+                min_interval=MARKET_REFRESH_MIN_INTERVAL,
+                max_interval=MARKET_REFRESH_MAX_INTERVAL,
+                live_seconds=MARKET_LIVE_WINDOW,
+            )
+    return intervals
+
+
+async def run_refresh_loop(
+    name: str,
+    get_active_ids: Callable[[], Collection[int]],
+    refresh: Callable[[list[int]], Awaitable[RefreshReport | None]],
+    get_intervals: Callable[[list[int]], dict[int, float]],
+) -> None:
+    """
+    Refresh sweepstakes as they fall due, using a RefreshQueue ordered by next refresh time.
+
+    The active sweepstakes are re-read at least every SCHEDULER_POLL_INTERVAL seconds, so new
+    sweepstakes are picked up and closed ones dropped. After each refresh, `get_intervals`
+    decides when each refreshed sweepstake is next due. Sweepstakes whose refresh failed
+    wait at least that long, and longer with every consecutive failure: the backoff doubles
+    from SCHEDULER_POLL_INTERVAL up to MARKET_REFRESH_MAX_INTERVAL seconds.
+    """
+
+    queue = scheduler.RefreshQueue()
+    consecutive_failures: dict[int, int] = {}
+
+    def schedule_retry(sweepstake_id: int, interval: float = 0) -> None:
+        failures = consecutive_failures.get(sweepstake_id, 0) + 1
+        consecutive_failures[sweepstake_id] = failures
+        backoff = scheduler.compute_failure_backoff(
+            failures, SCHEDULER_POLL_INTERVAL, MARKET_REFRESH_MAX_INTERVAL
+        )
+        queue.schedule(sweepstake_id, time.time() + max(interval, backoff))
+
+    while True:
+        due = []
+        try:
+            active_ids = await run_blocking(get_active_ids)
+            queue.sync(active_ids, time.time())
+            for sweepstake_id in list(consecutive_failures):
+                if sweepstake_id not in queue:
+                    del consecutive_failures[sweepstake_id]
+
+            due = queue.pop_due(time.time())
+            if due:
+                logging.info(f"Starting {name} refresh for {len(due)} sweepstake(s).")
+                report = await refresh(due)
+                failed = set()
+                if report is not None:
+                    refresh_reports[name] = report
+                    failed = {
+                        result.sweepstake_id
+                        for result in report.results
+                        if result.error is not None
+                    }
+
+                intervals = await run_blocking(get_intervals, due)
+                for sweepstake_id in due:
+                    if sweepstake_id in failed:
+                        schedule_retry(sweepstake_id, intervals[sweepstake_id])
+                    else:
+                        consecutive_failures.pop(sweepstake_id, None)
+                        queue.schedule(
+                            sweepstake_id, time.time() + intervals[sweepstake_id]
+                        )
+        except Exception as e:
+            # Keep the task alive, and back off the sweepstakes this refresh was for
+            logging.exception(f"The {name} refresh failed: {e}")
+            for sweepstake_id in due:
+                if sweepstake_id not in queue:
+                    schedule_retry(sweepstake_id)
+
+        next_due_at = queue.next_due_at()
+        delay = SCHEDULER_POLL_INTERVAL
+        if next_due_at is not None:
+            delay = min(max(next_due_at - time.time(), 0), delay)
+
+        logging.info(f"Waiting for {delay:.0f} seconds before the next {name} refresh.")
+        await asyncio.sleep(delay)
 
 
 async def refresh_all_odds_task(
-    bf_client: betfair.BetfairClient,
+    bf_client: betfair.AsyncBetfairClient,
     delay_seconds: int = MARKET_REFRESH_INTERVAL,
 ):
     """
-    Task to refresh odds for all active sweepstakes.
+    Task to refresh odds for active sweepstakes as they fall due.
+
+    `delay_seconds` is the base refresh interval, before scaling by start date and
+    volatility. The task does nothing if it is not positive.
     """
 
     if delay_seconds <= 0:
         return
 
-    while True:
-        logging.info("Starting to refresh all sweepstakes.")
-        with database.get_session_context() as db_session:
-            statement = select(db_models.Sweepstakes).where(
-                db_models.Sweepstakes.active
+    async def refresh(sweepstake_ids: list[int]) -> RefreshReport | None:
+        event_loop_lag.reset_window()
+        report = await refresh_all_odds(bf_client, sweepstake_ids=sweepstake_ids)
+        logging.info(
+            "Max event loop lag during odds refresh: "
+            f"{event_loop_lag.reset_window() * 1000:.1f}ms."
+        )
+        return report
+
+    def get_active_ids() -> list[int]:
+        return [
+            sweepstake_id
+            for sweepstake_ids in get_active_sweepstake_ids_by_market(
+                database.get_session_context
+            ).values()
+            for sweepstake_id in sweepstake_ids
+        ]
+
+    await run_refresh_loop(
+        "odds",
+        get_active_ids,
+        refresh,
+        partial(
+            get_odds_refresh_intervals,
+            session_factory=database.get_session_context,
+            base_interval=delay_seconds,
+        ),
+    )
+
+
+def get_active_leaderboard_sweepstake_ids(
+    session_factory: SessionFactory,
+    sweepstake_ids: Collection[int] | None = None,
+) -> list[int]:
+    """
+    Load the IDs of all active sweepstakes with a linked tournament, optionally restricted
+    to `sweepstake_ids`.
+    """
+
+    with session_factory() as db_session:
+        statement = select(db_models.Sweepstakes.id).where(
+            and_(
+                db_models.Sweepstakes.active,
+                db_models.Sweepstakes.tournament_id.isnot(None),
             )
+        )
+        if sweepstake_ids is not None:
+            statement = statement.where(db_models.Sweepstakes.id.in_(sweepstake_ids))
+        return list(db_session.exec(statement).scalars().all())
 
-            all_active_sweepstakes = db_session.exec(statement).scalars().all()
-            if not all_active_sweepstakes:
-                logging.info("No active sweepstakes found.")
-            else:
-                for sweepstake in all_active_sweepstakes:
-                    logging.info(f"Refreshing sweepstake: {sweepstake.stringified_id}")
-                    generate_sweepstakes.refresh_sweepstake_odds(
-                        client=bf_client,
-                        sweepstake_db=sweepstake,
-                        session=db_session,
-                    )
-
-            logging.info("Odds for all active sweepstakes have been refreshed.")
-
-        logging.info(f"Waiting for {delay_seconds} seconds before the next refresh.")
-        await asyncio.sleep(delay_seconds)
+
+def refresh_sweepstake_leaderboard_by_id(
+    sweepstake_id: int,
+    lg_client: LiveGolfClient,
+    session_factory: SessionFactory,
+) -> None:
+    """
+    Refresh a single sweepstake's leaderboard in its own session.
+    """
+
+    with session_factory() as db_session:
+        sweepstake = queries.get_sweepstake_graph(db_session, sweepstake_id)
+        logging.info(f"Refreshing scores for sweepstake: {sweepstake.stringified_id}")
+        generate_sweepstakes.refresh_sweepstake_leaderboard(
+            client=lg_client,
+            sweepstake_db=sweepstake,
+            session=db_session,
+        )
+
+
+async def refresh_all_scores(
+    lg_client: LiveGolfClient,
+    session_factory: SessionFactory = database.get_session_context,
+    max_concurrency: int = REFRESH_CONCURRENCY,
+    max_retries: int = REFRESH_MAX_RETRIES,
+    backoff_seconds: float = REFRESH_BACKOFF_SECONDS,
+    sweepstake_ids: Collection[int] | None = None,
+) -> RefreshReport | None:
+    """
+    Refresh scores for all active sweepstakes with a linked tournament, or only those in
+    `sweepstake_ids`.
+
+    The Live Golf client is synchronous, so each sweepstake is refreshed in the refresh
+    worker pool, at most `max_concurrency` at a time, with its own retries.
+    """
+
+    sweepstake_ids = await run_blocking(
+        get_active_leaderboard_sweepstake_ids, session_factory, sweepstake_ids
+    )
+    if not sweepstake_ids:
+        logging.info("No active sweepstakes found with scores linked.")
+        return None
+
+    async def refresh(sweepstake_id: int) -> None:
+        await run_blocking(
+            refresh_sweepstake_leaderboard_by_id,
+            sweepstake_id,
+            lg_client,
+            session_factory,
+        )
+
+    report = await scheduler.refresh_each(
+        sweepstake_ids, refresh, max_concurrency, max_retries, backoff_seconds
+    )
+    logging.info(f"Scores refresh: {report}.")
+    return report
+
+
+def get_scores_refresh_intervals(
+    sweepstake_ids: Collection[int],
+    session_factory: SessionFactory,
+    base_interval: float = SCORE_REFRESH_INTERVAL,
+) -> dict[int, float]:
+    """
+    Seconds until each sweepstake's scores should next be refreshed, based on its start
+    date, scaled from `base_interval`.
+    """
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    intervals = {}
+    with session_factory() as db_session:
+        for sweepstake_id in sweepstake_ids:
+            sweepstake = db_session.get(db_models.Sweepstakes, sweepstake_id)
+            intervals[sweepstake_id] = scheduler.compute_scores_refresh_interval(
+                start_date=sweepstake.start_date if sweepstake else None,
+                now=now,
+                base_interval=base_interval,
+                max_interval=MARKET_REFRESH_MAX_INTERVAL,
+                live_seconds=MARKET_LIVE_WINDOW,
+            )
+    return intervals
 
 
 async def refresh_all_scores_task(
@@ -56,39 +499,104 @@ async def refresh_all_scores_task(
     delay_seconds: int = SCORE_REFRESH_INTERVAL,
 ):
     """
-    Task to refresh all scores.
+    Task to refresh scores for active sweepstakes as they fall due.
+
+    `delay_seconds` is the base refresh interval, before scaling by start date. The task
+    does nothing if it is not positive.
     """
 
     if delay_seconds <= 0:
         return
 
-    while True:
-        logging.info("Starting to refresh all scores.")
-        with database.get_session_context() as db_session:
-            statement = select(db_models.Sweepstakes).where(
-                and_(
-                    db_models.Sweepstakes.active,
-                    db_models.Sweepstakes.tournament_id.isnot(None),
-                )
-            )
+    await run_refresh_loop(
+        "scores",
+        partial(get_active_leaderboard_sweepstake_ids, database.get_session_context),
+        lambda sweepstake_ids: refresh_all_scores(
+            lg_client, sweepstake_ids=sweepstake_ids
+        ),
+        partial(
+            get_scores_refresh_intervals,
+            session_factory=database.get_session_context,
+            base_interval=delay_seconds,
+        ),
+    )
+
+
+def get_retention_policy() -> RetentionPolicy:
+    return RetentionPolicy(
+        tiers=[
+            CompactionTier(
+                older_than_seconds=RETENTION_HOURLY_AFTER, resolution_seconds=3600
+            ),
+            CompactionTier(
+                older_than_seconds=RETENTION_DAILY_AFTER, resolution_seconds=86400
+            ),
+        ],
+        archive_closed_after_seconds=(
+            int(RETENTION_ARCHIVE_CLOSED_AFTER)
+            if RETENTION_ARCHIVE_CLOSED_AFTER
+            else None
+        ),
+    )
+
 
-            all_active_sweepstakes: Iterable[db_models.Sweepstakes] = (
-                db_session.exec(statement).scalars().all()
+def apply_retention(
+    session_factory: SessionFactory = database.get_session_context,
+    dry_run: bool = RETENTION_DRY_RUN,
+) -> None:
+    with session_factory() as db_session:
+        retention_reports.append(
+            retention.apply_retention(
+                db_session, get_retention_policy(), dry_run=dry_run
             )
-            if not all_active_sweepstakes:
-                logging.info("No active sweepstakes found with scores linked.")
-            else:
-                for sweepstake in all_active_sweepstakes:
-                    logging.info(
-                        f"Refreshing scores for sweepstake: {sweepstake.stringified_id}"
-                    )
-                    generate_sweepstakes.refresh_sweepstake_leaderboard(
-                        client=lg_client,
-                        sweepstake_db=sweepstake,
-                        session=db_session,
-                    )
-
-            logging.info("All active scores have been refreshed.")
-
-        logging.info(f"Waiting for {delay_seconds} seconds before the next refresh.")
+        )
+
+
+async def retention_task(delay_seconds: int = RETENTION_INTERVAL):
+    """
+    Task to compact and archive odds history every `delay_seconds`.
+    """
+
+    if delay_seconds <= 0:
+        return
+
+    while True:
+        try:
+            await run_blocking(apply_retention)
+        except Exception as e:
+            logging.exception(f"Odds history retention failed: {e}")
+
+        logging.info(
+            f"Waiting for {delay_seconds} seconds before the next odds history retention."
+        )
         await asyncio.sleep(delay_seconds)
+
+
+async def keep_betfair_sessions_alive_task(
+    bf_client: betfair.BetfairClient,
+    bf_async_client: betfair.AsyncBetfairClient,
+    delay_seconds: int = BETFAIR_KEEP_ALIVE_INTERVAL,
+):
+    """
+    Task to renew both Betfair clients' session tokens every `delay_seconds`, so they never
+    expire between requests however rarely the clients are used. A failed renewal is tried
+    again after SCHEDULER_POLL_INTERVAL seconds.
+    """
+
+    if delay_seconds <= 0:
+        return
+
+    while True:
+        delay = delay_seconds
+        try:
+            await bf_async_client.keep_alive()
+        except Exception as e:
+            logging.exception(f"Failed to renew the async Betfair session: {e}")
+            delay = min(delay, SCHEDULER_POLL_INTERVAL)
+        try:
+            await run_blocking(bf_client.keep_alive)
+        except Exception as e:
+            logging.exception(f"Failed to renew the Betfair session: {e}")
+            delay = min(delay, SCHEDULER_POLL_INTERVAL)
+
+        await asyncio.sleep(delay)
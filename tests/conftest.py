@@ -0,0 +1,119 @@
+import datetime
+import os
+
+from pytest import fixture
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from sweepy.integrations.betfair import MarketInfo
+
+# sweepy.database builds its engine on import
+os.environ.setdefault("ENVIRONMENT", "development")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+
+class FakeBetfairClient:
+    """
+    Stand-in for BetfairClient serving a single market with mutable prices.
+    """
+
+    def __init__(self, market_id: str, prices: dict[int, float]):
+        self.market_id = market_id
+        self.prices = prices
+        self.calls = 0
+
+    def get_selection_names_batch(
+        self, market_ids: list[str]
+    ) -> dict[str, dict[int, str]]:
+        self.calls += 1
+        names = {selection_id: f"Runner {selection_id}" for selection_id in self.prices}
+        return {market_id: names for market_id in market_ids}
+
+    def invalidate_selection_names(self, market_id: str) -> None:
+        pass
+
+    def get_market_book_batch(self, market_ids: list[str]) -> dict[str, dict]:
+        self.calls += 1
+        return {
+            market_id: {
+                "marketId": market_id,
+                "runners": [
+                    {
+                        "selectionId": selection_id,
+                        "status": "ACTIVE",
+                        "ex": {
+                            "availableToBack": [{"price": price, "size": 1000}],
+                            "availableToLay": [{"price": price, "size": 1000}],
+                        },
+                    }
+                    for selection_id, price in self.prices.items()
+                ],
+            }
+            for market_id in market_ids
+        }
+
+    def get_market_info(self, market_id: str) -> MarketInfo:
+        return MarketInfo(
+            market_id=market_id,
+            market_name="Winner",
+            event_type=1,
+            event_name="Test Event",
+            competition_name="Test Competition",
+            market_start_time=datetime.datetime(2025, 4, 10, tzinfo=datetime.UTC),
+        )
+
+
+class FakeAsyncBetfairClient:
+    """
+    Async wrapper around FakeBetfairClient matching AsyncBetfairClient's surface.
+    """
+
+    def __init__(self, client: FakeBetfairClient):
+        self.client = client
+
+    async def get_selection_names_batch(
+        self, market_ids: list[str]
+    ) -> dict[str, dict[int, str]]:
+        return self.client.get_selection_names_batch(market_ids)
+
+    def invalidate_selection_names(self, market_id: str) -> None:
+        self.client.invalidate_selection_names(market_id)
+
+    async def get_market_book_batch(self, market_ids: list[str]) -> dict[str, dict]:
+        return self.client.get_market_book_batch(market_ids)
+
+
+@fixture
+def engine():
+    # A single shared connection, so sessions opened from worker threads see the same data
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@fixture
+def session(engine):
+    with Session(engine) as session:
+        yield session
+
+
+@fixture
+def session_factory(engine):
+    return lambda: Session(engine)
+
+
+@fixture
+def bf_client() -> FakeBetfairClient:
+    return FakeBetfairClient(
+        market_id="1.234",
+        prices={selection_id: 2.0 + selection_id for selection_id in range(1, 9)},
+    )
+
+
+@fixture
+def bf_async_client(bf_client) -> FakeAsyncBetfairClient:
+    return FakeAsyncBetfairClient(bf_client)
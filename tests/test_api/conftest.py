@@ -0,0 +1,15 @@
+from fastapi.testclient import TestClient
+from pytest import fixture
+from sqlmodel import Session
+
+from sweepy import api
+from sweepy.database import get_session
+from sweepy.response_cache import sweepstake_responses
+
+
+@fixture
+def client(engine):
+    api.app.dependency_overrides[get_session] = lambda: Session(engine)
+    yield TestClient(api.app)
+    api.app.dependency_overrides.clear()
+    sweepstake_responses.clear()
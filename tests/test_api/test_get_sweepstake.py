@@ -0,0 +1,63 @@
+from pytest import fixture
+
+from sweepy import db_models
+from sweepy.generate_sweepstakes import generate_sweepstakes, refresh_sweepstake_odds
+from sweepy.models import AssignmentMethod, SweepstakesRequest
+from sweepy.response_cache import sweepstake_responses
+
+
+@fixture
+def sweepstake(bf_client, session):
+    request = SweepstakesRequest(
+        name="Test Sweepstake",
+        market_id=bf_client.market_id,
+        method=AssignmentMethod.STAGGERED,
+        participant_names=["Alice", "Bob"],
+        competition="Test Competition",
+    )
+    return generate_sweepstakes(bf_client, None, request, session)
+
+
+def test_get_sweepstake_serves_cached_response(client, sweepstake):
+    url = f"/api/sweepstakes/{sweepstake.stringified_id}"
+
+    first = client.get(url)
+    second = client.get(url)
+
+    assert first.content == second.content
+    assert first.headers["etag"] == second.headers["etag"]
+    assert (sweepstake_responses.hits, sweepstake_responses.misses) == (1, 1)
+
+
+def test_get_sweepstake_returns_304_for_matching_etag(client, sweepstake):
+    url = f"/api/sweepstakes/{sweepstake.stringified_id}"
+    etag = client.get(url).headers["etag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_get_sweepstake_refresh_invalidates_cache(
+    bf_client, client, session, sweepstake
+):
+    url = f"/api/sweepstakes/{sweepstake.stringified_id}"
+    before = client.get(url)
+    bf_client.prices[1] = 1.5
+
+    refresh_sweepstake_odds(bf_client, sweepstake, session)
+
+    assert len(sweepstake_responses) == 0
+    after = client.get(url, headers={"If-None-Match": before.headers["etag"]})
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+    assert after.json() != before.json()
+
+
+def test_stream_sweepstake_events_requires_existing_sweepstake(client):
+    sweepstake_id = db_models.Sweepstakes(id=999).stringified_id
+
+    response = client.get(f"/api/sweepstakes/{sweepstake_id}/events")
+
+    assert response.status_code == 404
@@ -0,0 +1,139 @@
+import datetime
+
+from pytest import fixture
+
+from sweepy import db_models
+from sweepy.models import RetentionPolicy
+from sweepy.retention import apply_retention
+
+START = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+# Two days of 15-minute refreshes
+POINTS = 192
+
+
+@fixture
+def sweepstake(session) -> db_models.Sweepstakes:
+    participants = []
+    for name, offset in [("Alice", 0.0), ("Bob", 0.5)]:
+        participant = db_models.Participant(name=name)
+        for i in range(POINTS):
+            participant.odds_history.append(
+                db_models.ParticipantOdds(
+                    implied_probability=offset + (i % 2) * 0.1,
+                    timestamp=START + datetime.timedelta(minutes=15 * i),
+                )
+            )
+        participants.append(participant)
+
+    sweepstake = db_models.Sweepstakes(
+        name="Test Sweepstake",
+        market_id="1.1",
+        competition="Test Competition",
+        method="random",
+        active=True,
+        start_date=START,
+        participants=participants,
+    )
+    session.add(sweepstake)
+    session.commit()
+    session.refresh(sweepstake)
+    return sweepstake
+
+
+def _history(client, sweepstake, **params) -> dict:
+    response = client.get(
+        f"/api/sweepstakes/{sweepstake.stringified_id}/history", params=params
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _timestamps(participant: dict) -> list[datetime.datetime]:
+    return [
+        datetime.datetime.fromisoformat(point["timestamp"]).replace(
+            tzinfo=datetime.timezone.utc
+        )
+        for point in participant["history"]
+    ]
+
+
+def test_history_returns_every_point_by_default(client, sweepstake):
+    data = _history(client, sweepstake)
+
+    assert [len(participant["history"]) for participant in data["participants"]] == [
+        POINTS,
+        POINTS,
+    ]
+    last = START + datetime.timedelta(minutes=15 * (POINTS - 1))
+    assert (
+        datetime.datetime.fromisoformat(data["next_since"]).replace(
+            tzinfo=datetime.timezone.utc
+        )
+        == last
+    )
+
+
+def test_history_window(client, sweepstake):
+    data = _history(
+        client,
+        sweepstake,
+        **{
+            "from": (START + datetime.timedelta(hours=1)).isoformat(),
+            "to": (START + datetime.timedelta(hours=2)).isoformat(),
+        },
+    )
+
+    for participant in data["participants"]:
+        assert _timestamps(participant) == [
+            START + datetime.timedelta(minutes=minutes)
+            for minutes in [60, 75, 90, 105, 120]
+        ]
+
+
+def test_history_since_only_returns_newer_points(client, sweepstake):
+    data = _history(client, sweepstake)
+
+    assert _history(client, sweepstake, since=data["next_since"])["participants"] == [
+        {"name": "Alice", "history": []},
+        {"name": "Bob", "history": []},
+    ]
+
+
+def test_history_buckets_average_in_database(client, sweepstake):
+    data = _history(client, sweepstake, downsample="buckets", max_points=48)
+
+    alice, bob = data["participants"]
+    assert len(alice["history"]) == 48
+    # Points alternate between two values, so every hourly bucket averages to the middle
+    assert all(
+        abs(float(point["probability"]) - 0.05) < 1e-9 for point in alice["history"]
+    )
+    assert all(
+        abs(float(point["probability"]) - 0.55) < 1e-9 for point in bob["history"]
+    )
+    # Every participant is stamped with the same bucket timestamps
+    assert _timestamps(alice) == _timestamps(bob)
+
+
+def test_history_lttb(client, sweepstake):
+    data = _history(client, sweepstake, downsample="lttb", max_points=20)
+
+    for participant in data["participants"]:
+        assert len(participant["history"]) == 20
+
+
+def test_history_reads_archived_sweepstakes(client, session, sweepstake):
+    data = _history(client, sweepstake, downsample="buckets", max_points=48)
+    sweepstake.active = False
+    session.add(sweepstake)
+    session.commit()
+
+    apply_retention(
+        session,
+        RetentionPolicy(tiers=[], archive_closed_after_seconds=0),
+        now=datetime.datetime.now(datetime.timezone.utc),
+    )
+
+    archived = _history(client, sweepstake, downsample="buckets", max_points=48)
+    assert archived["participants"] == data["participants"]
+    assert archived["next_since"] == data["next_since"]
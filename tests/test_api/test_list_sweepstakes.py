@@ -0,0 +1,84 @@
+import datetime
+
+from pytest import fixture
+
+from sweepy import db_models
+
+
+@fixture
+def sweepstakes(session) -> list[db_models.Sweepstakes]:
+    updated_at = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    created = []
+    for i in range(7):
+        sweepstake = db_models.Sweepstakes(
+            name=f"Sweepstake {i}",
+            market_id="1.1" if i % 2 == 0 else "1.2",
+            competition="Masters" if i < 4 else "Open",
+            method="fair" if i % 3 == 0 else "random",
+            active=i != 6,
+            start_date=updated_at,
+            # Pairs of sweepstakes share an updated_at, so ties are broken on id
+            updated_at=updated_at + datetime.timedelta(hours=i // 2),
+            participants=[db_models.Participant(name="Alice")],
+        )
+        session.add(sweepstake)
+        created.append(sweepstake)
+    session.commit()
+    return created
+
+
+def _collect_pages(client, params: dict) -> list[list[str]]:
+    pages = []
+    cursor = None
+    while True:
+        response = client.get(
+            "/api/sweepstakes",
+            params={**params, **({"cursor": cursor} if cursor else {})},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        pages.append([item["name"] for item in data["items"]])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_list_sweepstakes_pages_by_updated_at_and_id(client, sweepstakes):
+    pages = _collect_pages(client, {"limit": 2})
+
+    assert pages == [
+        ["Sweepstake 5", "Sweepstake 4"],
+        ["Sweepstake 3", "Sweepstake 2"],
+        ["Sweepstake 1", "Sweepstake 0"],
+    ]
+
+
+def test_list_sweepstakes_includes_closed(client, sweepstakes):
+    pages = _collect_pages(client, {"limit": 4, "include_closed": True})
+
+    assert [name for page in pages for name in page] == [
+        f"Sweepstake {i}" for i in reversed(range(7))
+    ]
+
+
+def test_list_sweepstakes_filters(client, sweepstakes):
+    pages = _collect_pages(
+        client, {"competition": "Masters", "market_id": "1.1", "method": "fair"}
+    )
+
+    assert pages == [["Sweepstake 0"]]
+
+
+def test_list_sweepstakes_returns_summaries(client, sweepstakes):
+    response = client.get("/api/sweepstakes", params={"limit": 1})
+
+    [item] = response.json()["items"]
+    assert item["id"] == sweepstakes[5].stringified_id
+    assert item["participant_count"] == 1
+    assert "participants" not in item
+
+
+def test_list_sweepstakes_rejects_invalid_cursor(client, sweepstakes):
+    response = client.get("/api/sweepstakes", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
@@ -0,0 +1,71 @@
+from pytest import fixture
+
+from sweepy import api
+
+
+@fixture
+def fairness_client(client, bf_client, monkeypatch):
+    monkeypatch.setattr(api, "__bf_client", bf_client)
+    return client
+
+
+def test_simulate_market_fairness(fairness_client):
+    response = fairness_client.get(
+        "/api/markets/1.234/fairness",
+        params={"participants": 4, "runs": 50, "seed": 1, "method": ["fair", "random"]},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["seed"] == 1
+    assert data["runs"] == 50
+    assert [result["method"] for result in data["methods"]] == ["fair", "random"]
+    assert len(data["methods"][0]["win_shares"]) == 4
+
+    repeated = fairness_client.get(
+        "/api/markets/1.234/fairness",
+        params={"participants": 4, "runs": 50, "seed": 1, "method": ["fair", "random"]},
+    )
+    assert repeated.json() == data
+
+
+def test_simulate_market_fairness_defaults_to_every_method(fairness_client):
+    response = fairness_client.get(
+        "/api/markets/1.234/fairness", params={"participants": 2, "runs": 5}
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["methods"]) == len(api.AssignmentMethod)
+
+
+def test_simulate_market_fairness_limits_runs_times_candidates(fairness_client):
+    response = fairness_client.get(
+        "/api/markets/1.234/fairness",
+        params={"participants": 2, "runs": 10, "candidates": 3, "method": ["fair"]},
+    )
+    assert response.status_code == 200
+    assert response.json()["candidates"] == 3
+
+    response = fairness_client.get(
+        "/api/markets/1.234/fairness",
+        params={"participants": 2, "runs": api.SIMULATION_MAX_RUNS, "candidates": 2},
+    )
+    assert response.status_code == 400
+
+
+def test_simulate_market_fairness_not_enough_selections(fairness_client):
+    response = fairness_client.get(
+        "/api/markets/1.234/fairness", params={"participants": 9}
+    )
+
+    assert response.status_code == 400
+
+
+def test_simulate_market_fairness_market_not_found(fairness_client, bf_client):
+    bf_client.prices = {}
+
+    response = fairness_client.get(
+        "/api/markets/1.999/fairness", params={"participants": 2}
+    )
+
+    assert response.status_code == 404
@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+
+from pytest import fixture
+from sqlalchemy import event
+
+from sweepy.generate_sweepstakes import generate_sweepstakes, refresh_sweepstake_odds
+from sweepy.models import AssignmentMethod, SweepstakesRequest
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@fixture
+def sweepstakes(bf_client, session):
+    created = []
+    for _ in range(3):
+        request = SweepstakesRequest(
+            name="Test Sweepstake",
+            market_id=bf_client.market_id,
+            method=AssignmentMethod.STAGGERED,
+            participant_names=["Alice", "Bob", "Charlie", "David"],
+            competition="Test Competition",
+        )
+        sweepstake = generate_sweepstakes(bf_client, None, request, session)
+        refresh_sweepstake_odds(bf_client, sweepstake, session)
+        created.append(sweepstake)
+    return created
+
+
+def test_get_sweepstake_runs_fixed_number_of_queries(engine, client, sweepstakes):
+    url = f"/api/sweepstakes/{sweepstakes[0].stringified_id}"
+    with count_queries(engine) as statements:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert len(response.json()["participants"]) == 4
+    # Version, then sweepstake, participants and runners
+    assert len(statements) == 4
+
+    with count_queries(engine) as statements:
+        response = client.get(url)
+
+    # Only the version is read once the response is cached
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+
+def test_list_sweepstakes_runs_a_single_query(engine, client, sweepstakes):
+    with count_queries(engine) as statements:
+        response = client.get("/api/sweepstakes")
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+    assert len(statements) == 1
+
+
+def test_get_sweepstake_history_runs_fixed_number_of_queries(
+    engine, client, sweepstakes
+):
+    url = f"/api/sweepstakes/{sweepstakes[0].stringified_id}/history"
+    with count_queries(engine) as statements:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert all(
+        len(participant["history"]) == 2
+        for participant in response.json()["participants"]
+    )
+    # Sweepstake, participants, participant odds
+    assert len(statements) == 3
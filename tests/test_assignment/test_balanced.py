@@ -0,0 +1,60 @@
+from decimal import Decimal
+import random
+import statistics
+
+from sweepy.assignment import assign_selections_balanced, assign_selections_fair
+from sweepy.models import RunnerOdds
+
+
+def _equities(result: dict[str, list[RunnerOdds]]) -> list[float]:
+    return [
+        float(sum(selection.implied_probability for selection in selections))
+        for selections in result.values()
+    ]
+
+
+def test_assign_selections_balanced_each_selection_assigned_exactly_once(
+    runner_probabilities_us_open,
+):
+    participants = ["Alice", "Bob", "Charlie", "David"]
+    result = assign_selections_balanced(participants, runner_probabilities_us_open)
+
+    all_assigned_selections = [
+        selection for selections in result.values() for selection in selections
+    ]
+
+    assert len(all_assigned_selections) == len(runner_probabilities_us_open)
+    assert len(set(all_assigned_selections)) == len(runner_probabilities_us_open)
+
+
+def test_assign_selections_balanced_one_top_pick_each(runner_probabilities_us_open):
+    participants = ["Alice", "Bob", "Charlie", "David"]
+    result = assign_selections_balanced(participants, runner_probabilities_us_open)
+
+    top_picks = sorted(runner_probabilities_us_open, reverse=True)[: len(participants)]
+    for selections in result.values():
+        assert selections[0] in top_picks
+        assert not any(selection in top_picks for selection in selections[1:])
+
+
+def test_assign_selections_balanced_no_worse_than_fair(runner_probabilities_us_open):
+    participants = ["Alice", "Bob", "Charlie", "David"]
+    fair = assign_selections_fair(
+        participants, runner_probabilities_us_open, rng=random.Random(0)
+    )
+    balanced = assign_selections_balanced(participants, runner_probabilities_us_open)
+
+    assert statistics.pvariance(_equities(balanced)) <= statistics.pvariance(
+        _equities(fair)
+    )
+
+
+def test_assign_selections_balanced_finds_even_split():
+    selections = [
+        RunnerOdds(provider_id=str(i), name=str(i), implied_probability=Decimal(p))
+        for i, p in enumerate(["0.3", "0.3", "0.1", "0.1", "0.1", "0.05", "0.05"])
+    ]
+
+    result = assign_selections_balanced(["Alice", "Bob"], selections)
+
+    assert _equities(result) == [0.5, 0.5]
@@ -1,4 +1,44 @@
-from sweepy.assignment import assign_selections_fair
+from decimal import Decimal
+import random
+
+import pytest
+
+from sweepy.assignment import _exact_integer_probabilities, assign_selections_fair
+from sweepy.models import RunnerOdds
+
+
+def _assign_selections_fair_reference(
+    participants: list[str],
+    selections: list[RunnerOdds],
+) -> dict[str, list[RunnerOdds]]:
+    # The original list and Decimal based implementation, which the heap based one must match
+    result = {}
+
+    target_probability = Decimal("1") / len(participants)
+    selections_ordered_by_odds = sorted(selections, reverse=True)
+
+    remaining_probabilities = {
+        participant: target_probability for participant in participants
+    }
+
+    for participant in participants:
+        result[participant] = []
+        first_selection = selections_ordered_by_odds.pop(0)
+        remaining_probabilities[participant] -= first_selection.implied_probability
+        result[participant].append(first_selection)
+
+    random.shuffle(selections_ordered_by_odds)
+
+    for selection in selections_ordered_by_odds:
+        participant_with_most_remaining_probability = max(
+            remaining_probabilities, key=remaining_probabilities.get
+        )
+        result[participant_with_most_remaining_probability].append(selection)
+        remaining_probabilities[participant_with_most_remaining_probability] -= (
+            selection.implied_probability
+        )
+
+    return result
 
 
 def test_assign_selections_tiered_each_selection_assigned_exactly_once(
@@ -13,3 +53,49 @@ def test_assign_selections_tiered_each_selection_assigned_exactly_once(
 
     assert len(all_assigned_selections) == len(runner_probabilities_us_open)
     assert len(set(all_assigned_selections)) == len(runner_probabilities_us_open)
+
+
+@pytest.mark.parametrize("num_participants", [1, 3, 4, 7, 12])
+@pytest.mark.parametrize("seed", range(5))
+def test_assign_selections_fair_matches_reference_for_seed(
+    runner_probabilities_us_open, num_participants, seed
+):
+    participants = [f"Participant {i}" for i in range(num_participants)]
+
+    random.seed(seed)
+    expected = _assign_selections_fair_reference(
+        participants, runner_probabilities_us_open
+    )
+    result = assign_selections_fair(
+        participants, runner_probabilities_us_open, rng=random.Random(seed)
+    )
+
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+def test_assign_selections_fair_matches_reference_with_ties():
+    # Equal odds throughout, so every choice comes down to tie breaking
+    selections = [
+        RunnerOdds(provider_id=str(i), name=str(i), implied_probability=Decimal("0.05"))
+        for i in range(20)
+    ]
+    participants = ["Alice", "Bob", "Charlie"]
+
+    random.seed(1)
+    expected = _assign_selections_fair_reference(participants, selections)
+
+    assert (
+        assign_selections_fair(participants, selections, rng=random.Random(1))
+        == expected
+    )
+
+
+def test_exact_integer_probabilities():
+    selections = [
+        RunnerOdds(provider_id="1", name="1", implied_probability=Decimal("0.25")),
+        RunnerOdds(provider_id="2", name="2", implied_probability=Decimal("0.125")),
+        RunnerOdds(provider_id="3", name="3", implied_probability=Decimal("1")),
+    ]
+
+    assert _exact_integer_probabilities(selections) == [250, 125, 1000]
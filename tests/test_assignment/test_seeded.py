@@ -0,0 +1,136 @@
+import random
+
+import numpy as np
+import pytest
+
+from sweepy import assignment
+from sweepy.assignment import (
+    ASSIGNERS,
+    assign_selections_best_of,
+    assign_selections_seeded,
+    equity_variance,
+)
+from sweepy.models import AssignmentMethod
+
+
+@pytest.mark.parametrize("method", list(AssignmentMethod))
+def test_assigners_do_not_mutate_their_inputs(method, runner_probabilities_us_open):
+    participants = ["Alice", "Bob", "Charlie", "David"]
+    selections = list(runner_probabilities_us_open)
+
+    ASSIGNERS[method](participants, selections, rng=random.Random(0))
+
+    assert participants == ["Alice", "Bob", "Charlie", "David"]
+    assert selections == runner_probabilities_us_open
+
+
+@pytest.mark.parametrize("method", list(AssignmentMethod))
+def test_assigners_are_reproducible(method, runner_probabilities_us_open):
+    participants = ["Alice", "Bob", "Charlie", "David"]
+
+    first = ASSIGNERS[method](
+        participants, runner_probabilities_us_open, rng=random.Random(5)
+    )
+    second = ASSIGNERS[method](
+        participants, runner_probabilities_us_open, rng=random.Random(5)
+    )
+
+    assert first == second
+
+
+def test_assigners_accept_numpy_generators(runner_probabilities_us_open):
+    participants = ["Alice", "Bob", "Charlie", "David"]
+    assigner = ASSIGNERS[AssignmentMethod.RANDOM]
+
+    first = assigner(
+        participants, runner_probabilities_us_open, rng=np.random.default_rng(3)
+    )
+    second = assigner(
+        participants, runner_probabilities_us_open, rng=np.random.default_rng(3)
+    )
+
+    assert first == second
+
+
+def test_assigners_leave_global_random_state_alone(runner_probabilities_us_open):
+    state = random.getstate()
+
+    ASSIGNERS[AssignmentMethod.RANDOM](
+        ["Alice", "Bob"], runner_probabilities_us_open, rng=random.Random(0)
+    )
+
+    assert random.getstate() == state
+
+
+def test_assign_selections_best_of_keeps_fairest(runner_probabilities_us_open):
+    participants = ["Alice", "Bob", "Charlie", "David"]
+
+    assignments, seed = assign_selections_best_of(
+        AssignmentMethod.RANDOM,
+        participants,
+        runner_probabilities_us_open,
+        candidates=20,
+        seed=42,
+    )
+
+    single, single_seed = assign_selections_best_of(
+        AssignmentMethod.RANDOM, participants, runner_probabilities_us_open, seed=42
+    )
+    assert single_seed == 42
+    assert equity_variance(assignments) <= equity_variance(single)
+
+    # The returned seed reproduces the kept candidate on its own
+    assert (
+        assign_selections_seeded(
+            AssignmentMethod.RANDOM, participants, runner_probabilities_us_open, seed
+        )
+        == assignments
+    )
+    assert assign_selections_best_of(
+        AssignmentMethod.RANDOM, participants, runner_probabilities_us_open, seed=seed
+    ) == (assignments, seed)
+
+
+@pytest.mark.parametrize(
+    "method", [AssignmentMethod.STAGGERED, AssignmentMethod.BALANCED]
+)
+def test_assign_selections_best_of_skips_candidates_for_deterministic_methods(
+    method, runner_probabilities_us_open, monkeypatch
+):
+    participants = ["Alice", "Bob", "Charlie", "David"]
+    equities = {
+        tuple(
+            sorted(
+                sum(selection.implied_probability for selection in selections)
+                for selections in assign_selections_seeded(
+                    method, participants, runner_probabilities_us_open, seed
+                ).values()
+            )
+        )
+        for seed in range(5)
+    }
+    # Every seed gives the same equities
+    assert len(equities) == 1
+
+    calls = []
+    monkeypatch.setattr(
+        assignment,
+        "assign_selections_seeded",
+        lambda *args: calls.append(args) or ASSIGNERS[method](*args[1:3]),
+    )
+    _, seed = assign_selections_best_of(
+        method, participants, runner_probabilities_us_open, candidates=20, seed=7
+    )
+
+    assert seed == 7
+    assert len(calls) == 1
+
+
+def test_assign_selections_best_of_needs_a_candidate(runner_probabilities_us_open):
+    with pytest.raises(ValueError):
+        assign_selections_best_of(
+            AssignmentMethod.FAIR,
+            ["Alice", "Bob"],
+            runner_probabilities_us_open,
+            candidates=0,
+        )
@@ -0,0 +1,234 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from sweepy.cache import TTLCache, timed_cache, timed_cached_property
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_evicts_least_recently_used_entry():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_expired_entries_are_dropped():
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats() == {
+        "size": 0,
+        "hits": 0,
+        "stale_hits": 0,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+
+def test_get_or_compute_is_single_flight():
+    cache = TTLCache(ttl_seconds=60)
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_compute("a", compute))
+        )
+        for _ in range(8)
+    ]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Give the followers time to reach the wait
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ["value"] * 8
+    assert cache.get_or_compute("a", compute) == "value"
+    assert calls == [1]
+
+
+def test_get_or_compute_shares_errors_without_caching_them():
+    cache = TTLCache(ttl_seconds=60)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("a", fail)
+    assert cache.get_or_compute("a", lambda: "value") == "value"
+
+
+def test_serves_stale_value_while_refreshing():
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=10, stale_seconds=10, clock=clock)
+    cache.set("a", "old")
+    refreshed = threading.Event()
+
+    def compute():
+        refreshed.set()
+        return "new"
+
+    clock.now = 15
+    assert cache.get_or_compute("a", compute) == "old"
+    assert refreshed.wait(5)
+    # The refresh thread stores the value just after computing it
+    for _ in range(100):
+        if cache.get("a") == "new":
+            break
+        time.sleep(0.01)
+
+    assert cache.get("a") == "new"
+    assert cache.stale_hits == 1
+
+
+def test_aget_or_compute_is_single_flight():
+    cache = TTLCache(ttl_seconds=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.aget_or_compute("a", compute) for _ in range(5))
+        )
+
+    assert asyncio.run(run()) == ["value"] * 5
+    assert calls == [1]
+    assert cache.misses == 5
+
+
+def test_aget_or_compute_releases_followers_when_leader_is_cancelled():
+    cache = TTLCache(ttl_seconds=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        if len(calls) == 1:
+            # The first call never finishes on its own
+            await asyncio.Event().wait()
+        return "value"
+
+    async def run():
+        leader = asyncio.create_task(cache.aget_or_compute("a", compute))
+        await asyncio.sleep(0)
+        followers = [
+            asyncio.create_task(cache.aget_or_compute("a", compute)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.wait_for(asyncio.gather(*followers), 5)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results
+
+    assert asyncio.run(run()) == ["value"] * 3
+    assert calls == [1, 1]
+
+
+def test_aget_or_compute_refreshes_stale_value_in_background():
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=10, stale_seconds=10, clock=clock)
+    cache.set("a", "old")
+
+    async def compute():
+        return "new"
+
+    async def run():
+        value = await cache.aget_or_compute("a", compute)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return value
+
+    clock.now = 15
+    assert asyncio.run(run()) == "old"
+    assert cache.get("a") == "new"
+
+
+def test_timed_cache_keys_by_arguments():
+    calls = []
+
+    @timed_cache(60, max_size=2)
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert square(2) == 4
+    assert square(2) == 4
+    assert square(3) == 9
+    assert calls == [2, 3]
+    assert square.cache.hits == 1
+
+
+def test_timed_cache_supports_coroutines():
+    calls = []
+
+    @timed_cache(60)
+    async def double(x):
+        calls.append(x)
+        return x * 2
+
+    async def run():
+        return [await double(2), await double(2)]
+
+    assert asyncio.run(run()) == [4, 4]
+    assert calls == [2]
+
+
+def test_timed_cached_property_is_per_instance():
+    class Thing:
+        def __init__(self, value):
+            self.value = value
+            self.calls = 0
+
+        @timed_cached_property(ttl_seconds=60)
+        def cached(self):
+            self.calls += 1
+            return self.value
+
+    first, second = Thing(1), Thing(2)
+
+    assert (first.cached, first.cached, second.cached) == (1, 1, 2)
+    assert first.calls == 1
+
+
+@pytest.mark.parametrize("ttl_seconds", [0, -1, 1.5])
+def test_rejects_invalid_ttl(ttl_seconds):
+    with pytest.raises(ValueError):
+        timed_cache(ttl_seconds)
@@ -0,0 +1,39 @@
+from decimal import Decimal
+
+import pytest
+
+from sweepy.calculator import compute_market_odds, compute_market_probabilities
+from sweepy.models import NotEnoughLiquidityException, PriceSize, Runner
+
+BACK_LADDERS = [
+    [{"price": 2.0, "size": 100.0}, {"price": 3.0, "size": 200.0}],
+    [{"price": 4.0, "size": 100.0}],
+]
+LAY_LADDERS = [
+    [{"price": 5.0, "size": 50.0}, {"price": 4.0, "size": 20.0}],
+    [{"price": 4.5, "size": 100.0}],
+]
+
+
+def test_compute_market_odds_from_market_book_ladders():
+    runners = [
+        Runner(
+            runner_id=str(i),
+            name=f"Runner {i}",
+            available_to_back=[PriceSize(**price_size) for price_size in back],
+            available_to_lay=[PriceSize(**price_size) for price_size in lay],
+        )
+        for i, (back, lay) in enumerate(zip(BACK_LADDERS, LAY_LADDERS))
+    ]
+
+    odds = compute_market_odds(
+        ["0", "1"], ["Runner 0", "Runner 1"], BACK_LADDERS, LAY_LADDERS
+    )
+
+    assert odds.to_runner_odds() == compute_market_probabilities(runners)
+    assert odds.implied_probability("0") == Decimal("0.5414")
+
+
+def test_compute_market_odds_no_liquidity():
+    with pytest.raises(NotEnoughLiquidityException):
+        compute_market_odds(["1"], ["Runner 1"], [[]], [[{"price": 2.0, "size": 1.0}]])
@@ -0,0 +1,157 @@
+from decimal import Decimal
+import random
+
+import pytest
+
+from sweepy.calculator import (
+    compute_market_probabilities,
+    compute_market_probabilities_batch,
+    get_weighted_average_back_price,
+    get_weighted_average_lay_price,
+    get_weighted_average_prices,
+    pack_ladders,
+)
+from sweepy.models import NotEnoughLiquidityException, PriceSize, Runner
+
+
+def _generate_random_ladder(rng: random.Random, descending: bool) -> list[PriceSize]:
+    depth = rng.randint(0, 3)
+    prices = rng.sample(range(101, 100000), depth)
+    ladder = [
+        PriceSize(
+            price=Decimal(price) / 100,
+            size=Decimal(rng.randint(0, 20000)) / 100,
+        )
+        for price in prices
+    ]
+    return sorted(ladder, key=lambda x: x.price, reverse=descending)
+
+
+def _generate_random_market(seed: int, num_runners: int) -> list[Runner]:
+    rng = random.Random(seed)
+    return [
+        Runner(
+            runner_id=str(i),
+            name=f"Runner {i}",
+            available_to_back=_generate_random_ladder(rng, descending=True),
+            available_to_lay=_generate_random_ladder(rng, descending=False),
+        )
+        for i in range(num_runners)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_get_weighted_average_prices_matches_decimal_implementation(seed):
+    runners = _generate_random_market(seed, num_runners=150)
+
+    back_prices = get_weighted_average_prices(
+        *pack_ladders([runner.available_to_back for runner in runners], True)
+    )
+    lay_prices = get_weighted_average_prices(
+        *pack_ladders([runner.available_to_lay for runner in runners], False)
+    )
+
+    for runner, back_price, lay_price in zip(runners, back_prices, lay_prices):
+        expected_back = get_weighted_average_back_price(runner.available_to_back)
+        expected_lay = get_weighted_average_lay_price(runner.available_to_lay)
+
+        for expected, actual in (
+            (expected_back, back_price),
+            (expected_lay, lay_price),
+        ):
+            if expected.is_nan():
+                assert actual != actual
+            else:
+                assert abs(float(expected) - actual) <= 1e-4
+
+
+@pytest.mark.parametrize(
+    "sizes, descending",
+    [
+        # Back ladders fill from the highest price, lay ladders from the lowest
+        ({"4.0": "10", "3.0": "0", "2.0": "100"}, True),
+        ({"2.0": "10", "3.0": "0", "4.0": "100"}, False),
+    ],
+)
+def test_get_weighted_average_prices_stops_at_zero_size_level(sizes, descending):
+    ladder = [
+        PriceSize(price=Decimal(price), size=Decimal(size))
+        for price, size in sizes.items()
+    ]
+    get_expected = (
+        get_weighted_average_back_price
+        if descending
+        else get_weighted_average_lay_price
+    )
+
+    (actual,) = get_weighted_average_prices(*pack_ladders([ladder], descending))
+
+    assert get_expected(ladder).is_nan()
+    assert actual != actual
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_compute_market_probabilities_batch_matches_decimal_implementation(seed):
+    runners = _generate_random_market(seed, num_runners=150)
+
+    expected = compute_market_probabilities(runners)
+    result = compute_market_probabilities_batch(runners)
+
+    assert [odds.provider_id for odds in result] == [
+        odds.provider_id for odds in expected
+    ]
+    for expected_odds, odds in zip(expected, result):
+        assert abs(expected_odds.implied_probability - odds.implied_probability) <= (
+            Decimal("0.0001")
+        )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_compute_market_probabilities_batch_exact_mode(seed):
+    runners = _generate_random_market(seed, num_runners=150)
+
+    assert compute_market_probabilities_batch(
+        runners, exact=True
+    ) == compute_market_probabilities(runners)
+
+
+def test_compute_market_probabilities_batch_unsorted_ladders():
+    runners = [
+        Runner(
+            runner_id="1",
+            name="Runner 1",
+            available_to_back=[
+                PriceSize(price=2.0, size=100),
+                PriceSize(price=3.0, size=200),
+            ],
+            available_to_lay=[
+                PriceSize(price=5.0, size=50),
+                PriceSize(price=4.0, size=20),
+                PriceSize(price=6.0, size=400),
+            ],
+        ),
+        Runner(
+            runner_id="2",
+            name="Runner 2",
+            available_to_back=[PriceSize(price=2.0, size=100)],
+            available_to_lay=[PriceSize(price=3.0, size=100)],
+        ),
+    ]
+
+    result = compute_market_probabilities_batch(runners)
+
+    assert result == compute_market_probabilities(runners)
+
+
+def test_compute_market_probabilities_batch_no_liquidity():
+    runners = [
+        Runner(
+            runner_id="1",
+            name="Runner 1",
+            available_to_back=[PriceSize(price=2.0, size=10)],
+            available_to_lay=[],
+        ),
+    ]
+
+    with pytest.raises(NotEnoughLiquidityException):
+        compute_market_probabilities_batch(runners)
@@ -0,0 +1,46 @@
+import datetime
+
+import pytest
+
+from sweepy.downsampling import largest_triangle_three_buckets
+
+START = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _series(values: list[float]) -> list[tuple[datetime.datetime, float]]:
+    return [
+        (START + datetime.timedelta(minutes=15 * i), value)
+        for i, value in enumerate(values)
+    ]
+
+
+def test_returns_short_series_unchanged():
+    points = _series([0.1, 0.2, 0.3])
+
+    assert largest_triangle_three_buckets(points, 5) == points
+
+
+def test_keeps_endpoints_and_threshold():
+    points = _series([i / 100 for i in range(100)])
+
+    sampled = largest_triangle_three_buckets(points, 10)
+
+    assert len(sampled) == 10
+    assert sampled[0] == points[0]
+    assert sampled[-1] == points[-1]
+    assert sampled == sorted(sampled)
+
+
+def test_keeps_spikes():
+    values = [0.1] * 50
+    values[20] = 0.9
+    points = _series(values)
+
+    sampled = largest_triangle_three_buckets(points, 5)
+
+    assert points[20] in sampled
+
+
+def test_rejects_threshold_below_three():
+    with pytest.raises(ValueError):
+        largest_triangle_three_buckets(_series([0.1] * 10), 2)
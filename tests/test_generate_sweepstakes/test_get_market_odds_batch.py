@@ -0,0 +1,77 @@
+import pytest
+
+from sweepy.generate_sweepstakes import get_market_odds_batch, get_selections
+from sweepy.integrations.betfair import BetfairClient
+from sweepy.integrations.betfair import client as betfair_client
+from sweepy.models import MarketNotFoundException
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+        self.status_code = 200
+        self.ok = True
+        self.text = str(data)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def client() -> BetfairClient:
+    return BetfairClient(username="user", password="password", app_key="app_key")
+
+
+def fake_post(market_books: list[dict], catalogue_requests: list[dict]):
+    def post(url, headers=None, json=None, data=None):
+        if url == betfair_client.LOGIN_URL:
+            return FakeResponse({"token": "token"})
+        if url.endswith("listMarketBook/"):
+            return FakeResponse(market_books)
+
+        catalogue_requests.append(json)
+        return FakeResponse(
+            [
+                {
+                    "marketId": market_id,
+                    "runners": [{"selectionId": 1, "runnerName": "Runner 1"}],
+                }
+                for market_id in json["filter"]["marketIds"]
+            ]
+        )
+
+    return post
+
+
+def test_get_market_odds_batch_leaves_closed_markets_out_of_the_catalogue(
+    client, monkeypatch
+):
+    client.runner_catalogue.set("1.1", {1: "Runner 1"})
+    catalogue_requests = []
+    market_books = [{"marketId": "1.1", "status": "CLOSED", "runners": []}]
+    monkeypatch.setattr(
+        client.session, "post", fake_post(market_books, catalogue_requests)
+    )
+
+    result = get_market_odds_batch(client, ["1.1"])
+
+    assert result == {}
+    assert client.runner_catalogue.get("1.1") is None
+    assert catalogue_requests == []
+
+
+def test_get_selections_raises_for_unknown_market(client, monkeypatch):
+    monkeypatch.setattr(client.session, "post", fake_post([], []))
+
+    with pytest.raises(MarketNotFoundException):
+        get_selections(client, "1.1")
+
+
+def test_get_selections_without_active_runners(client, monkeypatch):
+    market_books = [{"marketId": "1.1", "status": "OPEN", "runners": []}]
+    monkeypatch.setattr(client.session, "post", fake_post(market_books, []))
+
+    assert get_selections(client, "1.1") == []
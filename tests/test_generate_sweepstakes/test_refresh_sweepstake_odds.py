@@ -0,0 +1,185 @@
+from sqlalchemy import event
+from sqlmodel import func, select
+
+from sweepy import db_models, live_updates
+from sweepy.generate_sweepstakes import (
+    generate_sweepstakes,
+    get_market_snapshot,
+    refresh_sweepstake_odds,
+)
+from sweepy.models import AssignmentMethod, SweepstakesRequest
+
+
+def _create_sweepstake(bf_client, session) -> db_models.Sweepstakes:
+    request = SweepstakesRequest(
+        name="Test Sweepstake",
+        market_id=bf_client.market_id,
+        method=AssignmentMethod.STAGGERED,
+        participant_names=["Alice", "Bob", "Charlie", "David"],
+        competition="Test Competition",
+    )
+    return generate_sweepstakes(bf_client, None, request, session)
+
+
+def _count(session, model) -> int:
+    return session.exec(select(func.count()).select_from(model)).one()
+
+
+def test_refresh_sweepstake_odds_writes_every_row_by_default(bf_client, session):
+    sweepstake = _create_sweepstake(bf_client, session)
+
+    refresh_sweepstake_odds(bf_client, sweepstake, session)
+
+    assert _count(session, db_models.RunnerOdds) == 16
+    assert _count(session, db_models.ParticipantOdds) == 8
+
+
+def test_refresh_sweepstake_odds_delta_skips_unchanged_runners(bf_client, session):
+    sweepstake = _create_sweepstake(bf_client, session)
+
+    refresh_sweepstake_odds(bf_client, sweepstake, session, tolerance=0.0)
+
+    assert _count(session, db_models.RunnerOdds) == 8
+    assert _count(session, db_models.ParticipantOdds) == 4
+
+
+def test_refresh_sweepstake_odds_delta_only_updates_owning_participant(
+    bf_client, session
+):
+    sweepstake = _create_sweepstake(bf_client, session)
+    bf_client.prices[1] = 2.5
+
+    # Every normalised probability moves slightly, but only runner 1 beyond the tolerance
+    refresh_sweepstake_odds(bf_client, sweepstake, session, tolerance=0.01)
+
+    assert _count(session, db_models.RunnerOdds) == 9
+    assert _count(session, db_models.ParticipantOdds) == 5
+
+    owner = next(
+        participant
+        for participant in sweepstake.participants
+        if any(runner.market_provider_id == "1" for runner in participant.runners)
+    )
+    assert len(owner.odds_history) == 2
+
+
+def test_refresh_sweepstake_odds_delta_recomputes_equity(bf_client, session):
+    sweepstake = _create_sweepstake(bf_client, session)
+    bf_client.prices[1] = 1.5
+
+    refresh_sweepstake_odds(bf_client, sweepstake, session, tolerance=0.0)
+
+    for participant in sweepstake.participants:
+        expected_equity = sum(
+            runner.latest_odds.implied_probability for runner in participant.runners
+        )
+        assert abs(participant.latest_odds.implied_probability - expected_equity) < (
+            1e-9
+        )
+
+
+def test_refresh_sweepstake_odds_reuses_snapshot(bf_client, session):
+    first = _create_sweepstake(bf_client, session)
+    second = _create_sweepstake(bf_client, session)
+    bf_client.calls = 0
+
+    snapshot = get_market_snapshot(bf_client, bf_client.market_id)
+    refresh_sweepstake_odds(bf_client, first, session, snapshot=snapshot)
+    refresh_sweepstake_odds(bf_client, second, session, snapshot=snapshot)
+
+    assert bf_client.calls == 2
+    assert _count(session, db_models.RunnerOdds) == 32
+
+
+def test_refresh_sweepstake_odds_updates_latest_columns(bf_client, session):
+    sweepstake = _create_sweepstake(bf_client, session)
+    bf_client.prices[1] = 1.5
+
+    refresh_sweepstake_odds(bf_client, sweepstake, session)
+
+    for runner in sweepstake.runners:
+        assert runner.latest_probability == runner.latest_odds.implied_probability
+    for participant in sweepstake.participants:
+        assert (
+            participant.latest_probability
+            == participant.latest_odds.implied_probability
+        )
+
+
+def test_refresh_sweepstake_odds_inserts_history_in_bulk(bf_client, engine, session):
+    sweepstake = _create_sweepstake(bf_client, session)
+    inserts = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.startswith("INSERT"):
+            inserts.append(statement.split()[2])
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        refresh_sweepstake_odds(bf_client, sweepstake, session)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert inserts == ["runnerodds", "participantodds"]
+    assert _count(session, db_models.RunnerOdds) == 16
+
+
+def test_refresh_sweepstake_odds_publishes_changes(bf_client, session, monkeypatch):
+    sweepstake = _create_sweepstake(bf_client, session)
+    published = []
+    monkeypatch.setattr(
+        live_updates.broker,
+        "publish",
+        lambda sweepstake_id, update: published.append((sweepstake_id, update)),
+    )
+
+    # Nothing moved, so there is nothing to push
+    refresh_sweepstake_odds(bf_client, sweepstake, session)
+    assert published == []
+
+    bf_client.prices[1] = 1.5
+    refresh_sweepstake_odds(bf_client, sweepstake, session)
+
+    [(sweepstake_id, update)] = published
+    assert sweepstake_id == sweepstake.id
+    assert {odds.provider_id for odds in update.odds} == {
+        runner.market_provider_id for runner in sweepstake.runners
+    }
+    assert {equity.name for equity in update.equities} == {
+        participant.name for participant in sweepstake.participants
+    }
+
+
+def test_generate_sweepstakes_stores_reproducible_seed(bf_client, session):
+    participant_names = ["Alice", "Bob", "Charlie", "David"]
+    request = SweepstakesRequest(
+        name="Test Sweepstake",
+        market_id=bf_client.market_id,
+        method=AssignmentMethod.RANDOM,
+        participant_names=participant_names,
+        competition="Test Competition",
+        candidates=5,
+    )
+    sweepstake = generate_sweepstakes(bf_client, None, request, session)
+
+    assert sweepstake.seed is not None
+    # The request is left as it was
+    assert request.participant_names == participant_names
+
+    replay = generate_sweepstakes(
+        bf_client,
+        None,
+        request.model_copy(update={"seed": sweepstake.seed, "candidates": 1}),
+        session,
+    )
+    assert replay.seed == sweepstake.seed
+
+    def runners_by_participant(sweepstake):
+        return {
+            participant.name: [
+                runner.market_provider_id for runner in participant.runners
+            ]
+            for participant in sweepstake.participants
+        }
+
+    assert runners_by_participant(replay) == runners_by_participant(sweepstake)
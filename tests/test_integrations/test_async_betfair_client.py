@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from sweepy.integrations.betfair import AsyncBetfairClient
+from sweepy.integrations.betfair.client import LOGIN_URL
+from sweepy.models import MarketNotFoundException
+
+
+@pytest.fixture
+def requests_made() -> list[httpx.Request]:
+    return []
+
+
+@pytest.fixture
+def client(requests_made) -> AsyncBetfairClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_made.append(request)
+        if str(request.url) == LOGIN_URL:
+            return httpx.Response(200, json={"token": "token"})
+
+        payload = json.loads(request.content)
+        if request.url.path.endswith("listMarketBook/"):
+            return httpx.Response(
+                200,
+                json=[
+                    {"marketId": market_id, "runners": []}
+                    for market_id in payload["marketIds"]
+                ],
+            )
+        if request.url.path.endswith("listEventTypes/"):
+            return httpx.Response(
+                200, json=[{"eventType": {"id": "7", "name": "Horse Racing"}}]
+            )
+        return httpx.Response(200, json=[])
+
+    client = AsyncBetfairClient(username="user", password="password", app_key="key")
+    client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_get_market_book_batch_requests_chunks(client, requests_made):
+    market_ids = [f"1.{i}" for i in range(100)]
+
+    result = asyncio.run(client.get_market_book_batch(market_ids))
+
+    assert list(result) == market_ids
+    book_requests = [r for r in requests_made if str(r.url) != LOGIN_URL]
+    assert len(book_requests) == 3
+    assert all(r.headers["X-Authentication"] == "token" for r in book_requests)
+
+
+def test_login_happens_once(client, requests_made):
+    async def fetch():
+        await asyncio.gather(client.get_event_types(), client.get_event_types())
+
+    asyncio.run(fetch())
+
+    assert [str(r.url) for r in requests_made].count(LOGIN_URL) == 1
+
+
+def test_keep_alive_logs_in_ahead_of_requests(client, requests_made):
+    async def fetch():
+        await client.keep_alive()
+        await client.get_event_types()
+
+    asyncio.run(fetch())
+
+    assert str(requests_made[0].url) == LOGIN_URL
+    assert [str(r.url) for r in requests_made].count(LOGIN_URL) == 1
+
+
+def test_get_event_types(client):
+    result = asyncio.run(client.get_event_types())
+
+    assert result == [{"id": "7", "name": "Horse Racing"}]
+
+
+def test_get_market_info_not_found(client):
+    with pytest.raises(MarketNotFoundException):
+        asyncio.run(client.get_market_info("1.1"))
+
+
+def test_retries_once_after_session_expired():
+    logins = []
+    tokens_sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) == LOGIN_URL:
+            logins.append(request)
+            return httpx.Response(200, json={"token": f"token-{len(logins)}"})
+
+        tokens_sent.append(request.headers["X-Authentication"])
+        if request.headers["X-Authentication"] == "token-1":
+            return httpx.Response(
+                400,
+                json={"detail": {"APINGException": {"errorCode": "NO_SESSION"}}},
+            )
+        return httpx.Response(200, json=[{"eventType": {"id": "7"}}])
+
+    client = AsyncBetfairClient(username="user", password="password", app_key="key")
+    client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    assert asyncio.run(client.get_event_types()) == [{"id": "7"}]
+    assert tokens_sent == ["token-1", "token-2"]
@@ -0,0 +1,180 @@
+import pytest
+
+from sweepy.integrations.betfair import client as betfair_client
+from sweepy.integrations.betfair import BetfairClient
+from sweepy.models import MarketNotFoundException
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = str(data)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def requests_made(client, monkeypatch) -> list[dict]:
+    requests_made = []
+
+    def fake_post(url, headers=None, json=None, data=None):
+        if url == betfair_client.LOGIN_URL:
+            return FakeResponse({"token": "token"})
+
+        requests_made.append(json)
+        if url.endswith("listMarketBook/"):
+            return FakeResponse(
+                [
+                    {"marketId": market_id, "runners": []}
+                    for market_id in json["marketIds"]
+                ]
+            )
+        return FakeResponse(
+            [
+                {
+                    "marketId": market_id,
+                    "runners": [{"selectionId": 1, "runnerName": "Runner 1"}],
+                }
+                for market_id in json["filter"]["marketIds"]
+            ]
+        )
+
+    monkeypatch.setattr(client.session, "post", fake_post)
+    return requests_made
+
+
+@pytest.fixture
+def client() -> BetfairClient:
+    return BetfairClient(username="user", password="password", app_key="app_key")
+
+
+def test_chunked():
+    assert list(betfair_client.chunked(["a", "b", "c"], 2)) == [["a", "b"], ["c"]]
+    assert list(betfair_client.chunked([], 2)) == []
+
+
+def test_get_market_book_batch_splits_by_request_weight(client, requests_made):
+    market_ids = [f"1.{i}" for i in range(100)]
+
+    result = client.get_market_book_batch(market_ids)
+
+    assert list(result) == market_ids
+    assert [len(request["marketIds"]) for request in requests_made] == [40, 40, 20]
+
+
+def test_get_market_book_batch_deduplicates(client, requests_made):
+    result = client.get_market_book_batch(["1.1", "1.2", "1.1"])
+
+    assert list(result) == ["1.1", "1.2"]
+    assert requests_made[0]["marketIds"] == ["1.1", "1.2"]
+
+
+def test_get_selection_names_batch(client, requests_made):
+    result = client.get_selection_names_batch(["1.1", "1.2"])
+
+    assert result == {"1.1": {1: "Runner 1"}, "1.2": {1: "Runner 1"}}
+    assert len(requests_made) == 1
+
+
+def test_get_market_book_not_found(client, monkeypatch, requests_made):
+    monkeypatch.setattr(client, "get_market_book_batch", lambda market_ids: {})
+
+    with pytest.raises(MarketNotFoundException):
+        client.get_market_book("1.1")
+
+
+def test_get_selection_names_batch_uses_cache(client, requests_made):
+    client.get_selection_names_batch(["1.1"])
+    result = client.get_selection_names_batch(["1.1", "1.2"])
+
+    assert result == {"1.1": {1: "Runner 1"}, "1.2": {1: "Runner 1"}}
+    assert [request["filter"]["marketIds"] for request in requests_made] == [
+        ["1.1"],
+        ["1.2"],
+    ]
+
+
+def test_get_market_book_batch_invalidates_closed_markets(
+    client, monkeypatch, requests_made
+):
+    client.runner_catalogue.set("1.1", {1: "Runner 1"})
+
+    def fake_post(url, headers=None, json=None, data=None):
+        if url == betfair_client.LOGIN_URL:
+            return FakeResponse({"token": "token"})
+        return FakeResponse([{"marketId": "1.1", "status": "CLOSED", "runners": []}])
+
+    monkeypatch.setattr(client.session, "post", fake_post)
+    client.get_market_book_batch(["1.1"])
+
+    assert client.runner_catalogue.get("1.1") is None
+
+
+def test_retries_once_after_session_expired(client, monkeypatch):
+    tokens_sent = []
+    logins = []
+
+    def fake_post(url, headers=None, json=None, data=None):
+        if url == betfair_client.LOGIN_URL:
+            logins.append(url)
+            return FakeResponse({"token": f"token-{len(logins)}"})
+
+        tokens_sent.append(headers["X-Authentication"])
+        if headers["X-Authentication"] == "token-1":
+            return FakeResponse(
+                {
+                    "detail": {
+                        "APINGException": {"errorCode": "INVALID_SESSION_INFORMATION"}
+                    }
+                },
+                status_code=400,
+            )
+        return FakeResponse([{"eventType": {"id": "7"}}])
+
+    monkeypatch.setattr(client.session, "post", fake_post)
+
+    assert client.get_event_types() == [{"id": "7"}]
+    assert tokens_sent == ["token-1", "token-2"]
+
+
+def test_renewal_uses_keep_alive(client, monkeypatch):
+    urls = []
+
+    def fake_post(url, headers=None, json=None, data=None):
+        urls.append(url)
+        if url == betfair_client.LOGIN_URL:
+            return FakeResponse({"token": "token"})
+        if url == betfair_client.KEEP_ALIVE_URL:
+            assert headers["X-Authentication"] == "token"
+            return FakeResponse({"token": "token", "status": "SUCCESS"})
+        return FakeResponse([])
+
+    monkeypatch.setattr(client.session, "post", fake_post)
+    client.token
+    client.session_token.cache.clear()
+
+    assert client.token == "token"
+    assert urls == [betfair_client.LOGIN_URL, betfair_client.KEEP_ALIVE_URL]
+
+
+def test_keep_alive_renews_token(client, monkeypatch):
+    urls = []
+
+    def fake_post(url, headers=None, json=None, data=None):
+        urls.append(url)
+        if url == betfair_client.LOGIN_URL:
+            return FakeResponse({"token": "token"})
+        return FakeResponse({"token": "token", "status": "SUCCESS"})
+
+    monkeypatch.setattr(client.session, "post", fake_post)
+
+    assert client.keep_alive() == "token"
+    assert client.keep_alive() == "token"
+    assert client.token == "token"
+    assert urls == [betfair_client.LOGIN_URL, betfair_client.KEEP_ALIVE_URL]
@@ -0,0 +1,81 @@
+import pytest
+
+from sweepy.integrations.betfair import (
+    AsyncBetfairClient,
+    BetfairClient,
+    RunnerCatalogueCache,
+)
+
+
+def test_runner_catalogue_cache_get_and_set():
+    cache = RunnerCatalogueCache()
+
+    assert cache.get("1.1") is None
+    cache.set("1.1", {1: "Runner 1"})
+    assert cache.get("1.1") == {1: "Runner 1"}
+
+
+def test_runner_catalogue_cache_evicts_least_recently_used():
+    cache = RunnerCatalogueCache(max_markets=2)
+    cache.set("1.1", {1: "Runner 1"})
+    cache.set("1.2", {2: "Runner 2"})
+    cache.get("1.1")
+    cache.set("1.3", {3: "Runner 3"})
+
+    assert len(cache) == 2
+    assert cache.get("1.1") == {1: "Runner 1"}
+    assert cache.get("1.2") is None
+
+
+def test_runner_catalogue_cache_invalidate():
+    cache = RunnerCatalogueCache()
+    cache.set("1.1", {1: "Runner 1"})
+
+    cache.invalidate("1.1")
+
+    assert cache.get("1.1") is None
+
+
+def test_runner_catalogue_cache_persists_to_disk(tmp_path):
+    path = str(tmp_path / "catalogue.db")
+    RunnerCatalogueCache(path=path).set("1.1", {1: "Runner 1", 2: "Runner 2"})
+
+    cache = RunnerCatalogueCache(path=path)
+
+    assert cache.get("1.1") == {1: "Runner 1", 2: "Runner 2"}
+
+    cache.invalidate("1.1")
+    assert RunnerCatalogueCache(path=path).get("1.1") is None
+
+
+def test_runner_catalogue_cache_caps_markets_on_disk(tmp_path):
+    path = str(tmp_path / "catalogue.db")
+    RunnerCatalogueCache(max_markets=2, path=path).set("1.1", {1: "Runner 1"})
+
+    cache = RunnerCatalogueCache(max_markets=2, path=path)
+    cache.set("1.2", {2: "Runner 2"})
+    cache.set("1.3", {3: "Runner 3"})
+
+    restarted = RunnerCatalogueCache(max_markets=2, path=path)
+    assert restarted.get("1.1") is None
+    assert restarted.get("1.2") == {2: "Runner 2"}
+    assert restarted.get("1.3") == {3: "Runner 3"}
+
+
+def test_runner_catalogue_cache_invalid_size():
+    with pytest.raises(ValueError):
+        RunnerCatalogueCache(max_markets=0)
+
+
+def test_clients_share_an_empty_runner_catalogue_cache(tmp_path):
+    cache = RunnerCatalogueCache(path=str(tmp_path / "catalogue.db"))
+
+    client = BetfairClient(
+        username="user", password="password", app_key="key", runner_catalogue=cache
+    )
+    async_client = AsyncBetfairClient(
+        username="user", password="password", app_key="key", runner_catalogue=cache
+    )
+
+    assert client.runner_catalogue is cache
+    assert async_client.runner_catalogue is cache
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+
+import pytest
+
+from sweepy.integrations.betfair.session import SessionTokenManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def manager(clock) -> SessionTokenManager:
+    return SessionTokenManager(ttl_seconds=100, refresh_margin_seconds=20, clock=clock)
+
+
+def test_reuses_token_until_refresh_window(manager, clock):
+    renewals = []
+
+    def renew(token):
+        renewals.append(token)
+        return f"token-{len(renewals)}"
+
+    assert manager.get(renew) == "token-1"
+    clock.now = 79
+    assert manager.get(renew) == "token-1"
+    assert renewals == [None]
+
+
+def test_renews_in_background_before_expiry(manager, clock):
+    renewed = threading.Event()
+    renewals = []
+
+    def renew(token):
+        renewals.append(token)
+        if len(renewals) > 1:
+            renewed.set()
+        return f"token-{len(renewals)}"
+
+    manager.get(renew)
+    clock.now = 90
+
+    # The caller is not held up by the renewal, which is passed the current token
+    assert manager.get(renew) == "token-1"
+    assert renewed.wait(5)
+    assert renewals == [None, "token-1"]
+
+
+def test_renew_restarts_the_token_lifetime(manager, clock):
+    renewals = []
+
+    def renew(token):
+        renewals.append(token)
+        return "token"
+
+    manager.get(renew)
+    clock.now = 70
+    assert manager.renew(renew) == "token"
+
+    # Without the renewal the token would have expired at 100
+    clock.now = 140
+    assert manager.get(renew) == "token"
+    assert renewals == [None, "token"]
+
+
+def test_concurrent_callers_share_one_renewal(manager):
+    release = threading.Event()
+    renewals = []
+
+    def renew(token):
+        renewals.append(token)
+        release.wait(5)
+        return "token"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(manager.get(renew)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["token"] * 5
+    assert renewals == [None]
+
+
+def test_invalidate_only_drops_matching_token(manager):
+    manager.get(lambda token: "old")
+    manager.invalidate("old")
+    assert manager.token is None
+
+    assert manager.get(lambda token: "new") == "new"
+    manager.invalidate("old")
+    assert manager.get(lambda token: "newer") == "new"
+
+
+def test_aget_coalesces_renewals(manager):
+    renewals = []
+
+    async def renew(token):
+        renewals.append(token)
+        await asyncio.sleep(0.01)
+        return "token"
+
+    async def run():
+        return await asyncio.gather(*(manager.aget(renew) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["token"] * 5
+    assert renewals == [None]
+
+
+def test_rejects_margin_longer_than_ttl():
+    with pytest.raises(ValueError):
+        SessionTokenManager(ttl_seconds=10, refresh_margin_seconds=10)
@@ -0,0 +1,81 @@
+import asyncio
+import datetime
+import json
+
+from sweepy.live_updates import LiveUpdateBroker
+from sweepy.models.sweepstakes import SweepstakesUpdate
+
+UPDATE = SweepstakesUpdate(
+    id="S-TEST",
+    updated_at=datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc),
+    active=False,
+)
+
+
+def _data(frame: bytes) -> dict:
+    event, data = frame.decode().strip().split("\n")
+    assert event == "event: update"
+    return json.loads(data.removeprefix("data: "))
+
+
+def test_publish_encodes_once_for_all_subscribers():
+    async def run():
+        broker = LiveUpdateBroker()
+        first = broker.subscribe(1)
+        second = broker.subscribe(1)
+        other = broker.subscribe(2)
+
+        broker.publish(1, UPDATE)
+
+        first_frame, second_frame = first.get_nowait(), second.get_nowait()
+        assert first_frame is second_frame
+        assert _data(first_frame)["id"] == "S-TEST"
+        assert other.empty()
+
+    asyncio.run(run())
+
+
+def test_publish_from_worker_thread():
+    async def run():
+        broker = LiveUpdateBroker()
+        queue = broker.subscribe(1)
+
+        await asyncio.to_thread(broker.publish, 1, UPDATE)
+
+        frame = await asyncio.wait_for(queue.get(), 1)
+        assert _data(frame)["active"] is False
+
+    asyncio.run(run())
+
+
+def test_publish_without_subscribers_is_a_no_op():
+    LiveUpdateBroker().publish(1, UPDATE)
+
+
+def test_slow_subscriber_drops_oldest_update():
+    async def run():
+        broker = LiveUpdateBroker(max_queued_updates=1)
+        queue = broker.subscribe(1)
+
+        broker.publish(1, UPDATE)
+        broker.publish(1, UPDATE.model_copy(update={"id": "S-NEWER"}))
+
+        assert _data(queue.get_nowait())["id"] == "S-NEWER"
+
+    asyncio.run(run())
+
+
+def test_stream_sends_heartbeats_and_updates_then_unsubscribes():
+    async def run():
+        broker = LiveUpdateBroker()
+        stream = broker.stream(1, heartbeat_seconds=0.01)
+
+        assert await anext(stream) == b": connected\n\n"
+        assert await anext(stream) == b": heartbeat\n\n"
+        broker.publish(1, UPDATE)
+        assert _data(await anext(stream))["id"] == "S-TEST"
+
+        await stream.aclose()
+        assert broker.subscriber_count(1) == 0
+
+    asyncio.run(run())
@@ -0,0 +1,40 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from sweepy.market_odds import MarketOdds
+from sweepy.models import RunnerOdds
+
+
+def test_round_trips_runner_odds():
+    selections = [
+        RunnerOdds(provider_id="1", name="A", implied_probability=Decimal("0.6")),
+        RunnerOdds(provider_id="2", name="B", implied_probability=Decimal("0.25")),
+        RunnerOdds(provider_id="3", name="C", implied_probability=Decimal("0.15")),
+    ]
+
+    odds = MarketOdds.from_runner_odds(selections)
+
+    assert len(odds) == 3
+    assert odds.probabilities.dtype == np.float64
+    assert odds.to_runner_odds() == selections
+
+
+def test_implied_probability_keeps_decimal_places():
+    odds = MarketOdds(["1", "2"], ["A", "B"], np.array([0.75, 0.25]), decimal_places=4)
+
+    assert str(odds.implied_probability("1")) == "0.7500"
+    assert odds.implied_probability("3") is None
+    assert "2" in odds
+    assert [
+        str(selection.implied_probability) for selection in odds.to_runner_odds()
+    ] == [
+        "0.7500",
+        "0.2500",
+    ]
+
+
+def test_rejects_arrays_of_different_lengths():
+    with pytest.raises(ValueError):
+        MarketOdds(["1", "2"], ["A"], np.array([0.5, 0.5]))
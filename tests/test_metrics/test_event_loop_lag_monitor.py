@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+import pytest
+
+from sweepy.metrics import EventLoopLagMonitor
+
+
+def test_event_loop_lag_monitor_window():
+    monitor = EventLoopLagMonitor()
+    monitor.record(0.5)
+    monitor.record(0.1)
+
+    assert monitor.reset_window() == 0.5
+    assert monitor.reset_window() == 0.0
+    assert monitor.max_lag_seconds == 0.5
+    assert monitor.last_lag_seconds == 0.1
+    assert monitor.samples == 2
+
+
+def test_event_loop_lag_monitor_detects_blocking_calls():
+    monitor = EventLoopLagMonitor(interval_seconds=0.01)
+
+    async def block_loop():
+        task = asyncio.create_task(monitor.run())
+        await asyncio.sleep(0.05)
+        time.sleep(0.2)
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(block_loop())
+
+    assert monitor.max_lag_seconds >= 0.1
+
+
+def test_event_loop_lag_monitor_invalid_interval():
+    with pytest.raises(ValueError):
+        EventLoopLagMonitor(interval_seconds=0)
@@ -0,0 +1,62 @@
+from sqlalchemy import create_engine, text
+
+from sweepy.migrations import run_migrations
+
+OLD_SCHEMA = [
+    "CREATE TABLE participant (id INTEGER PRIMARY KEY, name VARCHAR, sweepstake_id INTEGER)",
+    "CREATE TABLE participantodds (id INTEGER PRIMARY KEY, participant_id INTEGER, "
+    "implied_probability FLOAT, timestamp DATETIME)",
+    "CREATE TABLE runner (id INTEGER PRIMARY KEY, name VARCHAR, market_provider_id VARCHAR, "
+    "score_provider_id VARCHAR, score INTEGER, participant_id INTEGER)",
+    "CREATE TABLE runnerodds (id INTEGER PRIMARY KEY, runner_id INTEGER, "
+    "implied_probability FLOAT, timestamp DATETIME)",
+]
+
+
+def test_add_latest_odds_columns_backfills_latest_odds():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        for statement in OLD_SCHEMA:
+            connection.execute(text(statement))
+        connection.execute(
+            text("INSERT INTO participant VALUES (1, 'Alice', 1), (2, 'Bob', 1)")
+        )
+        connection.execute(
+            text(
+                "INSERT INTO participantodds VALUES "
+                "(1, 1, 0.5, '2025-01-01 00:00:00'), "
+                "(2, 1, 0.6, '2025-01-02 00:00:00'), "
+                "(3, 1, 0.4, '2025-01-01 12:00:00')"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO runner VALUES (1, 'R', '1', NULL, NULL, 1)")
+        )
+        connection.execute(
+            text(
+                "INSERT INTO runnerodds VALUES "
+                "(1, 1, 0.2, '2025-01-01 00:00:00'), "
+                "(2, 1, 0.3, '2025-01-01 00:15:00')"
+            )
+        )
+
+    run_migrations(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO participantodds VALUES (4, 2, 0.1, '2025-01-03 00:00:00')"
+            )
+        )
+    # Running again is a no-op, and does not backfill again
+    run_migrations(engine)
+
+    with engine.connect() as connection:
+        participants = connection.execute(
+            text("SELECT id, latest_probability FROM participant ORDER BY id")
+        ).all()
+        runners = connection.execute(
+            text("SELECT latest_probability, latest_odds_at FROM runner")
+        ).all()
+
+    assert participants == [(1, 0.6), (2, None)]
+    assert runners == [(0.3, "2025-01-01 00:15:00")]
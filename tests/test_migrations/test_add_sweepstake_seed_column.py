@@ -0,0 +1,29 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import SQLModel
+
+from sweepy import db_models  # noqa: F401
+from sweepy.migrations import run_migrations
+
+
+def test_add_sweepstake_seed_column():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE sweepstakes DROP COLUMN seed"))
+        connection.execute(
+            text(
+                "INSERT INTO sweepstakes (name, market_id, competition, method, active) "
+                "VALUES ('Old', '1.1', 'C', 'fair', 1)"
+            )
+        )
+
+    run_migrations(engine)
+    # Running again is a no-op
+    run_migrations(engine)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("sweepstakes")}
+    assert "seed" in columns
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT seed FROM sweepstakes")).all() == [
+            (None,)
+        ]
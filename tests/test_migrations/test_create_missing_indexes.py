@@ -0,0 +1,19 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import SQLModel
+
+from sweepy import db_models  # noqa: F401
+from sweepy.migrations import run_migrations
+
+
+def test_create_missing_indexes_adds_indexes_to_existing_tables():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_sweepstakes_active_updated_at_id"))
+
+    run_migrations(engine)
+    # Running again is a no-op
+    run_migrations(engine)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("sweepstakes")}
+    assert "ix_sweepstakes_active_updated_at_id" in indexes
@@ -0,0 +1,85 @@
+import pytest
+
+from sweepy.response_cache import ResponseCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+
+    def hmget(self, name, *keys):
+        values = self.hashes.get(name, {})
+        return [values.get(key) for key in keys]
+
+    def pipeline(self):
+        return self
+
+    def hset(self, name, mapping):
+        self.hashes[name] = {
+            key: value if isinstance(value, bytes) else value.encode()
+            for key, value in mapping.items()
+        }
+
+    def expire(self, name, seconds):
+        pass
+
+    def execute(self):
+        pass
+
+    def delete(self, name):
+        self.hashes.pop(name, None)
+
+
+class BrokenRedis:
+    def __getattr__(self, name):
+        raise ConnectionError("Redis is down")
+
+
+def test_get_only_hits_matching_version():
+    cache = ResponseCache()
+    cache.set(1, "v1", b"{}")
+
+    assert cache.get(1, "v1") == b"{}"
+    assert cache.get(1, "v2") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set(1, "v1", b"1")
+    cache.set(2, "v1", b"2")
+    cache.get(1, "v1")
+
+    cache.set(3, "v1", b"3")
+
+    assert cache.get(2, "v1") is None
+    assert cache.get(1, "v1") == b"1"
+
+
+def test_redis_is_shared_between_caches():
+    redis_client = FakeRedis()
+    writer = ResponseCache(redis_client=redis_client)
+    reader = ResponseCache(redis_client=redis_client)
+
+    writer.set(1, "v1", b"{}")
+    assert reader.get(1, "v1") == b"{}"
+
+    writer.invalidate(1)
+    reader.clear()
+    assert reader.get(1, "v1") is None
+
+
+def test_falls_back_to_memory_when_redis_fails():
+    cache = ResponseCache(redis_client=BrokenRedis())
+
+    cache.set(1, "v1", b"{}")
+
+    assert cache.get(1, "v1") == b"{}"
+    assert cache.get(2, "v1") is None
+    cache.invalidate(1)
+    assert len(cache) == 0
+
+
+def test_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        ResponseCache(max_entries=0)
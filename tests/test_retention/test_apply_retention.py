@@ -0,0 +1,101 @@
+import datetime
+
+from pytest import fixture
+from sqlmodel import func, select
+
+from sweepy import db_models
+from sweepy.models import RetentionPolicy
+from sweepy.retention import apply_retention, get_archived_participant_odds_history
+
+NOW = datetime.datetime(2025, 1, 11, tzinfo=datetime.timezone.utc)
+# Ten days of 15-minute refreshes up to NOW
+POINTS = 10 * 24 * 4
+
+
+@fixture
+def sweepstake(session) -> db_models.Sweepstakes:
+    participant = db_models.Participant(name="Alice")
+    runner = db_models.Runner(name="Runner", market_provider_id="1")
+    participant.runners.append(runner)
+    for i in range(POINTS):
+        timestamp = NOW - datetime.timedelta(minutes=15 * (POINTS - i))
+        participant.odds_history.append(
+            db_models.ParticipantOdds(implied_probability=0.5, timestamp=timestamp)
+        )
+        runner.odds_history.append(
+            db_models.RunnerOdds(implied_probability=0.5, timestamp=timestamp)
+        )
+
+    sweepstake = db_models.Sweepstakes(
+        name="Test Sweepstake",
+        market_id="1.1",
+        competition="Test Competition",
+        method="random",
+        active=True,
+        start_date=NOW,
+        updated_at=NOW,
+        participants=[participant],
+    )
+    session.add(sweepstake)
+    session.commit()
+    return sweepstake
+
+
+def _count(session, model) -> int:
+    return session.exec(select(func.count()).select_from(model)).one()
+
+
+def test_apply_retention_dry_run_writes_nothing(session, sweepstake):
+    report = apply_retention(session, RetentionPolicy(), now=NOW, dry_run=True)
+
+    assert report.rows_deleted > 0
+    assert report.estimated_bytes_reclaimed > 0
+    assert _count(session, db_models.RunnerOdds) == POINTS
+    assert _count(session, db_models.ParticipantOdds) == POINTS
+
+
+def test_apply_retention_compacts_by_age(session, sweepstake):
+    dry_run = apply_retention(session, RetentionPolicy(), now=NOW, dry_run=True)
+    report = apply_retention(session, RetentionPolicy(), now=NOW)
+
+    # Three days older than a week become daily rows, six days older than a day become
+    # hourly rows, and the last day is kept at full resolution
+    expected = 3 + 6 * 24 + 24 * 4
+    assert _count(session, db_models.RunnerOdds) == expected
+    assert _count(session, db_models.ParticipantOdds) == expected
+    assert report.rows_deleted - report.rows_inserted == 2 * (POINTS - expected)
+    assert dry_run.rows_deleted == report.rows_deleted
+
+    # Compaction is idempotent
+    assert apply_retention(session, RetentionPolicy(), now=NOW).rows_deleted == 0
+
+
+def test_apply_retention_archives_closed_sweepstakes(session, sweepstake):
+    sweepstake.active = False
+    session.add(sweepstake)
+    session.commit()
+    original = get_history(session, sweepstake)
+
+    report = apply_retention(
+        session,
+        RetentionPolicy(tiers=[], archive_closed_after_seconds=0),
+        now=NOW + datetime.timedelta(seconds=1),
+    )
+
+    assert report.sweepstakes_archived == 1
+    assert _count(session, db_models.RunnerOdds) == 0
+    assert _count(session, db_models.ParticipantOdds) == 0
+
+    archive = session.get(db_models.OddsArchive, sweepstake.id)
+    [participant] = sweepstake.participants
+    assert get_archived_participant_odds_history(archive.data) == {
+        participant.id: original
+    }
+
+
+def get_history(session, sweepstake) -> list[tuple[datetime.datetime, float]]:
+    [participant] = sweepstake.participants
+    return [
+        (odds.timestamp.replace(tzinfo=datetime.timezone.utc), odds.implied_probability)
+        for odds in sorted(participant.odds_history, key=lambda odds: odds.timestamp)
+    ]
@@ -0,0 +1,81 @@
+import datetime
+
+import pytest
+
+from sweepy.scheduler import (
+    compute_failure_backoff,
+    compute_odds_refresh_interval,
+    compute_scores_refresh_interval,
+)
+
+NOW = datetime.datetime(2025, 4, 10, 12, tzinfo=datetime.timezone.utc)
+
+
+def _odds_interval(start_date, volatility=0.0):
+    return compute_odds_refresh_interval(
+        start_date=start_date,
+        now=NOW,
+        volatility=volatility,
+        base_interval=900,
+        min_interval=300,
+        max_interval=21600,
+        live_seconds=5 * 86400,
+    )
+
+
+@pytest.mark.parametrize(
+    "start_date, expected",
+    [
+        (None, 900),
+        (NOW - datetime.timedelta(hours=1), 300),
+        (NOW - datetime.timedelta(days=6), 21600),
+        (NOW + datetime.timedelta(days=1), 1800),
+        (NOW + datetime.timedelta(days=6), 6300),
+        (NOW + datetime.timedelta(days=60), 21600),
+    ],
+)
+def test_compute_odds_refresh_interval_by_start_date(start_date, expected):
+    assert _odds_interval(start_date) == pytest.approx(expected)
+
+
+def test_compute_odds_refresh_interval_shrinks_with_volatility():
+    start_date = NOW + datetime.timedelta(days=6)
+
+    assert _odds_interval(start_date, volatility=0.005) == pytest.approx(3150)
+    assert _odds_interval(start_date, volatility=1.0) == 300
+
+
+def test_compute_odds_refresh_interval_naive_start_date():
+    start_date = (NOW + datetime.timedelta(days=1)).replace(tzinfo=None)
+
+    assert _odds_interval(start_date) == pytest.approx(1800)
+
+
+@pytest.mark.parametrize(
+    "start_date, expected",
+    [
+        (None, 3000),
+        (NOW - datetime.timedelta(hours=1), 3000),
+        (NOW - datetime.timedelta(days=6), 21600),
+        (NOW + datetime.timedelta(hours=2), 7200),
+        (NOW + datetime.timedelta(days=30), 21600),
+    ],
+)
+def test_compute_scores_refresh_interval(start_date, expected):
+    assert (
+        compute_scores_refresh_interval(
+            start_date=start_date,
+            now=NOW,
+            base_interval=3000,
+            max_interval=21600,
+            live_seconds=5 * 86400,
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize(
+    "consecutive_failures, expected", [(1, 60), (2, 120), (4, 480), (20, 21600)]
+)
+def test_compute_failure_backoff(consecutive_failures, expected):
+    assert compute_failure_backoff(consecutive_failures, 60, 21600) == expected
@@ -0,0 +1,72 @@
+import asyncio
+
+from sweepy.models import MarketNotFoundException
+from sweepy.scheduler import refresh_each
+
+
+def test_refresh_each_isolates_failures():
+    async def refresh(sweepstake_id: int) -> None:
+        if sweepstake_id == 2:
+            raise RuntimeError("boom")
+
+    report = asyncio.run(refresh_each([1, 2, 3], refresh, max_concurrency=2))
+
+    assert [result.sweepstake_id for result in report.results] == [1, 2, 3]
+    assert [result.sweepstake_id for result in report.failures] == [2]
+    assert "RuntimeError" in report.failures[0].error
+
+
+def test_refresh_each_retries_with_backoff():
+    calls = {1: 0}
+
+    async def refresh(sweepstake_id: int) -> None:
+        calls[sweepstake_id] += 1
+        if calls[sweepstake_id] < 3:
+            raise ConnectionError
+
+    report = asyncio.run(
+        refresh_each([1], refresh, max_concurrency=1, max_retries=2, backoff_seconds=0)
+    )
+
+    assert report.failures == []
+    assert report.results[0].attempts == 3
+
+
+def test_refresh_each_gives_up_after_max_retries():
+    async def refresh(sweepstake_id: int) -> None:
+        raise ConnectionError
+
+    report = asyncio.run(
+        refresh_each([1], refresh, max_concurrency=1, max_retries=1, backoff_seconds=0)
+    )
+
+    assert report.results[0].attempts == 2
+    assert not report.results[0].succeeded
+
+
+def test_refresh_each_does_not_retry_missing_markets():
+    async def refresh(sweepstake_id: int) -> None:
+        raise MarketNotFoundException
+
+    report = asyncio.run(
+        refresh_each([1], refresh, max_concurrency=1, max_retries=3, backoff_seconds=0)
+    )
+
+    assert report.results[0].attempts == 1
+
+
+def test_refresh_each_limits_concurrency():
+    running = 0
+    max_running = 0
+
+    async def refresh(sweepstake_id: int) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    report = asyncio.run(refresh_each(range(10), refresh, max_concurrency=3))
+
+    assert len(report.results) == 10
+    assert max_running == 3
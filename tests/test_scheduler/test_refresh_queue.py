@@ -0,0 +1,35 @@
+from sweepy.scheduler import RefreshQueue
+
+
+def test_refresh_queue_pops_due_in_order():
+    queue = RefreshQueue()
+    queue.schedule(1, 30)
+    queue.schedule(2, 10)
+    queue.schedule(3, 20)
+
+    assert queue.next_due_at() == 10
+    assert queue.pop_due(25) == [2, 3]
+    assert queue.pop_due(25) == []
+    assert len(queue) == 1
+
+
+def test_refresh_queue_reschedule_replaces_previous_entry():
+    queue = RefreshQueue()
+    queue.schedule(1, 10)
+    queue.schedule(1, 50)
+
+    assert queue.pop_due(20) == []
+    assert queue.next_due_at() == 50
+    assert queue.pop_due(50) == [1]
+
+
+def test_refresh_queue_sync():
+    queue = RefreshQueue()
+    queue.schedule(1, 100)
+    queue.schedule(2, 100)
+
+    queue.sync([2, 3], now=5)
+
+    assert 1 not in queue
+    assert queue.pop_due(5) == [3]
+    assert queue.next_due_at() == 100
@@ -0,0 +1,140 @@
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+import multiprocessing
+import random
+
+import numpy as np
+import pytest
+
+from sweepy import assignment, simulation
+from sweepy.models import AssignmentMethod, RunnerOdds
+
+
+@pytest.fixture
+def field() -> list[RunnerOdds]:
+    # A favourite, a few contenders and a long tail of outsiders
+    probabilities = (
+        ["0.2", "0.12", "0.08", "0.06", "0.05"] + ["0.03"] * 8 + ["0.01"] * 25
+    )
+    return [
+        RunnerOdds(
+            provider_id=str(i),
+            name=f"Runner {i}",
+            implied_probability=Decimal(probability),
+        )
+        for i, probability in enumerate(probabilities)
+    ]
+
+
+def test_equity_shares():
+    owners = np.array([[0, 1, 1], [1, 1, 0]])
+    probabilities = np.array([0.5, 0.25, 0.25])
+
+    equities = simulation.equity_shares(owners, probabilities, 2)
+
+    np.testing.assert_allclose(equities, [[0.5, 0.5], [0.25, 0.75]])
+
+
+def test_gini():
+    equities = np.array([[0.25, 0.25, 0.25, 0.25], [0.0, 0.0, 0.0, 1.0]])
+
+    np.testing.assert_allclose(simulation.gini(equities), [0.0, 0.75], atol=1e-12)
+
+
+def test_win_shares_by_equity_rank():
+    # Participant 1 holds the only selection that can win, and has the lower equity
+    owners = np.array([[0, 0, 1]])
+    equities = np.array([[0.6, 0.4]])
+    probabilities = np.array([0.0, 0.0, 1.0])
+
+    shares = simulation.win_shares(
+        owners, equities, probabilities, np.random.default_rng(0)
+    )
+
+    assert shares.tolist() == [0.0, 1.0]
+
+
+def test_simulate_fairness_is_reproducible(field):
+    state = random.getstate()
+    methods = list(AssignmentMethod)
+
+    first = simulation.simulate_fairness(field, 4, methods, runs=300, seed=7)
+    second = simulation.simulate_fairness(field, 4, methods, runs=300, seed=7)
+
+    assert first == second
+    assert [result.method for result in first] == methods
+    assert random.getstate() == state
+    for result in first:
+        assert sum(result.win_shares) == pytest.approx(1)
+        assert result.equity_spread.p5 <= result.equity_spread.median
+        assert result.equity_spread.median <= result.equity_spread.worst
+
+
+def test_simulate_fairness_ranks_methods(field):
+    results = {
+        result.method: result
+        for result in simulation.simulate_fairness(
+            field,
+            4,
+            [AssignmentMethod.RANDOM, AssignmentMethod.BALANCED],
+            runs=100,
+            seed=1,
+        )
+    }
+
+    assert (
+        results[AssignmentMethod.BALANCED].gini.mean
+        < results[AssignmentMethod.RANDOM].gini.mean
+    )
+
+
+def test_simulate_fairness_candidates_narrow_the_spread(field):
+    def spread(candidates):
+        (result,) = simulation.simulate_fairness(
+            field, 4, [AssignmentMethod.RANDOM], runs=100, seed=5, candidates=candidates
+        )
+        return result.equity_spread.mean
+
+    assert spread(8) < spread(1)
+
+
+def test_simulate_assignments_matches_generated_sweepstakes(field):
+    seed = random.Random(11).getrandbits(assignment.SEED_BITS)
+    assignments, _ = assignment.assign_selections_best_of(
+        AssignmentMethod.TIERED,
+        [f"Participant {p}" for p in range(4)],
+        field,
+        candidates=3,
+        seed=seed,
+    )
+    (owners,) = simulation.simulate_assignments(
+        AssignmentMethod.TIERED, field, 4, runs=1, seed=11, candidates=3
+    )
+
+    for participant, selections in assignments.items():
+        p = int(participant.split()[-1])
+        for selection in selections:
+            assert owners[int(selection.provider_id)] == p
+
+
+def test_simulate_fairness_in_processes_matches_in_process(
+    field,
+):
+    methods = [AssignmentMethod.FAIR]
+    expected = simulation.simulate_fairness(field, 4, methods, runs=400, seed=3)
+
+    with ProcessPoolExecutor(
+        max_workers=2, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        result = simulation.simulate_fairness(
+            field, 4, methods, runs=400, seed=3, executor=executor
+        )
+
+    assert result == expected
+
+
+def test_simulate_fairness_needs_enough_selections(field):
+    with pytest.raises(ValueError):
+        simulation.simulate_fairness(field[:3], 4, [AssignmentMethod.FAIR], 10, 0)
+    with pytest.raises(ValueError):
+        simulation.simulate_fairness(field, 1, [AssignmentMethod.FAIR], 10, 0)
@@ -0,0 +1,117 @@
+import asyncio
+import datetime
+
+import pytest
+
+from sweepy import db_models, tasks
+from sweepy.generate_sweepstakes import generate_sweepstakes, refresh_sweepstake_odds
+from sweepy.models import AssignmentMethod, SweepstakesRequest
+
+
+def _create_sweepstake(bf_client, session, market_id: str) -> db_models.Sweepstakes:
+    request = SweepstakesRequest(
+        name="Test Sweepstake",
+        market_id=market_id,
+        method=AssignmentMethod.RANDOM,
+        participant_names=["Alice", "Bob"],
+        competition="Test Competition",
+    )
+    return generate_sweepstakes(bf_client, None, request, session)
+
+
+def test_group_sweepstakes_by_market(bf_client, session):
+    first = _create_sweepstake(bf_client, session, "1.1")
+    second = _create_sweepstake(bf_client, session, "1.2")
+    third = _create_sweepstake(bf_client, session, "1.1")
+
+    result = tasks.group_sweepstakes_by_market([first, second, third])
+
+    assert result == {"1.1": [first, third], "1.2": [second]}
+
+
+def test_refresh_all_odds_fetches_each_market_once(
+    bf_client, bf_async_client, session, session_factory
+):
+    for market_id in ["1.1", "1.1", "1.1", "1.2"]:
+        sweepstake = _create_sweepstake(bf_client, session, market_id)
+    bf_client.calls = 0
+    bf_client.prices[1] = 1.5
+
+    asyncio.run(
+        tasks.refresh_all_odds(bf_async_client, session_factory, max_concurrency=1)
+    )
+
+    # One batched catalogue and one batched market book request for both markets
+    assert bf_client.calls == 2
+    session.refresh(sweepstake)
+    assert all(len(runner.odds_history) == 2 for runner in sweepstake.runners)
+
+
+def test_refresh_all_odds_records_missing_markets(
+    bf_client, bf_async_client, session, session_factory, monkeypatch
+):
+    found = _create_sweepstake(bf_client, session, "1.1")
+    missing = _create_sweepstake(bf_client, session, "1.2")
+    get_market_book_batch = bf_client.get_market_book_batch
+    monkeypatch.setattr(
+        bf_client,
+        "get_market_book_batch",
+        lambda market_ids: {
+            market_id: book
+            for market_id, book in get_market_book_batch(market_ids).items()
+            if market_id == "1.1"
+        },
+    )
+
+    report = asyncio.run(
+        tasks.refresh_all_odds(bf_async_client, session_factory, max_concurrency=1)
+    )
+
+    assert [result.sweepstake_id for result in report.results] == [found.id, missing.id]
+    assert [result.sweepstake_id for result in report.failures] == [missing.id]
+
+
+def test_refresh_all_odds_only_refreshes_given_sweepstakes(
+    bf_client, bf_async_client, session, session_factory
+):
+    first = _create_sweepstake(bf_client, session, "1.1")
+    _create_sweepstake(bf_client, session, "1.1")
+
+    report = asyncio.run(
+        tasks.refresh_all_odds(
+            bf_async_client, session_factory, sweepstake_ids=[first.id]
+        )
+    )
+
+    assert [result.sweepstake_id for result in report.results] == [first.id]
+
+
+def test_get_odds_volatility(bf_client, session):
+    sweepstake = _create_sweepstake(bf_client, session, "1.1")
+    since = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=1)
+
+    assert tasks.get_odds_volatility(session, sweepstake.id, since) == 0.0
+
+    bf_client.prices[1] = 1.5
+    refresh_sweepstake_odds(bf_client, sweepstake, session, tolerance=0.0)
+
+    moved = [
+        abs(
+            runner.odds_history[-1].implied_probability
+            - runner.odds_history[0].implied_probability
+        )
+        for runner in sweepstake.runners
+    ]
+    assert tasks.get_odds_volatility(session, sweepstake.id, since) == pytest.approx(
+        sum(moved) / len(moved)
+    )
+
+
+def test_refresh_intervals_use_the_given_base_interval(session_factory):
+    # A sweepstake without a start date is refreshed every base interval
+    assert tasks.get_odds_refresh_intervals(
+        [1], session_factory, base_interval=600
+    ) == {1: 600}
+    assert tasks.get_scores_refresh_intervals(
+        [1], session_factory, base_interval=60
+    ) == {1: 60}